@@ -1,10 +1,26 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import datetime
+import io
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Helpers shared by the scripts (batch mode, exact rounding, log storage) are in the sibling "shared" folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+import batch_mode
+import log_storage
+from exact_rounding import round_like_python
+
+# matplotlib and NumPy are imported inside the chart code so that importing
+# this module (and running it without charts) stays fast.
 
 # -----------------------------
 # User Class
 # -----------------------------
 class User:
+    __slots__ = ("name", "weight", "activity_level")
+
     def __init__(self, name, weight, activity_level):
         """
         Initialize user attributes.
@@ -31,88 +47,499 @@ class User:
             base_intake += 1.0
         return round(base_intake, 2)
 
+    @staticmethod
+    def recommended_water_intake_array(weight, activity_level):
+        """
+        Vectorised recommended_water_intake over arrays of weights (kg) and
+        activity levels. Gives exactly the values the method gives for each user.
+        """
+        import numpy as np
+
+        weight = np.asarray(weight, dtype=np.float64)
+        activity_level = np.asarray(activity_level).astype(str)
+        medium = activity_level == 'medium'
+        high = activity_level == 'high'
+        # Lower-casing strings is slow, so only do it for entries that need it
+        other = ~(medium | high | (activity_level == 'low'))
+        if other.any():
+            lowered = np.char.lower(activity_level[other])
+            medium[other] = lowered == 'medium'
+            high[other] = lowered == 'high'
+        base_intake = weight * 0.035  # in liters
+        base_intake = np.where(medium, base_intake + 0.5, base_intake)
+        base_intake = np.where(high, base_intake + 1.0, base_intake)
+        return round_like_python(base_intake, 2)
+
 # -----------------------------
 # Water Intake Class
 # -----------------------------
 class WaterIntake:
-    def __init__(self, daily_intake_list):
+    ROLLING_WINDOWS = (7, 30, 90)
+
+    def __init__(self, daily_intake_list, recommended=None):
         """
         Track daily water intake.
-        :param daily_intake_list: List of water consumed each day in liters
+        :param daily_intake_list: List of water consumed each day in liters. The list is
+                                  copied; change the days through add_day, update_day and
+                                  remove_day so the totals stay in sync.
+        :param recommended: Optional daily target (User.recommended_water_intake())
+                            used to count days below it
+        """
+        self._days = list(daily_intake_list)
+        self._init_index(recommended)
+
+    @property
+    def daily_intake(self):
+        # Read-only copy; edits go through the methods below
+        return tuple(self._days)
+
+    def _values(self):
+        return self._days
+
+    def _init_index(self, recommended):
+        # Prefix sums of liters and of days below the target. prefix[i] covers the
+        # first i days, so any span is answered with two lookups.
+        self.recommended = recommended
+        self._prefix = array("d", [0.0])
+        self._below = array("q", [0])
+
+    def _sync_index(self):
+        # Extend the index with days added since the last query
+        intake = self._values()
+        for liters in intake[len(self._prefix) - 1:]:
+            self._prefix.append(self._prefix[-1] + liters)
+            below = self.recommended is not None and liters < self.recommended
+            self._below.append(self._below[-1] + below)
+        return len(self._prefix) - 1
+
+    def _invalidate(self, index):
+        # Drop the index from day index on; the next query rebuilds it from there
+        del self._prefix[index + 1:]
+        del self._below[index + 1:]
+
+    def add_day(self, liters):
+        self._days.append(liters)
+        self._sync_index()
+
+    def update_day(self, index, liters):
+        """
+        Replace the liters logged on day index and return the old value
+        """
+        old = self._days[index]
+        self._days[index] = liters
+        self._invalidate(range(len(self._days))[index])
+        return old
+
+    def remove_day(self, index=-1):
+        """
+        Remove and return the liters logged on day index (the last day by default)
         """
-        self.daily_intake = daily_intake_list
+        position = range(len(self._days))[index]
+        liters = self._days.pop(position)
+        self._invalidate(position)
+        return liters
 
     def total_intake(self):
-        return round(sum(self.daily_intake), 2)
+        self._sync_index()
+        return round(self._prefix[-1], 2)
 
     def average_intake(self):
-        if len(self.daily_intake) == 0:
+        days = self._sync_index()
+        if days == 0:
+            return 0
+        return round(self._prefix[-1] / days, 2)
+
+    def range_total(self, start, end=None):
+        """
+        Total liters for days[start:end] (0-based, end exclusive)
+        """
+        days = self._sync_index()
+        start, end, _ = slice(start, end).indices(days)
+        return self._prefix[max(end, start)] - self._prefix[start]
+
+    def range_average(self, start, end=None):
+        days = self._sync_index()
+        start, end, _ = slice(start, end).indices(days)
+        if end <= start:
+            return 0
+        return (self._prefix[end] - self._prefix[start]) / (end - start)
+
+    def rolling_average(self, window):
+        """
+        Average over the most recent window days (fewer if not logged yet)
+        """
+        return round(self.range_average(-window), 2)
+
+    def rolling_averages(self):
+        return {window: self.rolling_average(window) for window in self.ROLLING_WINDOWS}
+
+    def days_below(self, start=0, end=None):
+        """
+        Number of days in days[start:end] below the recommended intake
+        """
+        if self.recommended is None:
+            raise ValueError("A recommended intake is needed to count days below it.")
+        days = self._sync_index()
+        start, end, _ = slice(start, end).indices(days)
+        return self._below[max(end, start)] - self._below[start]
+
+    def rolling_average_series(self, window):
+        """
+        Trailing window-day average for every day, as a NumPy array for charting
+        """
+        import numpy as np
+
+        days = self._sync_index()
+        prefix = np.frombuffer(self._prefix, dtype=np.float64)
+        ends = np.arange(1, days + 1)
+        starts = np.maximum(ends - window, 0)
+        return (prefix[ends] - prefix[starts]) / (ends - starts)
+
+    def cumulative_series(self):
+        """
+        Running total for every day, as a NumPy array
+        """
+        import numpy as np
+
+        self._sync_index()
+        return np.frombuffer(self._prefix, dtype=np.float64)[1:].copy()
+
+# -----------------------------
+# Water Log Store
+# -----------------------------
+class WaterLogStore:
+    """
+    Append-only binary water intake log for one user.
+    Every record is 12 bytes: the date as a day ordinal (int32) followed by
+    the liters drunk (float64), little endian. Records are kept in date order,
+    so reads memory-map the file and binary search a date range instead of
+    loading the whole history.
+    """
+    RECORD = struct.Struct("<id")
+
+    def __init__(self, path):
+        """
+        :param path: Log file, created on first append
+        """
+        self.path = path
+        self._map = None
+        self._mapped_size = 0
+        self._last_day = None
+        if os.path.exists(path) and os.path.getsize(path) >= self.RECORD.size:
+            with open(path, "rb") as f:
+                f.seek(-self.RECORD.size, os.SEEK_END)
+                self._last_day = self.RECORD.unpack(f.read())[0]
+
+    @classmethod
+    def for_user(cls, user, directory="."):
+        return cls(os.path.join(directory, f"{user.name}_water_log.bin"))
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // self.RECORD.size
+
+    @property
+    def last_day(self):
+        """
+        Date of the last logged entry, or None for an empty log
+        """
+        return None if self._last_day is None else datetime.date.fromordinal(self._last_day)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, day, liters):
+        self.extend([(day, liters)])
+
+    def extend(self, entries):
+        """
+        Append (date, liters) entries in one write. Dates must not go backwards.
+        """
+        records = bytearray()
+        last_day = self._last_day
+        for day, liters in entries:
+            ordinal = day.toordinal()
+            if last_day is not None and ordinal < last_day:
+                raise ValueError(f"{day} is earlier than the last logged day.")
+            records += self.RECORD.pack(ordinal, liters)
+            last_day = ordinal
+        with open(self.path, "ab") as f:
+            f.write(records)
+        self._last_day = last_day
+
+    def records(self):
+        """
+        Return a read-only NumPy structured array (day, liters) backed by the memory map
+        """
+        import numpy as np
+
+        dtype = np.dtype([("day", "<i4"), ("liters", "<f8")])
+        size = len(self) * self.RECORD.size
+        if size == 0:
+            return np.zeros(0, dtype=dtype)
+        if self._map is None or self._mapped_size != size:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return np.frombuffer(self._map, dtype=dtype, count=size // self.RECORD.size)
+
+    def liters(self, start=None, end=None):
+        """
+        Liters logged between start and end dates (inclusive; None means open-ended)
+        """
+        import numpy as np
+
+        records = self.records()
+        days = records["day"]
+        low = 0 if start is None else np.searchsorted(days, start.toordinal(), side="left")
+        high = len(days) if end is None else np.searchsorted(days, end.toordinal(), side="right")
+        return records["liters"][low:high]
+
+    def close(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Arrays handed out by records() still use the map; it closes when they are released
+                pass
+            self._map = None
+            self._mapped_size = 0
+
+    @classmethod
+    def import_text_log(cls, text_path, path, start_date):
+        """
+        Convert a text log written by DataProcessor.export_data into a binary log.
+        The text log only numbers its days, so Day 1 is logged on start_date.
+        """
+        entries = []
+        with open(text_path) as f:
+            for line in f:
+                if line.startswith("Day ") and line.rstrip().endswith(" L"):
+                    number, liters = line[4:].rstrip()[:-2].split(":")
+                    entries.append((start_date + datetime.timedelta(days=int(number) - 1), float(liters)))
+        store = cls(path)
+        store.extend(entries)
+        return store
+
+class StoredWaterIntake(WaterIntake):
+    """
+    WaterIntake backed by a WaterLogStore. Totals and averages can be limited
+    to a date range and only read the records inside it. Like the store it is
+    append-only: update_day and remove_day raise TypeError.
+    """
+    def __init__(self, store, recommended=None):
+        self.store = store
+        self._init_index(recommended)
+
+    @property
+    def daily_intake(self):
+        return self.store.liters()
+
+    def _values(self):
+        return self.store.liters()
+
+    def add_day(self, liters, day=None):
+        """
+        Append to the log store.
+        :param day: Date of the entry; defaults to the day after the last logged one (or today)
+        """
+        if day is None:
+            last_day = self.store.last_day
+            day = datetime.date.today() if last_day is None else last_day + datetime.timedelta(days=1)
+        self.store.append(day, liters)
+        self._sync_index()
+
+    def update_day(self, index, liters):
+        raise TypeError("The water log store is append-only; days cannot be updated.")
+
+    def remove_day(self, index=-1):
+        raise TypeError("The water log store is append-only; days cannot be removed.")
+
+    def total_intake(self, start=None, end=None):
+        return round(float(self.store.liters(start, end).sum()), 2)
+
+    def average_intake(self, start=None, end=None):
+        liters = self.store.liters(start, end)
+        if len(liters) == 0:
             return 0
-        return round(sum(self.daily_intake) / len(self.daily_intake), 2)
+        return round(float(liters.sum()) / len(liters), 2)
 
 # -----------------------------
 # Chart Strategy Pattern
 # -----------------------------
 class ChartStrategy:
-    def create_chart(self, *args):
+    """
+    Base chart strategy. Subclasses draw onto an explicit Figure in draw();
+    create_chart() shows the chart interactively and render() produces it headlessly.
+    """
+    filename = None
+    figsize = (10, 5)
+
+    def draw(self, figure, *args):
         pass
 
+    def create_chart(self, *args):
+        import matplotlib.pyplot as plt
+
+        figure = plt.figure(figsize=self.figsize)
+        self.draw(figure, *args)
+        figure.savefig(self.filename)
+        plt.show()
+
+    def render(self, *args, path=None, format=None):
+        """
+        Render the chart headlessly on an Agg canvas, without touching pyplot.
+        :param path: File to write; when omitted the image bytes are returned
+        :param format: Image format, defaults to the path extension or PNG
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=self.figsize)
+        FigureCanvasAgg(figure)
+        try:
+            self.draw(figure, *args)
+            if path is not None:
+                figure.savefig(path, format=format)
+                return path
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format=format or "png")
+            return buffer.getvalue()
+        finally:
+            figure.clear()
+
 class BarChartStrategy(ChartStrategy):
-    def create_chart(self, daily_intake, recommended):
+    filename = "water_intake_bar_chart.jpg"
+
+    def draw(self, figure, daily_intake, recommended):
         """
         Bar chart comparing daily water intake with recommended intake
         """
+        import numpy as np
+
         days = [f"Day {i+1}" for i in range(len(daily_intake))]
         x = np.arange(len(days))
         width = 0.4
 
-        plt.figure(figsize=(10, 5))
-        plt.bar(x - width/2, daily_intake, width, label="Actual Intake", color="skyblue")
-        plt.bar(x + width/2, [recommended]*len(days), width, label="Recommended", color="lightgreen")
-        plt.xticks(x, days)
-        plt.ylabel("Water Intake (L)")
-        plt.title("Daily Water Intake vs Recommended")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig("water_intake_bar_chart.jpg")
-        plt.show()
+        ax = figure.subplots()
+        ax.bar(x - width/2, daily_intake, width, label="Actual Intake", color="skyblue")
+        ax.bar(x + width/2, [recommended]*len(days), width, label="Recommended", color="lightgreen")
+        ax.set_xticks(x, days)
+        ax.set_ylabel("Water Intake (L)")
+        ax.set_title("Daily Water Intake vs Recommended")
+        ax.legend()
+        figure.tight_layout()
 
 class LineChartStrategy(ChartStrategy):
-    def create_chart(self, daily_intake, recommended):
+    filename = "water_intake_line_chart.jpg"
+
+    def draw(self, figure, daily_intake, recommended, rolling_average=None):
         """
-        Line chart showing daily water intake trends
+        Line chart showing daily water intake trends, optionally with a
+        rolling average series (e.g. WaterIntake.rolling_average_series(7))
         """
         days = [f"Day {i+1}" for i in range(len(daily_intake))]
-        plt.figure(figsize=(10, 5))
-        plt.plot(days, daily_intake, marker='o', label="Actual Intake", linestyle='-')
-        plt.plot(days, [recommended]*len(daily_intake), marker='x', label="Recommended", linestyle='--')
-        plt.ylabel("Water Intake (L)")
-        plt.title("Daily Water Intake Trend")
-        plt.legend()
-        plt.tight_layout()
-        plt.savefig("water_intake_line_chart.jpg")
-        plt.show()
+        ax = figure.subplots()
+        ax.plot(days, daily_intake, marker='o', label="Actual Intake", linestyle='-')
+        ax.plot(days, [recommended]*len(daily_intake), marker='x', label="Recommended", linestyle='--')
+        if rolling_average is not None:
+            ax.plot(days, rolling_average, label="Rolling Average", linestyle=':')
+        ax.set_ylabel("Water Intake (L)")
+        ax.set_title("Daily Water Intake Trend")
+        ax.legend()
+        figure.tight_layout()
 
 class Visualiser:
     """
     Visualiser uses a chart strategy to generate charts
     """
-    def __init__(self, strategy: ChartStrategy):
+    def __init__(self, strategy: ChartStrategy, cache=None):
+        """
+        :param cache: Optional chart cache (e.g. chart_cache.ChartCache). Charts are then
+            rendered headlessly and identical inputs are served from the cache.
+        """
         self.strategy = strategy
+        self.cache = cache
 
     def create_chart(self, *args):
+        if self.cache is not None:
+            return self.cache.fetch(self.strategy, args, path=self.strategy.filename)
         self.strategy.create_chart(*args)
 
+    def render(self, *args, path=None, format=None):
+        """
+        Headless, non-blocking version of create_chart
+        """
+        if self.cache is not None:
+            return self.cache.fetch(self.strategy, args, path=path, format=format)
+        return self.strategy.render(*args, path=path, format=format)
+
+def _use_agg_backend():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+def _render_job(job):
+    strategy, args, path = job
+    return strategy.render(*args, path=path)
+
+def render_charts(jobs, processes=None, chunksize=16, maxtasksperchild=1000):
+    """
+    Render many charts headlessly on a pool of worker processes.
+    :param jobs: Iterable of (strategy, args, path) tuples, e.g.
+                 (LineChartStrategy(), (daily_intake, recommended), "alice_line.png")
+    :param processes: Number of workers, defaults to the CPU count
+    :param maxtasksperchild: Recycle workers after this many charts so memory stays flat
+    :return: List of written paths (or image bytes for jobs whose path is None)
+    """
+    import multiprocessing
+
+    with multiprocessing.Pool(processes, initializer=_use_agg_backend,
+                              maxtasksperchild=maxtasksperchild) as pool:
+        return list(pool.imap(_render_job, jobs, chunksize))
+
 # -----------------------------
-# Data Processor
+# Log Storage Backends
 # -----------------------------
-class DataProcessor:
+class LogStorage(log_storage.LogStorage):
+    """
+    User water logs for the storage backends in shared/log_storage.py.
+    save() stores a user's log and returns where it went; load() reads it back
+    as a (User, WaterIntake) pair.
+    """
+    USER_COLUMNS = {"weight": "REAL", "activity_level": "TEXT"}
+    ITEMS = "daily_intake"
+    ITEM_TABLE = "water_days"
+    ITEM_POSITION = "day"
+    ITEM_COLUMNS = {"liters": "REAL"}
+
     @staticmethod
-    def export_data(user, water_intake):
-        """
-        Export user details and water intake data to a text file
-        """
-        filename = f"{user.name}_water_log.txt"
+    def _record(user, water_intake):
+        return {
+            "user": user.name,
+            "weight": user.weight,
+            "activity_level": user.activity_level,
+            "daily_intake": [float(intake) for intake in water_intake.daily_intake],
+        }
+
+    @staticmethod
+    def _restore(name, weight, activity_level, daily_intake):
+        user = User(name, weight, activity_level)
+        return user, WaterIntake(daily_intake, user.recommended_water_intake())
+
+
+class TextLogStorage(LogStorage, log_storage.TextLogStorage):
+    """
+    The human readable <name>_water_log.txt files written by DataProcessor.export_data
+    """
+    SUFFIX = "_water_log.txt"
+
+    def save(self, user, water_intake):
+        filename = self.path(user.name)
         with open(filename, "w") as f:
             f.write(f"User: {user.name}\n")
             f.write(f"Weight: {user.weight} kg\n")
@@ -123,12 +550,109 @@ class DataProcessor:
                 f.write(f"Day {i+1}: {intake} L\n")
             f.write(f"\nTotal Intake: {water_intake.total_intake()} L\n")
             f.write(f"Average Intake: {water_intake.average_intake()} L\n")
-        print(f"Data exported to {filename}")
+        return filename
+
+    def load(self, name):
+        with open(self.path(name)) as f:
+            fields = {}
+            daily_intake = []
+            for line in f:
+                key, _, value = line.rstrip("\n").partition(": ")
+                if key.startswith("Day "):
+                    daily_intake.append(float(value[:-2]))
+                else:
+                    fields[key] = value
+        return self._restore(fields["User"], float(fields["Weight"][:-3]),
+                             fields["Activity Level"], daily_intake)
+
+
+class JsonLinesLogStorage(LogStorage, log_storage.JsonLinesLogStorage):
+    """
+    One JSON object per saved log, appended to a single file
+    """
+
+
+class SqliteLogStorage(LogStorage, log_storage.SqliteLogStorage):
+    """
+    SQLite database of water logs: users and their water_days
+    """
+
+
+STORAGE_BACKENDS = {
+    "text": TextLogStorage,
+    "jsonl": JsonLinesLogStorage,
+    "sqlite": SqliteLogStorage,
+}
+
+# -----------------------------
+# Data Processor
+# -----------------------------
+class DataProcessor:
+    @staticmethod
+    def export_data(user, water_intake, storage=None):
+        """
+        Export user details and water intake data, by default to a text file
+        :param storage: LogStorage backend (default: TextLogStorage in the current folder)
+        """
+        location = (storage or TextLogStorage()).save(user, water_intake)
+        print(f"Data exported to {location}")
+
+    @staticmethod
+    def load_data(name, storage=None):
+        """
+        Read an exported log back as a (User, WaterIntake) pair
+        """
+        return (storage or TextLogStorage()).load(name)
+
+    @staticmethod
+    def to_record(user, water_intake):
+        """
+        Flatten a user's water log into one record for bulk exports
+        """
+        return {
+            "user": user.name,
+            "weight": user.weight,
+            "activity_level": user.activity_level,
+            "recommended": user.recommended_water_intake(),
+            "daily_intake": [float(intake) for intake in water_intake.daily_intake],
+            "total_intake": water_intake.total_intake(),
+            "average_intake": water_intake.average_intake(),
+        }
+
+# -----------------------------
+# Batch Mode
+# -----------------------------
+# python Hydration_Tracker.py logs.csv [--jobs N]
+# One record per user: name, weight, activity_level and daily_intake (a JSON list,
+# or liters separated by ';' in CSV, as in bulk exports)
+def process_record(record):
+    """
+    One user's water log to their DataProcessor.to_record summary
+    """
+    user = User(record.get("name") or "", float(record["weight"]), record.get("activity_level") or "low")
+    daily_intake = record.get("daily_intake") or []
+    if isinstance(daily_intake, str):
+        daily_intake = [float(liters) for liters in daily_intake.split(";") if liters.strip()]
+    water_intake = WaterIntake([float(liters) for liters in daily_intake], user.recommended_water_intake())
+    result = DataProcessor.to_record(user, water_intake)
+    result["days_below"] = water_intake.days_below()
+    return result
+
+def run_batch(argv=None):
+    """
+    Batch mode: process_record over CSV or JSON Lines records, one JSON result per line on stdout
+    """
+    batch_mode.run_batch(process_record, "Summarise water intake logs in batch.", argv)
 
 # -----------------------------
 # Main Program
 # -----------------------------
 if __name__ == "__main__":
+    # Any command-line arguments switch to batch mode, e.g. --jobs 4 people.csv ('-' reads stdin)
+    if len(sys.argv) > 1:
+        run_batch()
+        sys.exit()
+
     try:
         # User Input
         name = input("Enter your name: ")
@@ -147,12 +671,13 @@ if __name__ == "__main__":
             daily_intake.append(intake)
 
         # Initialize WaterIntake object
-        water_log = WaterIntake(daily_intake)
+        water_log = WaterIntake(daily_intake, recommended)
 
         # Display summary
         print(f"\nRecommended Daily Intake: {recommended} L")
         print(f"Total Intake: {water_log.total_intake()} L")
         print(f"Average Intake: {water_log.average_intake()} L")
+        print(f"Days Below Recommended: {water_log.days_below()}")
 
         # Ask user for chart visualization
         save_charts = input("Would you like to generate charts? (yes/no): ").lower()
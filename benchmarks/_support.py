@@ -0,0 +1,48 @@
+"""
+Shared helpers for the benchmark scripts.
+The projects are standalone scripts in their own folders, so the benchmarks
+put those folders on sys.path before importing them.
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIRS = [
+    "bulk_export",
+    "calorie_budget_planner",
+    "chart_cache",
+    "dietary_recommendation",
+    "instrumentation",
+    "Hydration Tracker",
+    "nutrition_visualizer",
+    "population_screening",
+    "population_stats",
+    "shared",
+]
+
+for _project in PROJECT_DIRS:
+    _path = os.path.join(ROOT, _project)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+
+def best_of(func, repeat=3):
+    """
+    Run func repeat times and return the fastest wall-clock time in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_sizes(argv, default):
+    """
+    Read comma separated sizes from the command line, e.g. 10000,1000000
+    """
+    if len(argv) > 1:
+        return [int(size) for size in argv[1].split(",")]
+    return list(default)
@@ -0,0 +1,37 @@
+"""
+Per-chart BMI render time: full redraw per user (render) against the cached
+template that only blits the marker (render_many).
+
+The full-redraw path is timed on a sample of users and projected to the full
+population, because rendering 10k charts that way takes many minutes.
+
+Usage: python benchmarks/bench_bmi_template.py [users] [sample]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _support
+from nutrition_visualizer import BMIChartStrategy
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    bmis = np.round(np.random.default_rng(0).normal(26, 5, users).clip(12, 45), 2)
+
+    strategy = BMIChartStrategy()
+    start = time.perf_counter()
+    for bmi in bmis[:sample]:
+        strategy.render(bmi)
+    full = (time.perf_counter() - start) / min(sample, users)
+
+    strategy = BMIChartStrategy()
+    start = time.perf_counter()
+    strategy.render_many(bmis)
+    template = (time.perf_counter() - start) / users
+
+    print(f"{users:,} users")
+    print(f"  full redraw   {full * 1000:8.2f} ms/chart  (~{full * users:8.1f} s total, from {sample} charts)")
+    print(f"  template      {template * 1000:8.2f} ms/chart  ({template * users:8.1f} s total)")
+    print(f"  speed-up      {full / template:8.1f}x")
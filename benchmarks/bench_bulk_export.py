@@ -0,0 +1,63 @@
+"""
+Bulk export throughput in rows per second for each DataProcessor record type,
+output format, shard count and writer thread setting.
+
+Usage: python benchmarks/bench_bulk_export.py [users]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import _support
+import calorie_budget_planner
+import Hydration_Tracker
+import nutrition_visualizer
+from bulk_export import export_bulk
+
+
+def calorie_pairs(count):
+    for i in range(count):
+        tracker = calorie_budget_planner.MealTracker()
+        tracker.add_food(calorie_budget_planner.FoodItem("oats", 380, 13, 68, 7))
+        tracker.add_food(calorie_budget_planner.FoodItem("salmon", 410, 40, 0, 27))
+        yield calorie_budget_planner.User(f"user{i}", 2000), tracker
+
+
+def hydration_pairs(count):
+    for i in range(count):
+        user = Hydration_Tracker.User(f"user{i}", 60 + i % 40, "medium")
+        yield user, Hydration_Tracker.WaterIntake([2.1, 1.8, 2.6, 2.4, 1.9, 2.2, 2.0])
+
+
+def nutrition_pairs(count):
+    for i in range(count):
+        user = nutrition_visualizer.User(30 + i % 50, "female", 55 + i % 30, 165)
+        yield user, nutrition_visualizer.FoodIntake(5, 2, 6, 2.5, 2.5)
+
+
+PROCESSORS = {
+    "calorie": (calorie_pairs, calorie_budget_planner.DataProcessor.to_record),
+    "hydration": (hydration_pairs, Hydration_Tracker.DataProcessor.to_record),
+    "nutrition": (nutrition_pairs, nutrition_visualizer.DataProcessor.to_record),
+}
+SETTINGS = [
+    {"format": "csv"},
+    {"format": "jsonl"},
+    {"format": "csv", "io_threads": 2},
+    {"format": "csv", "shards": 8, "io_threads": 4},
+]
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (make_pairs, record_fn) in PROCESSORS.items():
+            for i, options in enumerate(SETTINGS):
+                destination = os.path.join(directory, f"{name}_{i}")
+                if options.get("shards", 1) == 1:
+                    destination += "." + options["format"]
+                start = time.perf_counter()
+                rows = export_bulk(make_pairs(users), record_fn, destination, **options)
+                elapsed = time.perf_counter() - start
+                label = ", ".join(f"{key}={value}" for key, value in options.items())
+                print(f"{name:<10} {label:<38} {rows / elapsed:12,.0f} rows/s")
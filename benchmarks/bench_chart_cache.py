@@ -0,0 +1,61 @@
+"""
+Chart requests where many users share the same inputs: rendering every
+request against serving repeats from the on-disk ChartCache.
+
+Usage: python benchmarks/bench_chart_cache.py [requests] [distinct inputs]
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+import _support
+import Hydration_Tracker
+import nutrition_visualizer
+from chart_cache import ChartCache
+from nutrition_visualizer import FOOD_GROUPS, BarChartStrategy, BMIChartStrategy, FoodIntake
+
+
+def requests(count, distinct):
+    # Rounded BMIs, intake dicts and weekly water logs drawn from a small pool
+    rng = np.random.default_rng(0)
+    bmis = rng.uniform(17, 35, distinct).round(1).tolist()
+    intakes = [dict(zip(FOOD_GROUPS, row)) for row in rng.integers(0, 8, (distinct, len(FOOD_GROUPS))).tolist()]
+    weeks = rng.uniform(1, 4, (distinct, 7)).round(1).tolist()
+    jobs = []
+    for i in rng.integers(0, distinct, count).tolist():
+        kind = i % 3
+        if kind == 0:
+            jobs.append((BMIChartStrategy(), (bmis[i],)))
+        elif kind == 1:
+            jobs.append((BarChartStrategy(), (intakes[i], FoodIntake.RECOMMENDATION)))
+        else:
+            jobs.append((Hydration_Tracker.BarChartStrategy(), (weeks[i], 2.5)))
+    return jobs
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    nutrition_visualizer._use_agg_backend()
+    jobs = requests(count, distinct)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = [os.path.join(scratch, f"chart{i}.png") for i in range(count)]
+        uncached = _support.best_of(lambda: [strategy.render(*args, path=path)
+                                             for (strategy, args), path in zip(jobs, paths)], repeat=1)
+        cache = ChartCache(os.path.join(scratch, "cache"))
+        cold = _support.best_of(lambda: [cache.fetch(strategy, args, path=path)
+                                         for (strategy, args), path in zip(jobs, paths)], repeat=1)
+        stats = cache.stats()
+        warm = _support.best_of(lambda: [cache.fetch(strategy, args, path=path)
+                                         for (strategy, args), path in zip(jobs, paths)])
+
+    print(f"{count} chart requests over {distinct} distinct inputs")
+    print(f"render every request   {uncached / count * 1000:8.2f} ms/request")
+    print(f"cache, first pass      {cold / count * 1000:8.2f} ms/request   hit rate {stats['hit_rate']:.0%}"
+          f"   {uncached / cold:6.1f}x faster")
+    print(f"cache, warm            {warm / count * 1000:8.2f} ms/request   hit rate 100%"
+          f"   {uncached / warm:6.1f}x faster")
+    print(f"cache size             {stats['entries']} images, {stats['bytes'] / 1e6:.2f} MB")
@@ -0,0 +1,37 @@
+"""
+Headless chart throughput: charts per minute through render_charts, and the
+peak RSS of the parent process and its workers.
+
+Usage: python benchmarks/bench_chart_rendering.py [charts] [processes]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import _support
+import nutrition_visualizer
+from nutrition_visualizer import BarChartStrategy, BMIChartStrategy, FoodIntake
+
+
+def jobs(count, directory):
+    actual = {"vegetables": 3, "fruits": 1, "grains": 5, "meats": 2, "dairy": 1.5}
+    for i in range(count):
+        if i % 2:
+            yield BMIChartStrategy(), (18 + (i % 150) / 10,), os.path.join(directory, f"user_{i}_bmi.png")
+        else:
+            yield BarChartStrategy(), (actual, FoodIntake.RECOMMENDATION), os.path.join(directory, f"user_{i}_bar.png")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        nutrition_visualizer.render_charts(jobs(count, directory), processes=processes)
+        elapsed = time.perf_counter() - start
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    print(f"{count} charts on {processes} processes in {elapsed:.1f}s "
+          f"({count / elapsed * 60:,.0f} charts/minute), peak RSS {peak_kb / 1024:.0f} MiB")
@@ -0,0 +1,53 @@
+"""
+End-to-end chart report for a user: the four charts saved as PNG, SVG and a
+JPEG thumbnail. Compares rendering each chart once per file, one after the
+other (with the BMI chart drawn twice, as the interactive script used to do),
+against export_report, which draws each chart once and overlaps encoding and
+writes on a thread pool.
+
+Usage: python benchmarks/bench_chart_report.py [users]
+"""
+import os
+import sys
+import tempfile
+
+import _support
+import nutrition_visualizer
+from nutrition_visualizer import (BarChartStrategy, BMIChartStrategy, FoodIntake, LineChartStrategy,
+                                  PieChartStrategy, User, export_report, new_report_folder)
+
+
+def report_per_file(user, food_intake, folder):
+    actual = {group: getattr(food_intake, group) for group in nutrition_visualizer.FOOD_GROUPS}
+    bmi = user.calculate_bmi()
+    charts = [
+        ("bmi_chart", BMIChartStrategy(), (bmi,)),
+        ("bmi_chart", BMIChartStrategy(), (bmi,)),
+        ("bar_chart", BarChartStrategy(), (actual, FoodIntake.RECOMMENDATION)),
+        ("line_chart", LineChartStrategy(), (actual, FoodIntake.RECOMMENDATION)),
+        ("pie_chart", PieChartStrategy(), (actual,)),
+    ]
+    for name, strategy, args in charts:
+        basename = os.path.join(folder, name)
+        strategy.render(*args, path=f"{basename}.png")
+        strategy.render(*args, path=f"{basename}.svg")
+        strategy.render(*args, path=f"{basename}_thumb.jpg")
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    nutrition_visualizer._use_agg_backend()
+    people = [(User(30, "female", 50 + i, 160 + i % 30), FoodIntake(5, 2 + i % 3, 6, 2.5, 2.5))
+              for i in range(users)]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        before = _support.best_of(lambda: [report_per_file(user, intake, new_report_folder())
+                                           for user, intake in people], repeat=1)
+        after = _support.best_of(lambda: [export_report(user, intake, new_report_folder())
+                                          for user, intake in people], repeat=1)
+        os.chdir(_support.ROOT)
+
+    print(f"{users} user reports (4 charts x PNG, SVG, thumbnail)")
+    print(f"render per file   {before / users * 1000:8.1f} ms/user")
+    print(f"export_report     {after / users * 1000:8.1f} ms/user   {before / after:5.2f}x faster")
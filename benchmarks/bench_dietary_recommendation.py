@@ -0,0 +1,91 @@
+"""
+Per-request cost of DietaryRecommendation: construct, display and export,
+and of a cached get_recommendations() lookup.
+
+"before" rebuilds the serving-size catalog for every object and renders it
+line by line, the way DietaryRecommendation used to; "after" uses the shared
+catalog and the cached text block.
+
+Usage: python benchmarks/bench_dietary_recommendation.py [requests]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import _support
+import dietary_recommendation
+from dietary_recommendation import DietaryRecommendation, User
+
+
+class PerInstanceCatalogRecommendation(DietaryRecommendation):
+    # Reproduces the old behaviour: a fresh dict of lists per object and
+    # one print/write call per line
+    def __init__(self, user):
+        super().__init__(user)
+        self.food_groups_details = {
+            group: list(details) for group, details in dietary_recommendation.FOOD_GROUPS_DETAILS.items()
+        }
+
+    def display_recommendations(self):
+        print("\nBased on your inputs, the minimum recommended servings are:")
+        for food_group, servings in self.recommendations.items():
+            print(f"{food_group}: {servings:.1f} servings per day")
+        print("\nAdditionally, each food category single serving recommendations are detailed as shown as follows:")
+        for food_group in self.food_groups_details:
+            print(f"\n{food_group}")
+            for detail in self.food_groups_details[food_group]:
+                print(f"  {detail}")
+
+    def export_recommendations(self, filename="DietaryRecommendations.txt"):
+        with open(filename, "w") as file:
+            file.write("Based on your inputs, the minimum recommended servings are:\n")
+            for food_group, servings in self.recommendations.items():
+                file.write(f"{food_group}: {servings} serves per day\n")
+            file.write(
+                "\nAdditionally, each food category single serving recommendations are detailed as shown as follows:\n")
+            for food_group in self.food_groups_details:
+                file.write(f"\n{food_group}:\n")
+                for detail in self.food_groups_details[food_group]:
+                    file.write(f"  {detail}\n")
+
+
+def measure(cls, requests, filename):
+    user = User(34, "female", pregnant=True)
+    sink = io.StringIO()
+
+    def one_request():
+        diet = cls(user)
+        diet.display_recommendations()
+        diet.export_recommendations(filename)
+        return diet
+
+    with contextlib.redirect_stdout(sink):
+        one_request()  # warm caches
+        start = time.perf_counter()
+        for _ in range(requests):
+            one_request()
+        latency = (time.perf_counter() - start) / requests
+
+        tracemalloc.start()
+        kept = [cls(user) for _ in range(1000)]
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    del kept
+    return latency, allocated / 1000
+
+
+if __name__ == "__main__":
+    requests = _support.parse_sizes(sys.argv, (20_000,))[0]
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "DietaryRecommendations.txt")
+        for label, cls in (("before", PerInstanceCatalogRecommendation), ("after", DietaryRecommendation)):
+            latency, per_object = measure(cls, requests, filename)
+            print(f"{label:<7} {latency * 1e6:8.1f} us/request  {per_object:8.0f} bytes retained per object")
+
+    diet = DietaryRecommendation(User(34, "female", pregnant=True))
+    lookup = _support.best_of(lambda: [diet.get_recommendations() for _ in range(requests)]) / requests
+    print(f"get_recommendations {lookup * 1e6:6.2f} us/call  {dietary_recommendation.recommendation_cache_info()}")
@@ -0,0 +1,44 @@
+"""
+FoodDatabase latency with a large synthetic catalog: exact lookups with a cold
+and a warm LRU cache, and prefix (autocomplete) searches.
+
+Usage: python benchmarks/bench_food_database.py [foods]
+"""
+import random
+import sys
+import time
+
+import _support
+from calorie_budget_planner import FoodDatabase
+
+
+def synthetic_foods(count):
+    for i in range(count):
+        yield {"name": f"food {i:07d}", "serving": "100g", "calories": i % 900,
+               "protein": 10, "carbs": 20, "fats": 5}
+
+
+def per_call_us(func, args):
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    database = FoodDatabase(cache_size=10_000)
+    start = time.perf_counter()
+    database.add_foods(synthetic_foods(count))
+    print(f"loaded {count:,} foods in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(0)
+    cold = [f"food {rng.randrange(count):07d}" for _ in range(20_000)]
+    hot = [f"food {rng.randrange(1000):07d}" for _ in range(20_000)]
+    prefixes = [f"food {rng.randrange(count):07d}"[:-2] for _ in range(5_000)]
+
+    print(f"exact lookup, cold cache  {per_call_us(database.lookup, cold):8.2f} us")
+    per_call_us(database.lookup, hot)
+    print(f"exact lookup, hot foods   {per_call_us(database.lookup, hot):8.2f} us")
+    print(f"prefix search (10 hits)   {per_call_us(database.search, prefixes):8.2f} us")
+    print(database.cache_info())
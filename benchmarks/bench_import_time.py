@@ -0,0 +1,59 @@
+"""
+Import-time check for the four projects.
+
+Each module is imported in a fresh interpreter with -X importtime. The script
+fails (exit status 1) when a module takes longer than the budget to import or
+pulls in matplotlib/NumPy at import time, so startup regressions are caught.
+
+Usage: python benchmarks/bench_import_time.py [budget_ms]
+"""
+import os
+import subprocess
+import sys
+
+import _support
+
+MODULES = {
+    "calorie_budget_planner": "calorie_budget_planner",
+    "dietary_recommendation": "dietary_recommendation",
+    "Hydration Tracker": "Hydration_Tracker",
+    "nutrition_visualizer": "nutrition_visualizer",
+}
+HEAVY_MODULES = ("matplotlib", "numpy")
+RUNS = 5
+
+
+def import_time_us(project, module):
+    # Best cumulative import time of the module over a few fresh interpreters
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    best, heavy = None, ""
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=os.path.join(_support.ROOT, project),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        heavy = result.stdout.strip()
+        for line in result.stderr.splitlines():
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] == module:
+                cumulative = int(fields[1])
+                best = cumulative if best is None else min(best, cumulative)
+    return best, heavy
+
+
+if __name__ == "__main__":
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    failed = False
+    for project, module in MODULES.items():
+        cumulative_us, heavy = import_time_us(project, module)
+        status = "ok"
+        if cumulative_us / 1000 > budget_ms:
+            status, failed = "OVER BUDGET", True
+        if heavy:
+            status, failed = f"imports {heavy} eagerly", True
+        print(f"{module:<24} {cumulative_us / 1000:7.2f} ms  {status}")
+    print(f"budget: {budget_ms:.1f} ms per module")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,31 @@
+"""
+Cost of the instrumentation hooks on a fast hot path
+(DietaryRecommendation.get_recommendations): per-call time before
+instrumentation.enable(), while enabled, and after disable().
+
+Usage: python benchmarks/bench_instrumentation.py [calls]
+"""
+import sys
+
+import _support
+import instrumentation
+from dietary_recommendation import DietaryRecommendation, User
+
+
+def per_call_us(recommendation, calls):
+    get = recommendation.get_recommendations
+    return _support.best_of(lambda: [get() for _ in range(calls)]) / calls * 1e6
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    recommendation = DietaryRecommendation(User(34, "female", pregnant=True))
+
+    off = per_call_us(recommendation, calls)
+    instrumentation.enable()
+    on = per_call_us(recommendation, calls)
+    instrumentation.disable()
+    after = per_call_us(recommendation, calls)
+
+    print(f"get_recommendations  disabled {off:6.2f} us   enabled {on:6.2f} us"
+          f"   after disable {after:6.2f} us   hook cost {on - off:5.2f} us/call")
@@ -0,0 +1,71 @@
+"""
+Write and read throughput (logs per second) of the text, JSON Lines and
+SQLite log storage backends of the calorie budget planner and the hydration
+tracker. Writes go through save_many(), reads through load_all(), and a
+sample of single-user load() calls measures point lookups.
+
+Usage: python benchmarks/bench_log_storage.py [users]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import _support
+import calorie_budget_planner
+import Hydration_Tracker
+
+
+def calorie_pairs(count):
+    for i in range(count):
+        tracker = calorie_budget_planner.MealTracker()
+        tracker.add_food(calorie_budget_planner.FoodItem("oats", 380, 13, 68, 7))
+        tracker.add_food(calorie_budget_planner.FoodItem("salmon", 410, 40, 0, 27))
+        tracker.add_food(calorie_budget_planner.FoodItem("apple", 95, 0.5, 25, 0.3))
+        yield calorie_budget_planner.User(f"user{i}", 2000), tracker
+
+
+def hydration_pairs(count):
+    for i in range(count):
+        user = Hydration_Tracker.User(f"user{i}", 60 + i % 40, "medium")
+        yield user, Hydration_Tracker.WaterIntake([2.1, 1.8, 2.6, 2.4, 1.9, 2.2, 2.0])
+
+
+MODULES = {
+    "calorie": (calorie_budget_planner, calorie_pairs),
+    "hydration": (Hydration_Tracker, hydration_pairs),
+}
+
+
+def open_storage(module, backend, directory, name):
+    if backend == "text":
+        path = os.path.join(directory, name)
+        os.makedirs(path)
+        return module.TextLogStorage(path)
+    return module.STORAGE_BACKENDS[backend](os.path.join(directory, f"{name}.{backend}"))
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    lookups = min(users, 1000)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (module, make_pairs) in MODULES.items():
+            pairs = list(make_pairs(users))
+            for backend in module.STORAGE_BACKENDS:
+                with open_storage(module, backend, directory, f"{name}_{backend}") as storage:
+                    start = time.perf_counter()
+                    storage.save_many(pairs)
+                    write = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    loaded = sum(1 for _ in storage.load_all())
+                    read = time.perf_counter() - start
+                    assert loaded == users
+
+                    start = time.perf_counter()
+                    for i in range(0, users, users // lookups):
+                        storage.load(f"user{i}")
+                    lookup = (time.perf_counter() - start) / len(range(0, users, users // lookups))
+
+                print(f"{name:<10} {backend:<6} write {users / write:>10,.0f} logs/s"
+                      f"   read {users / read:>10,.0f} logs/s   load() {lookup * 1e6:>10,.1f} us")
@@ -0,0 +1,60 @@
+"""
+MealOptimizer speed and solution quality against catalog size, for the
+greedy pass alone, with local search, and with local search capped at 50 ms,
+over random calorie and macro targets.
+Quality is the distance to the targets in kcal (macro grams converted at
+4/4/9 kcal per gram), and the share of suggestions within 5% of the
+calorie target.
+
+Usage: python benchmarks/bench_meal_optimizer.py [sizes] [targets]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _support
+from calorie_budget_planner import FoodItemBatch
+from meal_optimizer import MealOptimizer
+
+
+def catalog(size, rng):
+    batch = FoodItemBatch.empty(size)
+    batch.records["name"] = [f"food{i}" for i in range(size)]
+    batch.records["calories"] = rng.gamma(2.0, 120.0, size).round(0)
+    batch.records["protein"] = rng.gamma(1.5, 6.0, size).round(1)
+    batch.records["carbs"] = rng.gamma(1.5, 12.0, size).round(1)
+    batch.records["fats"] = rng.gamma(1.2, 5.0, size).round(1)
+    return batch
+
+
+def targets(count, rng):
+    # Remaining calories split 25-35% protein, 40-50% carbs, the rest fat
+    calories = rng.uniform(300, 2200, count)
+    protein = rng.uniform(0.25, 0.35, count)
+    carbs = rng.uniform(0.40, 0.50, count)
+    return np.column_stack([calories, calories * protein / 4, calories * carbs / 4,
+                            calories * (1 - protein - carbs) / 9])
+
+
+if __name__ == "__main__":
+    sizes = _support.parse_sizes(sys.argv, (1_000, 10_000, 100_000, 1_000_000))
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = np.random.default_rng(0)
+    goals = targets(count, rng)
+    print(f"{'foods':>10} {'search':<9} {'median':>9} {'p95':>9} {'kcal off':>9} {'within 5%':>10}")
+    for size in sizes:
+        optimizer = MealOptimizer(catalog(size, rng))
+        for label, iterations, time_limit in (("greedy", 0, None), ("local", 20, None), ("50ms cap", 20, 0.05)):
+            times = []
+            distances = []
+            within = 0
+            for goal in goals.tolist():
+                start = time.perf_counter()
+                meal = optimizer.suggest(*goal, iterations=iterations, time_limit=time_limit)
+                times.append(time.perf_counter() - start)
+                totals = np.array([meal.total_calories(), *meal.total_macros()])
+                distances.append(float(np.linalg.norm((totals - goal) * MealOptimizer.KCAL_PER_UNIT)))
+                within += abs(totals[0] - goal[0]) <= 0.05 * goal[0]
+            print(f"{size:>10,} {label:<9} {np.median(times) * 1000:7.1f}ms {np.percentile(times, 95) * 1000:7.1f}ms"
+                  f" {np.mean(distances):9.1f} {within / count:10.0%}")
@@ -0,0 +1,62 @@
+"""
+Compare the list-of-FoodItem MealTracker with the columnar, NumPy-backed one.
+"list rescan" and "columnar totals" both scan every item; the list one sums the
+FoodItems the way MealTracker did before it kept running totals. "list cached"
+is MealTracker's O(1) running totals, shown on its own since it scans nothing.
+
+Usage: python benchmarks/bench_meal_tracker.py [sizes]
+       e.g. python benchmarks/bench_meal_tracker.py 10000,1000000,10000000
+"""
+import sys
+
+import numpy as np
+
+import _support
+from calorie_budget_planner import ColumnarMealTracker, FoodItem, MealTracker
+
+
+def run(size):
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 800, size=(size, 4))
+
+    def build_list():
+        tracker = MealTracker()
+        for calories, protein, carbs, fats in values.tolist():
+            tracker.add_food(FoodItem("food", calories, protein, carbs, fats))
+        return tracker
+
+    def build_columnar():
+        tracker = ColumnarMealTracker()
+        tracker.add_foods(values)
+        return tracker
+
+    list_tracker = build_list()
+    columnar_tracker = build_columnar()
+
+    def list_rescan():
+        items = list_tracker.food_items
+        return (sum(item.calories for item in items), sum(item.protein for item in items),
+                sum(item.carbs for item in items), sum(item.fats for item in items))
+
+    def list_cached():
+        list_tracker.total_calories()
+        list_tracker.total_macros()
+
+    results = {
+        "list build": _support.best_of(build_list, repeat=1),
+        "columnar build": _support.best_of(build_columnar),
+        "list rescan": _support.best_of(list_rescan),
+        "columnar totals": _support.best_of(columnar_tracker.totals),
+        "list cached": _support.best_of(list_cached),
+    }
+    del list_tracker
+    return results
+
+
+if __name__ == "__main__":
+    for size in _support.parse_sizes(sys.argv, (10_000, 1_000_000, 10_000_000)):
+        results = run(size)
+        print(f"\n{size:,} items")
+        for label, seconds in results.items():
+            print(f"  {label:<16} {seconds * 1000:10.2f} ms")
+        print(f"  totals speed-up  {results['list rescan'] / results['columnar totals']:10.1f}x")
@@ -0,0 +1,75 @@
+"""
+Memory per food item for each representation: a plain class with a __dict__
+(how FoodItem used to be), the slotted FoodItem, FoodItemBatch and
+ColumnarMealTracker. Also reports bytes per User object for every module.
+
+Food names are shared strings, as they are when the same foods are logged
+repeatedly, so only the per-item overhead is measured.
+
+Usage: python benchmarks/bench_memory.py [items]
+"""
+import sys
+import tracemalloc
+
+import numpy  # imported up front so the import isn't counted as item memory
+
+import _support
+import calorie_budget_planner
+import dietary_recommendation
+import Hydration_Tracker
+import nutrition_visualizer
+from calorie_budget_planner import ColumnarMealTracker, FoodItem, FoodItemBatch
+
+
+class DictFoodItem:
+    def __init__(self, name, calories, protein, carbs, fats):
+        self.name = name
+        self.calories = calories
+        self.protein = protein
+        self.carbs = carbs
+        self.fats = fats
+
+
+def bytes_per(build, count):
+    tracemalloc.start()
+    kept = build(count)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return used / count
+
+
+def food_rows(count):
+    names = ("oats", "apple", "rice", "salmon")
+    return [(names[i % 4], float(i % 900), 10.0, 20.0, 5.0) for i in range(count)]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = food_rows(count)
+    items = [FoodItem(*row) for row in rows]
+
+    def columnar(n):
+        tracker = ColumnarMealTracker(capacity=n)
+        tracker.add_foods(FoodItemBatch.from_items(items[:n]))
+        return tracker
+
+    food = {
+        "dict FoodItem": lambda n: [DictFoodItem(*row) for row in rows[:n]],
+        "slotted FoodItem": lambda n: [FoodItem(*row) for row in rows[:n]],
+        "FoodItemBatch": lambda n: FoodItemBatch.from_items(items[:n]),
+        "ColumnarMealTracker": columnar,
+    }
+    print(f"{count:,} food items")
+    for label, build in food.items():
+        print(f"  {label:<22} {bytes_per(build, count):8.1f} bytes/item")
+
+    users = {
+        "calorie User": lambda n: [calorie_budget_planner.User("a", 2000.0) for _ in range(n)],
+        "hydration User": lambda n: [Hydration_Tracker.User("a", 70.0, "low") for _ in range(n)],
+        "dietary User": lambda n: [dietary_recommendation.User(30, "male") for _ in range(n)],
+        "nutrition User": lambda n: [nutrition_visualizer.User(30, "male", 70.0, 175.0) for _ in range(n)],
+    }
+    print("users")
+    for label, build in users.items():
+        print(f"  {label:<22} {bytes_per(build, 100_000):8.1f} bytes/object")
@@ -0,0 +1,28 @@
+"""
+Clinic report rendering: one chart per patient (BarChartStrategy) against a
+single multi-user figure (small multiples, box plot, violin plot) for the
+same intake matrix.
+
+Usage: python benchmarks/bench_multi_user_charts.py [patients]
+"""
+import sys
+
+import numpy as np
+
+import _support
+import nutrition_visualizer
+from nutrition_visualizer import (FOOD_GROUPS, BarChartStrategy, BoxPlotChartStrategy, FoodIntake,
+                                  SmallMultiplesChartStrategy, ViolinPlotChartStrategy)
+
+if __name__ == "__main__":
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    intake = np.random.default_rng(0).gamma(4.0, 1.0, (patients, len(FOOD_GROUPS))).round(1)
+    nutrition_visualizer._use_agg_backend()
+
+    bar = BarChartStrategy()
+    per_patient = _support.best_of(lambda: [bar.render(dict(zip(FOOD_GROUPS, row)), FoodIntake.RECOMMENDATION)
+                                            for row in intake], repeat=1)
+    print(f"{patients} single-patient bar charts   {per_patient:8.2f} s")
+    for strategy in (SmallMultiplesChartStrategy(), BoxPlotChartStrategy(), ViolinPlotChartStrategy()):
+        seconds = _support.best_of(lambda: strategy.render(intake))
+        print(f"one {type(strategy).__name__:<28} {seconds:8.2f} s   {per_patient / seconds:6.1f}x faster")
@@ -0,0 +1,40 @@
+"""
+Vectorised population screening (BMI, BMI category, recommended water intake)
+against calling the per-user methods in a loop, from 1k to 10M people.
+
+The per-user loop is skipped above 1M people unless a larger limit is given.
+
+Usage: python benchmarks/bench_population_screening.py [sizes] [scalar_limit]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _support
+import Hydration_Tracker
+import nutrition_visualizer
+from population_screening import screen
+
+if __name__ == "__main__":
+    sizes = _support.parse_sizes(sys.argv, (1_000, 10_000, 100_000, 1_000_000, 10_000_000))
+    scalar_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        weight = np.round(rng.uniform(40, 150, size), 1)
+        height = np.round(rng.uniform(140, 210, size), 1)
+        activity = rng.choice(np.array(["low", "medium", "high"]), size)
+
+        start = time.perf_counter()
+        screen(weight, height, activity)
+        vectorised = time.perf_counter() - start
+        line = f"{size:>11,} people  vectorised {vectorised * 1000:10.1f} ms"
+
+        if size <= scalar_limit:
+            start = time.perf_counter()
+            for w, h, a in zip(weight.tolist(), height.tolist(), activity.tolist()):
+                nutrition_visualizer.User(0, "", w, h).bmi_category()
+                Hydration_Tracker.User("", w, a).recommended_water_intake()
+            scalar = time.perf_counter() - start
+            line += f"  per-user loop {scalar * 1000:10.1f} ms  ({scalar / vectorised:5.1f}x)"
+        print(line)
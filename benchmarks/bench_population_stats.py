@@ -0,0 +1,70 @@
+"""
+Population calorie and macro statistics over synthetic MealTracker days,
+streamed in chunks through PopulationStats on several processes and merged,
+against exact NumPy statistics over the full in-memory array.
+
+Usage: python benchmarks/bench_population_stats.py [days] [processes]
+"""
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+import _support
+from population_stats import PopulationStats
+
+CHUNK_DAYS = 1_000_000
+GOALS = np.array([1800.0, 2000.0, 2200.0, 2500.0])
+
+
+def synthetic_days(seed, days):
+    # Calories, protein, carbs and fats per day, and the user's daily goal
+    rng = np.random.default_rng(seed)
+    totals = np.column_stack([rng.gamma(9, 230, days), rng.gamma(5, 18, days),
+                              rng.lognormal(5.3, 0.4, days), rng.gamma(4, 17, days)])
+    return totals, GOALS[rng.integers(0, len(GOALS), days)]
+
+
+def partial_stats(chunk):
+    seed, days = chunk
+    stats = PopulationStats()
+    stats.add_days(*synthetic_days(seed, days))
+    return stats
+
+
+def chunks(days):
+    return [(seed, min(CHUNK_DAYS, days - start)) for seed, start in enumerate(range(0, days, CHUNK_DAYS))]
+
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        stats = PopulationStats()
+        for partial in pool.imap_unordered(partial_stats, chunks(days)):
+            stats.merge(partial)
+    summary = stats.summary()
+    streaming = time.perf_counter() - start
+
+    # Exact reference: the calorie column only, to keep memory in check
+    start = time.perf_counter()
+    calories = np.concatenate([synthetic_days(seed, n)[0][:, 0] for seed, n in chunks(days)])
+    exact = np.quantile(calories, PopulationStats.QUANTILES)
+    reference = time.perf_counter() - start
+
+    print(f"{summary['days']:,} days on {processes} processes, {len(chunks(days))} merged partial results")
+    # Both timings include generating the synthetic days
+    print(f"streaming, 4 metrics {streaming:7.2f} s   ({streaming / days * 1e9:5.0f} ns/day, constant memory)")
+    print(f"exact, calories only {reference:7.2f} s   ({calories.nbytes / 1e6:.0f} MB in memory)")
+    print(f"over daily goal      {summary['over_goal_fraction']:.2%} of days")
+    print(f"{'metric':<10}{'mean':>10}{'std':>10}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for metric in PopulationStats.METRICS:
+        row = summary[metric]
+        print(f"{metric:<10}" + "".join(f"{row[key]:10.1f}" for key in ("mean", "std", "p50", "p90", "p99")))
+    errors = [(summary["calories"][f"p{round(q * 100)}"] - value) / value
+              for q, value in zip(PopulationStats.QUANTILES, exact)]
+    print("calorie quantile error vs exact: " + ", ".join(f"p{round(q * 100)} {error:+.3%}"
+                                                         for q, error in zip(PopulationStats.QUANTILES, errors)))
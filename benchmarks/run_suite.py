@@ -0,0 +1,162 @@
+"""
+Runs the benchmark suite in suite.py offline and saves the results as JSON,
+so that runs on different commits can be compared.
+
+Every time_* method of every benchmark class is timed at each scale in its
+params (1 to 1,000,000 users). Fast calls are looped until a sample takes
+at least --min-sample seconds, and the per-call time of the best of
+--repeat samples is reported. A method raising NotImplementedError skips
+that scale. Results go to benchmarks/results/<commit>.json by default,
+which git ignores.
+
+Usage:
+    python benchmarks/run_suite.py [--max-scale 10000] [--filter '*Charts*']
+                                   [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import _support
+import nutrition_visualizer
+import suite
+
+
+def measure(func, repeat, min_sample, max_seconds):
+    """
+    Return (seconds per call, calls per sample, samples) for func
+    """
+    # The first call doubles as a warm-up and tells how many calls fit in a sample
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = max(1, int(min_sample / first)) if first > 0 else 1000
+    samples = []
+    spent = first
+    while len(samples) < repeat and (not samples or spent < max_seconds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number)
+        spent += elapsed
+    return min(samples), number, len(samples)
+
+
+def run(benchmarks, pattern, max_scale, repeat, min_sample, max_seconds):
+    results = []
+    for cls in benchmarks:
+        methods = sorted(name for name in dir(cls) if name.startswith("time_"))
+        for n in cls.params:
+            if n > max_scale:
+                continue
+            selected = [name for name in methods if fnmatch.fnmatch(f"{cls.__name__}.{name}", pattern)]
+            if not selected:
+                continue
+            instance = cls()
+            instance.setup(n)
+            for name in selected:
+                benchmark = f"{cls.__name__}.{name}"
+                try:
+                    seconds, number, samples = measure(lambda: getattr(instance, name)(n),
+                                                       repeat, min_sample, max_seconds)
+                except NotImplementedError:
+                    continue
+                results.append({"benchmark": benchmark, "n": n, "seconds": seconds,
+                                "per_user_seconds": seconds / n, "number": number, "samples": samples})
+                print(f"{benchmark:<62} n={n:<9,} {_format(seconds):>10}/call  {_format(seconds / n):>10}/user",
+                      flush=True)
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """
+    Print benchmarks that got slower than the baseline by more than threshold;
+    returns how many did
+    """
+    with open(baseline_path) as f:
+        baseline = {(r["benchmark"], r["n"]): r["seconds"] for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["benchmark"], result["n"]))
+        if before is None:
+            continue
+        ratio = result["seconds"] / before
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        if flag:
+            print(f"  {result['benchmark']:<62} n={result['n']:<9,} {ratio:6.2f}x{flag}")
+    print(f"{regressions} regression(s) beyond {threshold:.2f}x")
+    return regressions
+
+
+def _format(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_support.ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and save the results as JSON.")
+    parser.add_argument("--filter", default="*", help="Glob over Class.method names, e.g. '*Charts*'")
+    parser.add_argument("--max-scale", type=int, default=max(suite.SCALES), help="Skip larger scales")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per benchmark")
+    parser.add_argument("--min-sample", type=float, default=0.05, help="Seconds per sample for fast calls")
+    parser.add_argument("--max-seconds", type=float, default=10.0,
+                        help="Stop sampling a benchmark after this long (at least one sample is taken)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    options = parser.parse_args()
+
+    commit = _commit()
+    output = options.output or os.path.join(_support.ROOT, "benchmarks", "results", f"{commit}.json")
+    output = os.path.abspath(output)
+    nutrition_visualizer._use_agg_backend()
+
+    # Exports write into a scratch directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            results = run(suite.BENCHMARKS, options.filter, options.max_scale,
+                          options.repeat, options.min_sample, options.max_seconds)
+        finally:
+            os.chdir(cwd)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        }, f, indent=1)
+    print(f"\nSaved {len(results)} results to {output}")
+
+    if options.compare and compare(results, options.compare, options.threshold):
+        sys.exit(1)
@@ -0,0 +1,254 @@
+"""
+Benchmark definitions for run_suite.py, written in the asv style: each class
+has params (the scale, usually the number of users), setup(n) builds the
+inputs outside the timing, and every time_* method is timed once per scale.
+"""
+import contextlib
+import io
+
+import numpy as np
+
+import _support
+import calorie_budget_planner
+import dietary_recommendation
+import Hydration_Tracker
+import nutrition_visualizer
+from bulk_export import export_bulk
+
+SCALES = [1, 100, 10_000, 1_000_000]
+SMALL_SCALES = [1, 100, 10_000]
+
+ACTIVITY_LEVELS = np.array(["low", "medium", "high"])
+PROFILES = [
+    (34, "female", None, True, False),
+    (45, "male", None, False, False),
+    (72, "female", None, False, False),
+    (7, None, "boy", False, False),
+    (12, None, "girl", False, False),
+    (28, "female", None, False, True),
+]
+
+
+def _foods(n):
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 500, (n, 4)).round(1)
+    return [calorie_budget_planner.FoodItem(f"food{i}", *row) for i, row in enumerate(values.tolist())]
+
+
+# -----------------------------
+# Calculations
+# -----------------------------
+class MealTrackerTotals:
+    params = SCALES
+
+    def setup(self, n):
+        self.foods = _foods(n)
+        self.tracker = calorie_budget_planner.MealTracker()
+        for food in self.foods:
+            self.tracker.add_food(food)
+        self.values = np.array([[f.calories, f.protein, f.carbs, f.fats] for f in self.foods])
+        self.columnar = calorie_budget_planner.ColumnarMealTracker()
+        self.columnar.add_foods(self.values)
+
+    def time_add_foods(self, n):
+        tracker = calorie_budget_planner.MealTracker()
+        for food in self.foods:
+            tracker.add_food(food)
+
+    def time_totals(self, n):
+        self.tracker.total_calories()
+        self.tracker.total_macros()
+
+    def time_columnar_add_foods(self, n):
+        calorie_budget_planner.ColumnarMealTracker().add_foods(self.values)
+
+    def time_columnar_totals(self, n):
+        self.columnar.totals()
+
+
+class DietaryRecommendationConstruction:
+    params = SCALES
+
+    def setup(self, n):
+        self.users = [dietary_recommendation.User(*PROFILES[i % len(PROFILES)]) for i in range(n)]
+        self.columns = [list(column) for column in zip(*(PROFILES[i % len(PROFILES)] for i in range(n)))]
+
+    def time_construct(self, n):
+        for user in self.users:
+            dietary_recommendation.DietaryRecommendation(user)
+
+    def time_batch_recommendations(self, n):
+        dietary_recommendation.DietaryRecommendation.batch_recommendations(*self.columns)
+
+
+class BodyCalculations:
+    params = SCALES
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.weight = rng.uniform(40, 140, n).round(1)
+        self.height = rng.uniform(140, 210, n).round(1)
+        self.activity = ACTIVITY_LEVELS[rng.integers(0, 3, n)]
+        self.bmi_users = [nutrition_visualizer.User(30, "female", w, h)
+                          for w, h in zip(self.weight.tolist(), self.height.tolist())]
+        self.water_users = [Hydration_Tracker.User("user", w, a)
+                            for w, a in zip(self.weight.tolist(), self.activity.tolist())]
+
+    def time_calculate_bmi(self, n):
+        for user in self.bmi_users:
+            user.calculate_bmi()
+
+    def time_calculate_bmi_array(self, n):
+        nutrition_visualizer.User.calculate_bmi_array(self.weight, self.height)
+
+    def time_recommended_water_intake(self, n):
+        for user in self.water_users:
+            user.recommended_water_intake()
+
+    def time_recommended_water_intake_array(self, n):
+        Hydration_Tracker.User.recommended_water_intake_array(self.weight, self.activity)
+
+
+# -----------------------------
+# Exports
+# -----------------------------
+class DataProcessorExports:
+    # One text file per user, written to the suite's scratch directory
+    params = SMALL_SCALES
+
+    def setup(self, n):
+        self.calorie = []
+        self.hydration = []
+        self.nutrition = []
+        meal = calorie_budget_planner.MealTracker()
+        for food in _foods(3):
+            meal.add_food(food)
+        water = Hydration_Tracker.WaterIntake([2.1, 1.8, 2.6, 2.4, 1.9, 2.2, 2.0])
+        intake = nutrition_visualizer.FoodIntake(5, 2, 6, 2.5, 2.5)
+        for i in range(n):
+            self.calorie.append((calorie_budget_planner.User(f"user{i}", 2000), meal))
+            self.hydration.append((Hydration_Tracker.User(f"user{i}", 70, "medium"), water))
+            self.nutrition.append((nutrition_visualizer.User(30, "female", 60, 165), intake))
+
+    def time_calorie_export_data(self, n):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for user, meal in self.calorie:
+                calorie_budget_planner.DataProcessor.export_data(user, meal)
+
+    def time_hydration_export_data(self, n):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for user, water in self.hydration:
+                Hydration_Tracker.DataProcessor.export_data(user, water)
+
+    def time_nutrition_save_data(self, n):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for user, intake in self.nutrition:
+                nutrition_visualizer.DataProcessor.save_data(user, intake)
+
+
+class BulkExports:
+    # Every user's DataProcessor.to_record streamed into one CSV file
+    params = SCALES
+
+    def setup(self, n):
+        meal = calorie_budget_planner.MealTracker()
+        for food in _foods(3):
+            meal.add_food(food)
+        water = Hydration_Tracker.WaterIntake([2.1, 1.8, 2.6, 2.4, 1.9, 2.2, 2.0])
+        intake = nutrition_visualizer.FoodIntake(5, 2, 6, 2.5, 2.5)
+        self.calorie = [(calorie_budget_planner.User(f"user{i}", 2000), meal) for i in range(n)]
+        self.hydration = [(Hydration_Tracker.User(f"user{i}", 70, "medium"), water) for i in range(n)]
+        self.nutrition = [(nutrition_visualizer.User(30, "female", 60, 165), intake) for _ in range(n)]
+
+    def time_calorie_to_record(self, n):
+        export_bulk(self.calorie, calorie_budget_planner.DataProcessor.to_record, "calorie.csv")
+
+    def time_hydration_to_record(self, n):
+        export_bulk(self.hydration, Hydration_Tracker.DataProcessor.to_record, "hydration.csv")
+
+    def time_nutrition_to_record(self, n):
+        export_bulk(self.nutrition, nutrition_visualizer.DataProcessor.to_record, "nutrition.csv")
+
+
+# -----------------------------
+# Charts (headless Agg backend)
+# -----------------------------
+class HydrationCharts:
+    # Scale is the number of days logged
+    params = SCALES
+
+    def setup(self, n):
+        self.water = Hydration_Tracker.WaterIntake(np.random.default_rng(0).uniform(1, 4, n).round(2).tolist(), 2.5)
+
+    def time_bar_chart(self, n):
+        if n > 10_000:
+            raise NotImplementedError("A bar per day is unreadable beyond 10,000 days")
+        Hydration_Tracker.BarChartStrategy().render(self.water.daily_intake, self.water.recommended)
+
+    def time_line_chart(self, n):
+        Hydration_Tracker.LineChartStrategy().render(self.water.daily_intake, self.water.recommended,
+                                                     self.water.rolling_average_series(7))
+
+
+class NutritionCharts:
+    # Single-user charts: the scale is the number of charts rendered
+    params = [1, 100]
+
+    def setup(self, n):
+        rng = np.random.default_rng(0)
+        self.bmis = rng.uniform(15, 40, n).round(1).tolist()
+        self.actual = [dict(zip(nutrition_visualizer.FOOD_GROUPS, row)) for row in rng.gamma(4, 1, (n, 5)).tolist()]
+        self.recommended = nutrition_visualizer.FoodIntake.RECOMMENDATION
+
+    def time_bmi_chart(self, n):
+        strategy = nutrition_visualizer.BMIChartStrategy()
+        for bmi in self.bmis:
+            strategy.render(bmi)
+
+    def time_bmi_render_many(self, n):
+        nutrition_visualizer.BMIChartStrategy().render_many(self.bmis)
+
+    def time_bar_chart(self, n):
+        for actual in self.actual:
+            nutrition_visualizer.BarChartStrategy().render(actual, self.recommended)
+
+    def time_line_chart(self, n):
+        for actual in self.actual:
+            nutrition_visualizer.LineChartStrategy().render(actual, self.recommended)
+
+    def time_pie_chart(self, n):
+        for actual in self.actual:
+            nutrition_visualizer.PieChartStrategy().render(actual, self.recommended)
+
+
+class MultiUserCharts:
+    # One figure for the whole intake matrix; the scale is the number of users
+    params = SCALES
+
+    def setup(self, n):
+        self.intake = np.random.default_rng(0).gamma(4, 1, (n, len(nutrition_visualizer.FOOD_GROUPS)))
+
+    def time_small_multiples(self, n):
+        if n > 100:
+            raise NotImplementedError("Small multiples are meant for up to a few hundred panels")
+        nutrition_visualizer.SmallMultiplesChartStrategy().render(self.intake)
+
+    def time_box_plot(self, n):
+        nutrition_visualizer.BoxPlotChartStrategy().render(self.intake)
+
+    def time_violin_plot(self, n):
+        if n > 10_000:
+            raise NotImplementedError("Kernel density estimates are too slow for a million users")
+        nutrition_visualizer.ViolinPlotChartStrategy().render(self.intake)
+
+
+BENCHMARKS = [
+    MealTrackerTotals,
+    DietaryRecommendationConstruction,
+    BodyCalculations,
+    DataProcessorExports,
+    BulkExports,
+    HydrationCharts,
+    NutritionCharts,
+    MultiUserCharts,
+]
@@ -0,0 +1,175 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# -----------------------------
+# Row Formats
+# -----------------------------
+class CsvFormat:
+    extension = "csv"
+
+    def header(self, columns):
+        return self.rows(columns, [dict(zip(columns, columns))])
+
+    def rows(self, columns, records):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for record in records:
+            writer.writerow([self._cell(record.get(column)) for column in columns])
+        return buffer.getvalue()
+
+    @staticmethod
+    def _cell(value):
+        # Lists (e.g. daily intake) are stored in one cell, separated by ';'
+        if isinstance(value, (list, tuple)):
+            return ";".join(str(item) for item in value)
+        return value
+
+
+class JsonLinesFormat:
+    extension = "jsonl"
+
+    def header(self, columns):
+        return ""
+
+    def rows(self, columns, records):
+        return "".join(json.dumps(record) + "\n" for record in records)
+
+
+class ParquetFormat:
+    """
+    Columnar Parquet output. Needs pyarrow, which is imported on first use.
+    """
+    extension = "parquet"
+
+    def open(self, path, columns, sample):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Parquet export needs the pyarrow package.") from error
+        schema = pa.Table.from_pylist([sample]).select(columns).schema
+        return pq.ParquetWriter(path, schema)
+
+    def table(self, columns, records):
+        import pyarrow as pa
+
+        return pa.Table.from_pylist(records).select(columns)
+
+
+FORMATS = {
+    "csv": CsvFormat,
+    "jsonl": JsonLinesFormat,
+    "parquet": ParquetFormat,
+}
+
+# -----------------------------
+# Bulk Exporter
+# -----------------------------
+class BulkExporter:
+    """
+    Streams records for many users to one file or a sharded directory.
+    Rows are formatted into buffers of buffer_rows records and each buffer is
+    written with a single large write. With io_threads, writes run on
+    background threads (one queue per shard, so rows stay in order) while the
+    next buffer is being built.
+    """
+    def __init__(self, destination, format="csv", shards=1, buffer_rows=10000, io_threads=0):
+        """
+        :param destination: Output file, or a directory when shards > 1
+        :param format: 'csv', 'jsonl' or 'parquet'
+        :param shards: Number of output files; buffers are spread across them in turn
+        :param buffer_rows: Records formatted per write
+        :param io_threads: Background writer threads (0 writes inline)
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format '{format}'. Use one of: {', '.join(FORMATS)}.")
+        if shards < 1 or buffer_rows < 1:
+            raise ValueError("shards and buffer_rows must be at least 1.")
+        self.destination = destination
+        self.format = FORMATS[format]()
+        self.shards = shards
+        self.buffer_rows = buffer_rows
+        self.io_threads = io_threads
+
+    def shard_paths(self):
+        if self.shards == 1:
+            return [self.destination]
+        return [os.path.join(self.destination, f"part-{i:05d}.{self.format.extension}")
+                for i in range(self.shards)]
+
+    def export(self, pairs, record_fn):
+        """
+        Export every (user, data) pair.
+        :param pairs: Iterable of (user, data) pairs
+        :param record_fn: Turns a pair into a record, e.g. DataProcessor.to_record
+        :return: Number of records written
+        """
+        if self.shards > 1:
+            os.makedirs(self.destination, exist_ok=True)
+        paths = self.shard_paths()
+        writers = [None] * self.shards
+        executors = [ThreadPoolExecutor(max_workers=1) for _ in range(min(self.io_threads, self.shards))]
+        pending = []
+        columns = None
+        count = 0
+        chunk = 0
+
+        def flush(records):
+            nonlocal chunk, columns
+            if columns is None:
+                columns = list(records[0])
+            shard = chunk % self.shards
+            chunk += 1
+            if writers[shard] is None:
+                writers[shard] = self._open(paths[shard], columns, records[0])
+            if isinstance(self.format, ParquetFormat):
+                payload = self.format.table(columns, records)
+                task = (writers[shard].write_table, payload)
+            else:
+                payload = self.format.rows(columns, records)
+                task = (writers[shard].write, payload)
+            if executors:
+                pending.append(executors[shard % len(executors)].submit(*task))
+                # Bound the number of buffers waiting to be written
+                while len(pending) > 2 * len(executors):
+                    pending.pop(0).result()
+            else:
+                task[0](task[1])
+
+        try:
+            records = []
+            for user, data in pairs:
+                records.append(record_fn(user, data))
+                if len(records) >= self.buffer_rows:
+                    flush(records)
+                    count += len(records)
+                    records = []
+            if records:
+                flush(records)
+                count += len(records)
+            for future in pending:
+                future.result()
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+            for writer in writers:
+                if writer is not None:
+                    writer.close()
+        return count
+
+    def _open(self, path, columns, sample):
+        if isinstance(self.format, ParquetFormat):
+            return self.format.open(path, columns, sample)
+        f = open(path, "w", newline="", buffering=1 << 20)
+        f.write(self.format.header(columns))
+        return f
+
+
+def export_bulk(pairs, record_fn, destination, **options):
+    """
+    Convenience wrapper: BulkExporter(destination, **options).export(pairs, record_fn)
+    """
+    return BulkExporter(destination, **options).export(pairs, record_fn)
@@ -1,7 +1,22 @@
+import csv
+import datetime
+import functools
+import os
+import re
+import sqlite3
+import sys
+
+# Helpers shared by the scripts (batch mode, exact rounding, log storage) are in the sibling "shared" folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+import batch_mode
+import log_storage
+
 # -----------------------------
 # User Class
 # -----------------------------
 class User:
+    __slots__ = ("name", "daily_goal")
+
     def __init__(self, name, daily_calorie_goal):
         """
         Initialize user with a daily calorie goal
@@ -13,6 +28,8 @@ class User:
 # Food Item Class
 # -----------------------------
 class FoodItem:
+    __slots__ = ("name", "calories", "protein", "carbs", "fats")
+
     def __init__(self, name, calories, protein, carbs, fats):
         """
         Represents a single food item
@@ -28,27 +45,260 @@ class FoodItem:
         self.carbs = carbs
         self.fats = fats
 
+# -----------------------------
+# Food Item Batch
+# -----------------------------
+class FoodItemBatch:
+    """
+    Many food items in one NumPy structured array (name, calories, protein,
+    carbs, fats): 40 bytes per item (a name reference and four floats).
+    Columns are zero-copy views, e.g. batch["calories"].
+    """
+    FIELDS = FoodItem.__slots__
+
+    def __init__(self, records):
+        """
+        :param records: Structured array with the FIELDS columns (see empty())
+        """
+        self.records = records
+
+    @staticmethod
+    def dtype():
+        import numpy as np
+
+        return np.dtype([("name", object), ("calories", "f8"), ("protein", "f8"),
+                         ("carbs", "f8"), ("fats", "f8")])
+
+    @classmethod
+    def empty(cls, size):
+        import numpy as np
+
+        return cls(np.zeros(size, dtype=cls.dtype()))
+
+    @classmethod
+    def from_items(cls, food_items):
+        """
+        Build a batch from FoodItem objects in a single pass
+        """
+        import numpy as np
+
+        food_items = list(food_items)
+        rows = ((item.name, item.calories, item.protein, item.carbs, item.fats) for item in food_items)
+        return cls(np.fromiter(rows, dtype=cls.dtype(), count=len(food_items)))
+
+    def to_items(self):
+        return [FoodItem(*row) for row in self.records.tolist()]
+
+    def values(self):
+        """
+        (n, 4) float array of calories, protein, carbs and fats
+        """
+        import numpy as np
+
+        return np.column_stack([self.records[field] for field in self.FIELDS[1:]])
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.records[key]
+        if isinstance(key, slice):
+            return FoodItemBatch(self.records[key])
+        return FoodItem(*self.records[key].tolist())
+
+    def __iter__(self):
+        return iter(self.to_items())
+
+# -----------------------------
+# Food Database
+# -----------------------------
+DEFAULT_FOODS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "foods.csv")
+
+
+class FoodDatabase:
+    """
+    Local food-composition database (values per serving) stored in SQLite.
+    Foods are kept in a table clustered on their lower-cased name, which
+    serves both exact lookups and prefix searches as B-tree range scans.
+    An LRU cache sits in front of exact lookups for frequently logged foods.
+    """
+    def __init__(self, path=":memory:", cache_size=4096):
+        """
+        :param path: SQLite file, or ':memory:' for an in-memory database
+        :param cache_size: Number of foods kept in the lookup cache
+        """
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS foods ("
+            " key TEXT PRIMARY KEY, name TEXT, serving TEXT,"
+            " calories REAL, protein REAL, carbs REAL, fats REAL"
+            ") WITHOUT ROWID"
+        )
+        self._cached_get = functools.lru_cache(maxsize=cache_size)(self._get)
+
+    @classmethod
+    def from_csv(cls, csv_path=DEFAULT_FOODS_CSV, path=":memory:", **kwargs):
+        """
+        Create a database and load foods from a CSV file with
+        name, serving, calories, protein, carbs and fats columns
+        """
+        database = cls(path, **kwargs)
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            database.add_foods(csv.DictReader(f))
+        return database
+
+    def add_foods(self, rows):
+        """
+        Insert or replace foods from dicts with the CSV columns, in one transaction
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO foods VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((row["name"].strip().lower(), row["name"].strip(), row.get("serving", ""),
+                  float(row["calories"]), float(row["protein"]), float(row["carbs"]), float(row["fats"]))
+                 for row in rows),
+            )
+        self._cached_get.cache_clear()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM foods").fetchone()[0]
+
+    def _get(self, key):
+        row = self.connection.execute(
+            "SELECT name, calories, protein, carbs, fats FROM foods WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else FoodItem(*row)
+
+    def get(self, name):
+        """
+        Return the FoodItem for a name (case-insensitive), or None if unknown
+        """
+        return self._cached_get(name.strip().lower())
+
+    def lookup(self, name):
+        food_item = self.get(name)
+        if food_item is None:
+            raise KeyError(f"'{name}' is not in the food database.")
+        return food_item
+
+    def search(self, prefix, limit=10):
+        """
+        Names of foods starting with prefix, in alphabetical order (for autocomplete)
+        """
+        low = prefix.strip().lower()
+        rows = self.connection.execute(
+            "SELECT name FROM foods WHERE key >= ? AND key < ? ORDER BY key LIMIT ?",
+            (low, low + "\U0010ffff", limit),
+        )
+        return [name for (name,) in rows]
+
+    def cache_info(self):
+        return self._cached_get.cache_info()
+
+    def to_batch(self):
+        """
+        Every food as a FoodItemBatch, in name order (e.g. as a MealOptimizer catalog)
+        """
+        import numpy as np
+
+        rows = self.connection.execute("SELECT name, calories, protein, carbs, fats FROM foods ORDER BY key")
+        return FoodItemBatch(np.fromiter(rows, dtype=FoodItemBatch.dtype(), count=len(self)))
+
+# -----------------------------
+# Running Total Class
+# -----------------------------
+class RunningTotal:
+    """
+    Second-order compensated (Kahan-Babuska-Klein) running sum.
+    Keeps a correction term for the low-order bits lost in each addition, and
+    a second one for the bits lost while adding up the first, so long-running
+    float totals don't drift even after a huge value is added and taken away.
+    """
+    __slots__ = ("total", "compensation", "second_compensation")
+
+    def __init__(self):
+        self.total = 0
+        self.compensation = 0
+        self.second_compensation = 0
+
+    def add(self, value):
+        result = self.total + value
+        if abs(self.total) >= abs(value):
+            lost = (self.total - result) + value
+        else:
+            lost = (value - result) + self.total
+        self.total = result
+        result = self.compensation + lost
+        if abs(self.compensation) >= abs(lost):
+            self.second_compensation += (self.compensation - result) + lost
+        else:
+            self.second_compensation += (lost - result) + self.compensation
+        self.compensation = result
+
+    @property
+    def value(self):
+        return self.total + (self.compensation + self.second_compensation)
+
 # -----------------------------
 # Meal Tracker Class
 # -----------------------------
 class MealTracker:
-    def __init__(self):
+    def __init__(self, food_database=None):
         """
-        Store all food items for the day
+        Store all food items for the day.
+        Calorie and macro totals are kept up to date on every add, edit and
+        removal, so reading them is O(1). Change food_items only through the
+        methods below so the totals stay in sync.
+        :param food_database: Optional FoodDatabase so foods can be added by name
         """
         self.food_items = []
+        self.food_database = food_database
+        self._calories = RunningTotal()
+        self._protein = RunningTotal()
+        self._carbs = RunningTotal()
+        self._fats = RunningTotal()
+
+    def _apply(self, food_item, sign):
+        self._calories.add(sign * food_item.calories)
+        self._protein.add(sign * food_item.protein)
+        self._carbs.add(sign * food_item.carbs)
+        self._fats.add(sign * food_item.fats)
 
     def add_food(self, food_item):
+        """
+        Add a FoodItem, or a food name looked up in the food database
+        """
+        if isinstance(food_item, str):
+            if self.food_database is None:
+                raise ValueError("Adding foods by name needs a food database.")
+            food_item = self.food_database.lookup(food_item)
         self.food_items.append(food_item)
+        self._apply(food_item, 1)
+
+    def remove_food(self, index):
+        """
+        Remove and return the food item at the given position
+        """
+        food_item = self.food_items.pop(index)
+        self._apply(food_item, -1)
+        return food_item
+
+    def update_food(self, index, food_item):
+        """
+        Replace the food item at the given position and return the old one
+        """
+        old_item = self.food_items[index]
+        self.food_items[index] = food_item
+        self._apply(old_item, -1)
+        self._apply(food_item, 1)
+        return old_item
 
     def total_calories(self):
-        return sum(item.calories for item in self.food_items)
+        return self._calories.value
 
     def total_macros(self):
-        protein = sum(item.protein for item in self.food_items)
-        carbs = sum(item.carbs for item in self.food_items)
-        fats = sum(item.fats for item in self.food_items)
-        return protein, carbs, fats
+        return self._protein.value, self._carbs.value, self._fats.value
 
     def summary(self):
         print("\n--- Daily Meal Summary ---")
@@ -62,12 +312,352 @@ class MealTracker:
         return total_cal
 
 # -----------------------------
-# Data Processor
+# Columnar Meal Tracker
 # -----------------------------
-class DataProcessor:
+class ColumnarMealTracker:
+    """
+    Meal tracker for very large meal logs.
+    Calories, protein, carbs and fats are kept in a growable NumPy float
+    array (one row per nutrient) instead of a list of FoodItem objects, so
+    all totals come from a single vectorised reduction.
+    """
+    COLUMNS = ("calories", "protein", "carbs", "fats")
+
+    def __init__(self, capacity=1024):
+        """
+        :param capacity: Number of items to reserve space for up front
+        """
+        import numpy as np
+
+        self._values = np.zeros((len(self.COLUMNS), max(int(capacity), 1)), dtype=np.float64)
+        self._size = 0
+        self.names = []
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, extra):
+        # Grow geometrically so add_food stays amortised O(1)
+        import numpy as np
+
+        needed = self._size + extra
+        capacity = self._values.shape[1]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((len(self.COLUMNS), capacity), dtype=np.float64)
+        grown[:, :self._size] = self._values[:, :self._size]
+        self._values = grown
+
+    def add_food(self, food_item):
+        self._reserve(1)
+        column = self._values[:, self._size]
+        column[0] = food_item.calories
+        column[1] = food_item.protein
+        column[2] = food_item.carbs
+        column[3] = food_item.fats
+        self.names.append(food_item.name)
+        self._size += 1
+
+    def add_foods(self, foods, names=None):
+        """
+        Add many food items at once.
+        :param foods: An (n, 4) array-like of calories, protein, carbs, fats,
+                      a FoodItemBatch, or an iterable of FoodItem objects
+        :param names: Optional food names when foods is an array
+        """
+        import numpy as np
+
+        if isinstance(foods, FoodItemBatch):
+            foods, names = foods.values(), foods.records["name"].tolist()
+        elif not isinstance(foods, np.ndarray):
+            foods = list(foods)
+            if foods and isinstance(foods[0], FoodItem):
+                self._reserve(len(foods))
+                for food_item in foods:
+                    self.add_food(food_item)
+                return
+
+        values = np.asarray(foods, dtype=np.float64).reshape(-1, len(self.COLUMNS))
+        count = values.shape[0]
+        if names is not None and len(names) != count:
+            raise ValueError("names must have one entry per food row.")
+        self._reserve(count)
+        self._values[:, self._size:self._size + count] = values.T
+        self.names.extend(names if names is not None else [""] * count)
+        self._size += count
+
+    @property
+    def food_items(self):
+        # FoodItem view so existing code (e.g. DataProcessor) keeps working
+        rows = self._values[:, :self._size].T.tolist()
+        return [FoodItem(name, *row) for name, row in zip(self.names, rows)]
+
+    def totals(self):
+        """
+        Return (calories, protein, carbs, fats) from one reduction pass
+        """
+        return tuple(self._values[:, :self._size].sum(axis=1).tolist())
+
+    def total_calories(self):
+        return float(self._values[0, :self._size].sum())
+
+    def total_macros(self):
+        return self.totals()[1:]
+
+    def summary(self):
+        print("\n--- Daily Meal Summary ---")
+        for item in self.food_items:
+            print(f"{item.name}: {item.calories} kcal | P: {item.protein}g, C: {item.carbs}g, F: {item.fats}g")
+        total_cal, protein, carbs, fats = self.totals()
+        print(f"\nTotal Calories: {total_cal} kcal")
+        print(f"Total Macros: Protein: {protein}g, Carbs: {carbs}g, Fats: {fats}g")
+
+        return total_cal
+
+# -----------------------------
+# Fenwick Tree
+# -----------------------------
+class FenwickTree:
+    """
+    Binary indexed tree over a growable list of numbers: updating one entry
+    and summing any range both take O(log n).
+    """
+    def __init__(self, size=0):
+        self._values = [0] * size
+        self._tree = [0] * (size + 1)
+        for index in range(size):
+            self._propagate(index)
+
+    def __len__(self):
+        return len(self._values)
+
+    def _propagate(self, index):
+        # Add a freshly set entry into its parent node when building
+        node = index + 1
+        parent = node + (node & -node)
+        if parent < len(self._tree):
+            self._tree[parent] += self._tree[node]
+
+    def _grow(self, size):
+        # Rebuild in O(n) at double the capacity, so growth is amortised O(1)
+        size = max(size, 2 * len(self._values), 1)
+        values = self._values + [0] * (size - len(self._values))
+        self._values = values
+        self._tree = [0] + values[:]
+        for index in range(size):
+            self._propagate(index)
+
+    def add(self, index, delta):
+        if index >= len(self._values):
+            self._grow(index + 1)
+        self._values[index] += delta
+        node = index + 1
+        while node < len(self._tree):
+            self._tree[node] += delta
+            node += node & -node
+
+    def prefix_sum(self, count):
+        """
+        Sum of the first count entries
+        """
+        node = min(count, len(self._values))
+        total = 0
+        while node > 0:
+            total += self._tree[node]
+            node -= node & -node
+        return total
+
+    def range_sum(self, start, end):
+        """
+        Sum of entries start..end-1
+        """
+        if end <= start:
+            return 0
+        return self.prefix_sum(end) - self.prefix_sum(max(start, 0))
+
+# -----------------------------
+# Calorie Ledger
+# -----------------------------
+class CalorieLedger:
+    """
+    Calorie budget over many days: one MealTracker per date, with day, week,
+    month and arbitrary range totals of calories and macros.
+    Totals live in Fenwick trees indexed by day, so recording or editing any
+    day, including backdated ones, updates every rollup in O(log n).
+    """
+    METRICS = ("calories", "protein", "carbs", "fats")
+
+    def __init__(self, user, start_date, carryover=False):
+        """
+        :param user: User whose daily_goal is the budget for each day
+        :param start_date: First date of the ledger
+        :param carryover: Carry each day's surplus or deficit into the following days
+        """
+        self.user = user
+        self.start_date = start_date
+        self.carryover = carryover
+        self.days = {}
+        self._day_totals = {}
+        self._trees = {metric: FenwickTree() for metric in self.METRICS}
+        self._last_offset = -1
+
+    def _offset(self, day):
+        offset = (day - self.start_date).days
+        if offset < 0:
+            raise ValueError(f"{day} is before the ledger starts on {self.start_date}.")
+        return offset
+
+    def __len__(self):
+        # Number of days covered, from start_date up to the last recorded day
+        return self._last_offset + 1
+
+    def day(self, day):
+        """
+        MealTracker for a date, created on first use
+        """
+        self._offset(day)
+        if day not in self.days:
+            self.days[day] = MealTracker()
+        return self.days[day]
+
+    def record_day(self, day, meal_tracker=None):
+        """
+        Store (or re-read after editing) the meal tracker for a date
+        """
+        if meal_tracker is not None:
+            self._offset(day)
+            self.days[day] = meal_tracker
+        meal_tracker = self.day(day)
+        offset = self._offset(day)
+        totals = (meal_tracker.total_calories(),) + tuple(meal_tracker.total_macros())
+        previous = self._day_totals.get(offset, (0, 0, 0, 0))
+        for metric, new, old in zip(self.METRICS, totals, previous):
+            self._trees[metric].add(offset, new - old)
+        self._day_totals[offset] = totals
+        self._last_offset = max(self._last_offset, offset)
+
+    def add_food(self, day, food_item):
+        self.day(day).add_food(food_item)
+        self.record_day(day)
+
+    def remove_food(self, day, index):
+        food_item = self.day(day).remove_food(index)
+        self.record_day(day)
+        return food_item
+
+    def update_food(self, day, index, food_item):
+        old_item = self.day(day).update_food(index, food_item)
+        self.record_day(day)
+        return old_item
+
+    def range_totals(self, start, end):
+        """
+        Totals per metric for start..end (inclusive dates)
+        """
+        low = max((start - self.start_date).days, 0)
+        high = (end - self.start_date).days + 1
+        return {metric: tree.range_sum(low, high) for metric, tree in self._trees.items()}
+
+    def day_totals(self, day):
+        return self.range_totals(day, day)
+
+    def week_totals(self, day):
+        """
+        Totals for the Monday-to-Sunday week containing day
+        """
+        monday = day - datetime.timedelta(days=day.weekday())
+        return self.range_totals(monday, monday + datetime.timedelta(days=6))
+
+    def month_totals(self, year, month):
+        first = datetime.date(year, month, 1)
+        last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+        return self.range_totals(first, last)
+
+    def weekly_rollup(self):
+        """
+        List of (week start, totals) for every week the ledger covers
+        """
+        if len(self) == 0:
+            return []
+        end = self.start_date + datetime.timedelta(days=len(self) - 1)
+        monday = self.start_date - datetime.timedelta(days=self.start_date.weekday())
+        rollup = []
+        while monday <= end:
+            rollup.append((monday, self.week_totals(monday)))
+            monday += datetime.timedelta(days=7)
+        return rollup
+
+    def monthly_rollup(self):
+        """
+        List of ((year, month), totals) for every month the ledger covers
+        """
+        if len(self) == 0:
+            return []
+        end = self.start_date + datetime.timedelta(days=len(self) - 1)
+        year, month = self.start_date.year, self.start_date.month
+        rollup = []
+        while (year, month) <= (end.year, end.month):
+            rollup.append(((year, month), self.month_totals(year, month)))
+            year, month = year + month // 12, month % 12 + 1
+        return rollup
+
+    def budget(self, day):
+        """
+        Calories available on a date: the daily goal, plus the surplus or minus
+        the deficit of every earlier day when carryover is on
+        """
+        offset = self._offset(day)
+        if not self.carryover:
+            return self.user.daily_goal
+        consumed_before = self._trees["calories"].prefix_sum(offset)
+        return self.user.daily_goal * (offset + 1) - consumed_before
+
+    def remaining(self, day):
+        return self.budget(day) - self.day_totals(day)["calories"]
+
+# -----------------------------
+# Log Storage Backends
+# -----------------------------
+class LogStorage(log_storage.LogStorage):
+    """
+    Daily calorie logs for the storage backends in shared/log_storage.py.
+    save() stores a user's day and returns where it went; load() reads it back
+    as a (User, MealTracker) pair.
+    """
+    USER_COLUMNS = {"daily_goal": "REAL"}
+    ITEMS = "foods"
+    ITEM_TABLE = "meal_items"
+    ITEM_POSITION = "position"
+    ITEM_COLUMNS = {"name": "TEXT", "calories": "REAL", "protein": "REAL", "carbs": "REAL", "fats": "REAL"}
+
+    @staticmethod
+    def _record(user, meal_tracker):
+        return {
+            "user": user.name,
+            "daily_goal": user.daily_goal,
+            "foods": [[item.name, item.calories, item.protein, item.carbs, item.fats]
+                      for item in meal_tracker.food_items],
+        }
+
     @staticmethod
-    def export_data(user, meal_tracker):
-        filename = f"{user.name}_calorie_log.txt"
+    def _restore(name, daily_goal, foods):
+        meal_tracker = MealTracker()
+        for food in foods:
+            meal_tracker.add_food(FoodItem(*food))
+        return User(name, daily_goal), meal_tracker
+
+
+class TextLogStorage(LogStorage, log_storage.TextLogStorage):
+    """
+    The human readable <name>_calorie_log.txt files written by DataProcessor.export_data
+    """
+    SUFFIX = "_calorie_log.txt"
+    FOOD_LINE = re.compile(r"(.*): (\S+) kcal \| P: (\S+)g, C: (\S+)g, F: (\S+)g")
+
+    def save(self, user, meal_tracker):
+        filename = self.path(user.name)
         with open(filename, "w") as f:
             f.write(f"User: {user.name}\n")
             f.write(f"Daily Calorie Goal: {user.daily_goal} kcal\n\n")
@@ -78,25 +668,172 @@ class DataProcessor:
             protein, carbs, fats = meal_tracker.total_macros()
             f.write(f"\nTotal Calories: {total_cal} kcal\n")
             f.write(f"Total Macros: Protein: {protein}g, Carbs: {carbs}g, Fats: {fats}g\n")
-        print(f"Data exported to {filename}")
+        return filename
+
+    def load(self, name):
+        with open(self.path(name)) as f:
+            lines = f.read().split("\n")
+        # Food lines run from the summary heading to the first blank line
+        start = lines.index("--- Daily Meal Summary ---") + 1
+        end = lines.index("", start)
+        foods = []
+        for line in lines[start:end]:
+            food_name, *values = self.FOOD_LINE.fullmatch(line).groups()
+            foods.append([food_name] + [float(value) for value in values])
+        return self._restore(lines[0][len("User: "):], float(lines[1].split(": ")[1][:-5]), foods)
+
+
+class JsonLinesLogStorage(LogStorage, log_storage.JsonLinesLogStorage):
+    """
+    One JSON object per saved day, appended to a single file
+    """
+
+
+class SqliteLogStorage(LogStorage, log_storage.SqliteLogStorage):
+    """
+    SQLite database of calorie logs: users and their meal_items
+    """
+
+
+STORAGE_BACKENDS = {
+    "text": TextLogStorage,
+    "jsonl": JsonLinesLogStorage,
+    "sqlite": SqliteLogStorage,
+}
+
+# -----------------------------
+# Data Processor
+# -----------------------------
+class DataProcessor:
+    @staticmethod
+    def export_data(user, meal_tracker, storage=None):
+        """
+        Export the user's day, by default to a text file
+        :param storage: LogStorage backend (default: TextLogStorage in the current folder)
+        """
+        location = (storage or TextLogStorage()).save(user, meal_tracker)
+        print(f"Data exported to {location}")
+
+    @staticmethod
+    def load_data(name, storage=None):
+        """
+        Read an exported day back as a (User, MealTracker) pair
+        """
+        return (storage or TextLogStorage()).load(name)
+
+    @staticmethod
+    def to_record(user, meal_tracker):
+        """
+        Flatten a user's day into one record for bulk exports
+        """
+        total_cal = meal_tracker.total_calories()
+        protein, carbs, fats = meal_tracker.total_macros()
+        return {
+            "user": user.name,
+            "daily_goal": user.daily_goal,
+            "foods": [item.name for item in meal_tracker.food_items],
+            "total_calories": total_cal,
+            "protein": protein,
+            "carbs": carbs,
+            "fats": fats,
+            "remaining": user.daily_goal - total_cal,
+        }
+
+# -----------------------------
+# Batch Mode
+# -----------------------------
+# python calorie_budget_planner.py meals.csv [--jobs N]
+# CSV input has one row per food (user, daily_goal, food, calories, protein, carbs, fats);
+# consecutive rows of the same user make up their day, and foods with blank macros are
+# looked up in the bundled food database. JSON Lines input has one day per line:
+# {"user", "daily_goal", "foods": [food name or {name, calories, protein, carbs, fats}]}
+@functools.lru_cache(maxsize=None)
+def _batch_food_database():
+    return FoodDatabase.from_csv()
+
+
+def group_meal_rows(records):
+    """
+    Turn consecutive one-food-per-row records of the same user into day
+    records; records that already have a 'foods' list pass through unchanged
+    """
+    day = None
+    for record in records:
+        if "foods" in record:
+            if day is not None:
+                yield day
+                day = None
+            yield record
+            continue
+        if day is None or record.get("user") != day["user"]:
+            if day is not None:
+                yield day
+            day = {"user": record.get("user"), "daily_goal": record.get("daily_goal"), "foods": []}
+        if record.get("food"):
+            if record.get("calories") in (None, ""):
+                day["foods"].append(record["food"])
+            else:
+                day["foods"].append({"name": record["food"], "calories": record["calories"],
+                                     "protein": record.get("protein"), "carbs": record.get("carbs"),
+                                     "fats": record.get("fats")})
+    if day is not None:
+        yield day
+
+
+def process_record(record):
+    """
+    One user's day to their DataProcessor.to_record summary
+    """
+    user = User(record.get("user") or "", float(record["daily_goal"]))
+    meal_tracker = MealTracker(_batch_food_database())
+    for food in record.get("foods", []):
+        if isinstance(food, str):
+            meal_tracker.add_food(food)
+        else:
+            meal_tracker.add_food(FoodItem(food.get("name", ""), float(food["calories"]),
+                                           float(food.get("protein") or 0), float(food.get("carbs") or 0),
+                                           float(food.get("fats") or 0)))
+    result = DataProcessor.to_record(user, meal_tracker)
+    result["exceeded"] = result["total_calories"] > user.daily_goal
+    return result
+
+def run_batch(argv=None):
+    """
+    Batch mode: process_record over CSV or JSON Lines records, one JSON result per line on stdout
+    """
+    batch_mode.run_batch(process_record, "Summarise daily meal logs in batch.", argv, prepare=group_meal_rows)
 
 # -----------------------------
 # Main Program
 # -----------------------------
 if __name__ == "__main__":
+    # Any command-line arguments switch to batch mode, e.g. --jobs 4 people.csv ('-' reads stdin)
+    if len(sys.argv) > 1:
+        run_batch()
+        sys.exit()
+
     try:
         # User input
         name = input("Enter your name: ")
         daily_goal = float(input("Enter your daily calorie goal (kcal): "))
 
         user = User(name, daily_goal)
-        meal_tracker = MealTracker()
+        meal_tracker = MealTracker(FoodDatabase.from_csv())
 
         print("\nEnter your meals. Type 'done' when finished.")
         while True:
             food_name = input("\nFood name: ")
             if food_name.lower() == "done":
                 break
+            known_food = meal_tracker.food_database.get(food_name)
+            if known_food is not None:
+                meal_tracker.add_food(known_food)
+                print(f"Found {known_food.name}: {known_food.calories} kcal | P: {known_food.protein}g, "
+                      f"C: {known_food.carbs}g, F: {known_food.fats}g")
+                continue
+            suggestions = meal_tracker.food_database.search(food_name, limit=5)
+            if suggestions:
+                print(f"Not in the food database. Did you mean: {', '.join(suggestions)}?")
             calories = float(input("Calories (kcal): "))
             protein = float(input("Protein (g): "))
             carbs = float(input("Carbs (g): "))
@@ -112,6 +849,23 @@ if __name__ == "__main__":
         else:
             print(f"\n✅ You are within your daily goal. Remaining: {user.daily_goal - total_cal} kcal.")
 
+            # Suggest foods from the database for the remaining calories
+            suggest = input("\nWould you like suggestions for the remaining calories? (yes/no): ").lower()
+            if suggest == "yes":
+                protein = input("Daily protein target in grams (leave empty to skip): ").strip()
+                from meal_optimizer import MealOptimizer
+
+                optimizer = MealOptimizer(meal_tracker.food_database)
+                suggestion = optimizer.suggest_for(user, meal_tracker, protein=float(protein) if protein else None)
+                if suggestion.food_items:
+                    print("\nYou could still have:")
+                    for item in suggestion.food_items:
+                        print(f"{item.name}: {item.calories} kcal | P: {item.protein}g, C: {item.carbs}g, "
+                              f"F: {item.fats}g")
+                    print(f"Together: {suggestion.total_calories()} kcal")
+                else:
+                    print("No food in the database fits the remaining calories.")
+
         # Export option
         export = input("\nDo you want to export your meal log? (yes/no): ").lower()
         if export == "yes":
@@ -0,0 +1,152 @@
+import time
+
+from calorie_budget_planner import FoodItemBatch, MealTracker
+
+
+# -----------------------------
+# Meal Optimizer
+# -----------------------------
+class MealOptimizer:
+    """
+    Suggests foods from a catalog that fill the remaining calories and come
+    close to protein, carb and fat targets.
+    Each food is one serving and is picked at most once, and the suggestion
+    never goes over the calories or any macro target given. A greedy pass
+    adds the food that most reduces the error, then a local search keeps
+    applying the best single add, remove or swap. The error is the squared
+    distance to the targets in kcal (4 kcal per gram of protein and carbs, 9
+    per gram of fat). Every step scores the whole catalog with one NumPy
+    matrix product.
+    """
+    KCAL_PER_UNIT = (1.0, 4.0, 4.0, 9.0)
+    # Slack (kcal) allowed for rounding when checking a total against a target
+    TOLERANCE = 1e-9
+
+    def __init__(self, catalog):
+        """
+        :param catalog: A FoodDatabase, a FoodItemBatch or an iterable of FoodItem objects
+        """
+        import numpy as np
+
+        # Checked by shape rather than type, so that the classes of a script
+        # run as __main__ are accepted too
+        if hasattr(catalog, "to_batch"):
+            catalog = catalog.to_batch()
+        elif not hasattr(catalog, "records"):
+            catalog = FoodItemBatch.from_items(catalog)
+        values = catalog.values()
+        usable = np.isfinite(values).all(axis=1) & (values >= 0).all(axis=1)
+        self.batch = catalog if usable.all() else type(catalog)(catalog.records[usable])
+        self._scaled = values[usable] * np.array(self.KCAL_PER_UNIT)
+        # One row per nutrient, for comparing every food against the targets
+        self._columns = np.ascontiguousarray(self._scaled.T)
+
+    def __len__(self):
+        return len(self.batch)
+
+    def suggest(self, calories, protein=None, carbs=None, fats=None, max_items=5, iterations=20, time_limit=None):
+        """
+        :param calories: Calories to fill (kcal); the suggestion never goes over them
+        :param protein: Protein target in grams, which the suggestion never goes over;
+                        None leaves it free (likewise carbs and fats)
+        :param max_items: Most foods to suggest
+        :param iterations: Local search moves after the greedy pass (0 for greedy only)
+        :param time_limit: Seconds after which the local search stops and the best meal so far is returned
+        :return: MealTracker holding the suggested foods
+        """
+        import numpy as np
+
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        meal_tracker = MealTracker()
+        targets = (calories, protein, carbs, fats)
+        if calories <= 0 or not len(self):
+            return meal_tracker
+        weights = np.array([target is not None for target in targets], dtype=np.float64)
+        scaled = self._scaled * weights if weights.min() == 0 else self._scaled
+        columns = self._columns * weights[:, None] if weights.min() == 0 else self._columns
+        norms = np.einsum("ij,ij->i", scaled, scaled)
+        goal = np.array([target or 0.0 for target in targets]) * self.KCAL_PER_UNIT * weights
+
+        chosen = []
+        total = np.zeros(len(targets))
+        error = self._error(total - goal)
+        for _ in range(max_items):
+            residual = (total - goal)[None, :]
+            scores = self._scores(scaled, norms, residual)[:, 0]
+            scores[self._over(columns, residual)[:, 0]] = np.inf
+            scores[chosen] = np.inf
+            best = int(np.argmin(scores))
+            if scores[best] >= error:
+                break
+            chosen.append(best)
+            total += scaled[best]
+            error = scores[best]
+
+        for _ in range(iterations):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            # Row 0 scores adding a food; row k + 1 scores swapping chosen[k] for it
+            residuals = np.vstack([total - goal, total - goal - scaled[chosen]])
+            scores = self._scores(scaled, norms, residuals)
+            scores[self._over(columns, residuals)] = np.inf
+            scores[chosen, :] = np.inf
+            if len(chosen) >= max_items:
+                scores[:, 0] = np.inf
+            removals = [self._error(residual) for residual in residuals[1:]]
+            best = np.unravel_index(int(np.argmin(scores)), scores.shape)
+            best_score = scores[best]
+            if removals and min(removals) < best_score:
+                slot = int(np.argmin(removals))
+                if removals[slot] >= error:
+                    break
+                total -= scaled[chosen.pop(slot)]
+                error = removals[slot]
+                continue
+            if best_score >= error - 1e-9:
+                break
+            food, move = int(best[0]), int(best[1])
+            if move:
+                total -= scaled[chosen[move - 1]]
+                chosen[move - 1] = food
+            else:
+                chosen.append(food)
+            total += scaled[food]
+            error = best_score
+
+        for index in chosen:
+            meal_tracker.add_food(self.batch[index])
+        return meal_tracker
+
+    def suggest_for(self, user, meal_tracker, protein=None, carbs=None, fats=None, **kwargs):
+        """
+        Suggestions for what is left of the user's day.
+        :param protein: Daily protein target in grams; what was already eaten is subtracted
+                        (likewise carbs and fats)
+        """
+        eaten = meal_tracker.total_macros()
+        remaining = [None if target is None else max(target - done, 0.0)
+                     for target, done in zip((protein, carbs, fats), eaten)]
+        return self.suggest(user.daily_goal - meal_tracker.total_calories(), *remaining, **kwargs)
+
+    @staticmethod
+    def _scores(scaled, norms, residuals):
+        # Error of residual + each food's values, for every food (rows) and
+        # residual (columns): |r + v|^2 = |r|^2 + 2 v.r + |v|^2
+        import numpy as np
+
+        scores = scaled @ (2 * residuals.T)
+        scores += norms[:, None]
+        scores += np.einsum("ij,ij->i", residuals, residuals)[None, :]
+        return scores
+
+    def _over(self, columns, residuals):
+        # Whether adding each food to each residual goes over a target, as a
+        # (foods, residuals) array; columns has one row per nutrient
+        import numpy as np
+
+        return np.column_stack([np.logical_or.reduce(columns > (self.TOLERANCE - residual)[:, None], axis=0)
+                                for residual in residuals])
+
+    @staticmethod
+    def _error(residual):
+        return float(residual @ residual)
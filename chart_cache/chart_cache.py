@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+# -----------------------------
+# Cache Keys
+# -----------------------------
+def normalize(value):
+    """
+    Turn chart arguments into plain JSON data, so that equal inputs give the
+    same key: numbers become floats (5 == 5.0), dict items are sorted and
+    NumPy arrays become nested lists.
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {"__dict__": sorted([str(k), normalize(v)] for k, v in value.items())}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if hasattr(value, "tolist"):
+        # NumPy arrays and scalars
+        return normalize(value.tolist())
+    raise TypeError(f"Cannot build a chart cache key from {type(value).__name__}.")
+
+
+def chart_key(strategy, args, format):
+    """
+    Content hash of a chart: the strategy type and its public settings, the
+    normalized arguments, the output format and the matplotlib version
+    """
+    import matplotlib
+
+    cls = type(strategy)
+    settings = {name: value for name, value in vars(strategy).items() if not name.startswith("_")}
+    payload = json.dumps([f"{cls.__module__}.{cls.__qualname__}", normalize(settings),
+                          normalize(list(args)), format, matplotlib.__version__],
+                         separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+def _temporary_file(directory, prefix, suffix=""):
+    # Like tempfile.mkstemp, but created with mode 0o666 so the process umask
+    # gives it the same permissions as any other new file
+    for _ in range(100):
+        path = os.path.join(directory, f"{prefix}{os.urandom(8).hex()}{suffix}")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+        except FileExistsError:
+            continue
+        return path
+    raise FileExistsError(f"No unused temporary file name in {directory}.")
+
+
+# -----------------------------
+# Chart Cache
+# -----------------------------
+class ChartCache:
+    """
+    Content-addressed on-disk cache of rendered charts.
+    Each image is stored once as <key>.<format> in directory. A repeated
+    request is served by copying the stored file instead of rendering it
+    again. Outputs never share a file with the cache, so whatever later
+    writes to an output path cannot change a cached image. When the cache
+    grows beyond max_bytes the least recently used images are deleted; file
+    modification times record use, so the order survives restarts and is
+    shared by processes using the same directory.
+    """
+    def __init__(self, directory="chart_cache", max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param directory: Folder holding the cached images
+        :param max_bytes: Size limit of the cached images
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes cannot be negative.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # Index of file name -> size, least recently used first
+        self._entries = OrderedDict()
+        self.size = 0
+        files = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self.size += size
+
+    def fetch(self, strategy, args, path=None, format=None):
+        """
+        The chart strategy.render(*args, path=path, format=format) would make,
+        served from the cache when the same chart was rendered before.
+        :param path: File to write; when omitted the image bytes are returned
+        :param format: Image format, defaults to the path extension or PNG
+        """
+        if format is None:
+            format = os.path.splitext(path)[1][1:].lower() if path else ""
+            format = format or "png"
+        name = f"{chart_key(strategy, args, format)}.{format}"
+        cached = os.path.join(self.directory, name)
+        if self._lookup(name, cached):
+            try:
+                return self._serve(cached, path)
+            except FileNotFoundError:
+                # Evicted by another process sharing the directory
+                pass
+        self._store(strategy, args, format, name)
+        return self._serve(cached, path)
+
+    def _lookup(self, name, cached):
+        # The directory, not the index, is the source of truth: other
+        # processes may have added or evicted images
+        try:
+            size = os.path.getsize(cached)
+        except OSError:
+            size = None
+        with self._lock:
+            if size is None:
+                self.misses += 1
+                if name in self._entries:
+                    self.size -= self._entries.pop(name)
+                return False
+            self.hits += 1
+            if name in self._entries:
+                self._entries.move_to_end(name)
+            else:
+                self._entries[name] = size
+                self.size += size
+        try:
+            os.utime(cached)
+        except OSError:
+            pass
+        return True
+
+    def _serve(self, cached, path):
+        if path is None:
+            with open(cached, "rb") as f:
+                return f.read()
+        self._place(cached, path)
+        return path
+
+    def _store(self, strategy, args, format, name):
+        # Render to a temporary file first so readers never see a partial image
+        temporary = _temporary_file(self.directory, ".render-", f".{format}")
+        try:
+            strategy.render(*args, path=temporary, format=format)
+            size = os.path.getsize(temporary)
+            os.replace(temporary, os.path.join(self.directory, name))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        with self._lock:
+            self.size += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+            self._evict(keep=name)
+
+    def _evict(self, keep):
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            name, size = next(iter(self._entries.items()))
+            if name == keep:
+                break
+            del self._entries[name]
+            self.size -= size
+            self.evictions += 1
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def _place(self, cached, path):
+        # Copy to a temporary file next to path and move it into place, so
+        # readers of path never see a partial image
+        if os.path.abspath(cached) == os.path.abspath(path):
+            return
+        temporary = _temporary_file(os.path.dirname(os.path.abspath(path)), ".chart-")
+        try:
+            shutil.copyfile(cached, temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self):
+        """
+        Hit and size counters for this process, e.g. for logging or metrics
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def clear(self):
+        """
+        Delete every cached image
+        """
+        with self._lock:
+            for name in self._entries:
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self.size = 0
@@ -1,4 +1,19 @@
+import bisect
+import csv
+import functools
+import json
+import os
+import sys
+from types import MappingProxyType
+
+# Helpers shared by the scripts (batch mode, exact rounding, log storage) are in the sibling "shared" folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+import batch_mode
+
+
 class User:
+    __slots__ = ("age", "gender", "child_gender", "pregnant", "breastfeeding")
+
     def __init__(self, age, gender, child_gender=None, pregnant=False, breastfeeding=False):
         # Initialize user attributes
         self.age = age
@@ -19,131 +34,269 @@ class User:
             raise ValueError("Gender must be 'male' or 'female'.")
 
 
+# Age band boundaries: a person falls in band i when they are older than the
+# first i boundaries (adults are 19+, children are everyone younger).
+ADULT_AGE_BANDS = (50, 70)
+CHILD_AGE_BANDS = (3, 8, 11, 13)
+
+# Column order used by DietaryRecommendation.batch_recommendations.
+# 'Diary' is kept because the adult male guideline has always been keyed that way.
+FOOD_GROUP_COLUMNS = ('Vegetables', 'Fruits', 'Grains', 'Meat', 'Dairy', 'Diary')
+
+# Recommended servings keyed by (sex, age band, pregnant, breastfeeding).
+# Sex is 'male'/'female' for adults ('other' when no valid gender was given) and
+# 'boy'/'girl' for children. Pregnancy and breastfeeding only change the
+# recommendations of women aged 19-50; every other key uses (False, False).
+# Women over 50 only get the food groups adjusted for their age.
+RECOMMENDATION_TABLE = {
+    ('male', 0, False, False): {'Vegetables': 6, 'Fruits': 2, 'Grains': 6, 'Meat': 3, 'Diary': 2.5},
+    ('male', 1, False, False): {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 6, 'Meat': 2.5, 'Diary': 2.5},
+    ('male', 2, False, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 4.5, 'Meat': 2.5, 'Diary': 2.5, 'Dairy': 3.5},
+    ('female', 0, False, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 6, 'Meat': 2.5, 'Dairy': 2.5},
+    ('female', 0, True, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 8.5, 'Meat': 3.5, 'Dairy': 2.5},
+    ('female', 0, False, True): {'Vegetables': 7.5, 'Fruits': 2, 'Grains': 9, 'Meat': 2.5, 'Dairy': 2.5},
+    ('female', 0, True, True): {'Vegetables': 7.5, 'Fruits': 2, 'Grains': 9, 'Meat': 3.5, 'Dairy': 2.5},
+    ('female', 1, False, False): {'Vegetables': 5.5, 'Meat': 2.5},
+    ('female', 2, False, False): {'Vegetables': 5, 'Meat': 2.5, 'Grains': 4.5, 'Dairy': 3.5},
+    ('other', 0, False, False): {},
+    ('other', 1, False, False): {'Vegetables': 5.5, 'Meat': 2.5},
+    ('other', 2, False, False): {'Vegetables': 5, 'Meat': 2.5, 'Grains': 4.5, 'Dairy': 3.5},
+    ('boy', 0, False, False): {'Vegetables': 2.5, 'Fruits': 1, 'Grains': 4, 'Meat': 1, 'Dairy': 1.5},
+    ('boy', 1, False, False): {'Vegetables': 4.5, 'Fruits': 1.5, 'Grains': 4, 'Meat': 1.5, 'Dairy': 2},
+    ('boy', 2, False, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 5, 'Meat': 2.5, 'Dairy': 2.5},
+    ('boy', 3, False, False): {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 6, 'Meat': 2.5, 'Dairy': 3.5},
+    ('boy', 4, False, False): {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 7, 'Meat': 2.5, 'Dairy': 3.5},
+    ('girl', 0, False, False): {'Vegetables': 2.5, 'Fruits': 1, 'Grains': 4, 'Meat': 1, 'Dairy': 1.5},
+    ('girl', 1, False, False): {'Vegetables': 4.5, 'Fruits': 1.5, 'Grains': 4, 'Meat': 1.5, 'Dairy': 1.5},
+    ('girl', 2, False, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 4, 'Meat': 2.5, 'Dairy': 3},
+    ('girl', 3, False, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 5, 'Meat': 2.5, 'Dairy': 3.5},
+    ('girl', 4, False, False): {'Vegetables': 5, 'Fruits': 2, 'Grains': 7, 'Meat': 2.5, 'Dairy': 3.5},
+}
+
+# Sex codes used to index the batch matrix
+_SEXES = ('male', 'female', 'other', 'boy', 'girl')
+_matrix_cache = None
+
+# Most recommendation profiles kept by cached_recommendations
+RECOMMENDATION_CACHE_SIZE = 64
+
+
+def recommendation_key(age, gender, child_gender=None, pregnant=False, breastfeeding=False):
+    # Normalise a user profile to its RECOMMENDATION_TABLE key.
+    # The band is the number of boundaries the age is above.
+    if age >= 19:
+        sex = gender if gender in ('male', 'female') else 'other'
+        band = bisect.bisect_left(ADULT_AGE_BANDS, age)
+    else:
+        sex = 'boy' if child_gender == 'boy' else 'girl'
+        band = bisect.bisect_left(CHILD_AGE_BANDS, age)
+    return _table_key(sex, band, bool(pregnant), bool(breastfeeding))
+
+
+@functools.lru_cache(maxsize=RECOMMENDATION_CACHE_SIZE)
+def cached_recommendations(key):
+    """
+    Read-only recommendations for a recommendation_key(), shared by every
+    user with that profile. Call invalidate_recommendations() after changing
+    RECOMMENDATION_TABLE.
+    """
+    return MappingProxyType(dict(RECOMMENDATION_TABLE[key]))
+
+
+def recommendation_cache_info():
+    """
+    Hits, misses, maxsize and currsize of the recommendation cache
+    """
+    return cached_recommendations.cache_info()
+
+
+def invalidate_recommendations():
+    """
+    Drop every cached recommendation (and the batch matrix) so that the next
+    lookups read the current RECOMMENDATION_TABLE
+    """
+    global _matrix_cache
+    cached_recommendations.cache_clear()
+    _matrix_cache = None
+
+
+def _table_key(sex, band, pregnant, breastfeeding):
+    if sex == 'female' and band == 0:
+        return sex, band, pregnant, breastfeeding
+    return sex, band, False, False
+
+
+def _recommendation_matrix():
+    # Dense (sex, band, pregnancy state, food group) copy of the table, built once
+    global _matrix_cache
+    if _matrix_cache is None:
+        import numpy as np
+
+        bands = max(len(ADULT_AGE_BANDS), len(CHILD_AGE_BANDS)) + 1
+        matrix = np.full((len(_SEXES), bands, 4, len(FOOD_GROUP_COLUMNS)), np.nan)
+        for sex_code, sex in enumerate(_SEXES):
+            for band in range(bands):
+                for state in range(4):
+                    key = _table_key(sex, band, bool(state & 1), bool(state & 2))
+                    for group, servings in RECOMMENDATION_TABLE.get(key, {}).items():
+                        matrix[sex_code, band, state, FOOD_GROUP_COLUMNS.index(group)] = servings
+        _matrix_cache = matrix
+    return _matrix_cache
+
+
+def _parse_flag(value):
+    return str(value).strip().lower() in ('yes', 'true', '1', 'y')
+
+
+# Examples of a single serve for each food group. Loaded once and shared,
+# read-only, by every DietaryRecommendation.
+FOOD_GROUPS_DETAILS = MappingProxyType({
+    "VEGETABLES": (
+        # Examples of a single serve of vegetables
+        "A vegetables single serve is 75g (100-350kJ). Here are some examples:",
+        "• 0.5 cup of cooked green or orange vegetables (like broccoli, spinach, carrots, or pumpkin)",
+        "• 0.5 cup of cooked dried or canned beans, peas, or lentils",
+        "• 1 cup of green leafy or raw salad vegetables",
+        "• 0.5 cup of sweet corn",
+        "• 0.5 of a medium potato or other starchy vegetables (such as sweet potato, taro, or cassava)",
+        "• 1 medium tomato"
+    ),
+    "FRUITS": (
+        # Examples of a single serve of fruits
+        "A fruits single serve is 150g (350kJ). Examples:",
+        "• 1 medium apple, banana, orange, or pear",
+        "• 2 small apricots, kiwi fruits, or plums",
+        "• 1 cup of diced or canned fruit (with no added sugar)"
+    ),
+    "GRAINS": (
+        # Examples of a single serve of grains
+        "A grains single serve is (500kJ). Examples:",
+        "• 1 slice (40g) of bread",
+        "• 0.5 medium (40g) roll or flat bread",
+        "• 0.5 cup (75-120g) of cooked rice, pasta, noodles, barley, buckwheat, semolina, polenta, bulgur or quinoa",
+        "• 0.5 cup (120g) of cooked porridge",
+        "• 0.66 cup (30g) of wheat cereal flakes",
+        "• 0.75 cup (30g) of muesli",
+        "• 3 (35g) crispbreads",
+        "• 1 (60g) crumpet",
+        "• 1 small (35g) English muffin or scone"
+    ),
+    "MEAT": (
+        # Examples of a single serve of meat and alternatives
+        "A meat single serve is (500-600kJ). Examples:",
+        "• 65g cooked lean red meats such as beef, lamb, veal, pork, goat, or kangaroo (about 90-100g raw)",
+        "• 80g cooked lean poultry such as chicken or turkey (100g raw)",
+        "• 100g cooked fish fillet (about 115g raw) or one small can of fish",
+        "• 2 large (120g) eggs",
+        "• 1 cup (150g) cooked or canned legumes/beans such as lentils, chickpeas, or split peas",
+        "• 170g tofu",
+        "• 30g nuts, seeds, peanut or almond butter, tahini, or other nut or seed paste"
+    ),
+    "DAIRY": (
+        # Examples of a single serve of dairy
+        "A single serve of dairy is (500-600kJ). Examples:",
+        "• 1 cup (250ml) of fresh, UHT long life, reconstituted powdered milk or buttermilk",
+        "• 0.5 cup (120ml) of evaporated milk",
+        "• 2 slices (40g) or a 4 x 3 x 2 cm cube (40g) of hard cheese, such as cheddar",
+        "• 0.5 cup (120g) of ricotta cheese",
+        "• 0.25 cup (200g) of yoghurt",
+        "• 1 cup (250ml) of soy, rice or other cereal drink with at least 100mg of added calcium per 100ml"
+    )
+})
+
+# Rendered single-serve text per output style, cached after first use
+_details_text_cache = {}
+
+
+def load_serving_catalog(filename):
+    """
+    Replace the shared serving-size catalog with one read from a JSON file
+    mapping each food group to its list of detail lines.
+    Applies to DietaryRecommendation objects created afterwards.
+    """
+    global FOOD_GROUPS_DETAILS
+    with open(filename, encoding="utf-8") as file:
+        data = json.load(file)
+    FOOD_GROUPS_DETAILS = MappingProxyType({group: tuple(details) for group, details in data.items()})
+    _details_text_cache.clear()
+    return FOOD_GROUPS_DETAILS
+
+
+def serving_details_text(food_groups_details, style="display"):
+    """
+    Return the pre-formatted single-serve block for a catalog.
+    :param style: 'display' for console output, 'export' for text files
+    """
+    cached = _details_text_cache.get(style)
+    if cached is not None and cached[0] is food_groups_details:
+        return cached[1]
+    heading = "\n{}:\n" if style == "export" else "\n{}\n"
+    parts = ["\nAdditionally, each food category single serving recommendations are detailed as shown as follows:\n"]
+    for food_group, details in food_groups_details.items():
+        parts.append(heading.format(food_group))
+        parts.extend(f"  {detail}\n" for detail in details)
+    text = "".join(parts)
+    _details_text_cache[style] = (food_groups_details, text)
+    return text
+
 
 class DietaryRecommendation:
-    # Initialize with user and food group details
+    # Initialize with user; food group details come from the shared catalog
     def __init__(self, user):
         self.user = user
         self.recommendations = {}
-        self.food_groups_details = {
-            "VEGETABLES": [
-                # Examples of a single serve of vegetables
-                "A vegetables single serve is 75g (100-350kJ). Here are some examples:",
-                "• 0.5 cup of cooked green or orange vegetables (like broccoli, spinach, carrots, or pumpkin)",
-                "• 0.5 cup of cooked dried or canned beans, peas, or lentils",
-                "• 1 cup of green leafy or raw salad vegetables",
-                "• 0.5 cup of sweet corn",
-                "• 0.5 of a medium potato or other starchy vegetables (such as sweet potato, taro, or cassava)",
-                "• 1 medium tomato"
-            ],
-            "FRUITS": [
-                # Examples of a single serve of fruits
-                "A fruits single serve is 150g (350kJ). Examples:",
-                "• 1 medium apple, banana, orange, or pear",
-                "• 2 small apricots, kiwi fruits, or plums",
-                "• 1 cup of diced or canned fruit (with no added sugar)"
-            ],
-            "GRAINS": [
-                # Examples of a single serve of grains
-                "A grains single serve is (500kJ). Examples:",
-                "• 1 slice (40g) of bread",
-                "• 0.5 medium (40g) roll or flat bread",
-                "• 0.5 cup (75-120g) of cooked rice, pasta, noodles, barley, buckwheat, semolina, polenta, bulgur or quinoa",
-                "• 0.5 cup (120g) of cooked porridge",
-                "• 0.66 cup (30g) of wheat cereal flakes",
-                "• 0.75 cup (30g) of muesli",
-                "• 3 (35g) crispbreads",
-                "• 1 (60g) crumpet",
-                "• 1 small (35g) English muffin or scone"
-            ],
-            "MEAT": [
-                # Examples of a single serve of meat and alternatives
-                "A meat single serve is (500-600kJ). Examples:",
-                "• 65g cooked lean red meats such as beef, lamb, veal, pork, goat, or kangaroo (about 90-100g raw)",
-                "• 80g cooked lean poultry such as chicken or turkey (100g raw)",
-                "• 100g cooked fish fillet (about 115g raw) or one small can of fish",
-                "• 2 large (120g) eggs",
-                "• 1 cup (150g) cooked or canned legumes/beans such as lentils, chickpeas, or split peas",
-                "• 170g tofu",
-                "• 30g nuts, seeds, peanut or almond butter, tahini, or other nut or seed paste"
-            ],
-            "DAIRY": [
-                # Examples of a single serve of dairy
-                "A single serve of dairy is (500-600kJ). Examples:",
-                "• 1 cup (250ml) of fresh, UHT long life, reconstituted powdered milk or buttermilk",
-                "• 0.5 cup (120ml) of evaporated milk",
-                "• 2 slices (40g) or a 4 x 3 x 2 cm cube (40g) of hard cheese, such as cheddar",
-                "• 0.5 cup (120g) of ricotta cheese",
-                "• 0.25 cup (200g) of yoghurt",
-                "• 1 cup (250ml) of soy, rice or other cereal drink with at least 100mg of added calcium per 100ml"
-            ]
-        }
+        self.food_groups_details = FOOD_GROUPS_DETAILS
         self.get_recommendations()
 
     def get_recommendations(self):
-        # Calculate recommendations based on user data
-        if self.user.age >= 19:
-            if self.user.gender == "male":
-                self.recommendations = {
-                    'Vegetables': 6,
-                    'Fruits': 2,
-                    'Grains': 6,
-                    'Meat': 3,
-                    'Diary': 2.5,
-                }
-            if self.user.age > 50:
-                self.recommendations['Vegetables'] = 5.5
-                self.recommendations['Meat'] = 2.5
-                if self.user.age > 70:
-                    self.recommendations['Vegetables'] = 5
-                    self.recommendations['Grains'] = 4.5
-                    self.recommendations['Dairy'] = 3.5
-
-            elif self.user.gender == "female":
-                self.recommendations = {
-                    'Vegetables': 5,
-                    'Fruits': 2,
-                    'Grains': 6,
-                    'Meat': 2.5,
-                    'Dairy': 2.5,
-                }
-                if self.user.age > 50:
-                    self.recommendations['Grains'] = 4
-                    self.recommendations['Meat'] = 2
-                    self.recommendations['Dairy'] = 4
-                    if self.user.age > 70:
-                        self.recommendations['Grains'] = 3
-
-                if self.user.pregnant:
-                    self.recommendations['Grains'] = 8.5
-                    self.recommendations['Meat'] = 3.5
-                if self.user.breastfeeding:
-                    self.recommendations['Vegetables'] = 7.5
-                    self.recommendations['Grains'] = 9
-        else:
-            # Recommendations for children under 18
-            if self.user.child_gender == 'boy':
-                if self.user.age <= 3:
-                    self.recommendations = {'Vegetables': 2.5, 'Fruits': 1, 'Grains': 4, 'Meat': 1, 'Dairy': 1.5}
-                elif self.user.age <= 8:
-                    self.recommendations = {'Vegetables': 4.5, 'Fruits': 1.5, 'Grains': 4, 'Meat': 1.5, 'Dairy': 2}
-                elif self.user.age <= 11:
-                    self.recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 5, 'Meat': 2.5, 'Dairy': 2.5}
-                elif self.user.age <= 13:
-                    self.recommendations = {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 6, 'Meat': 2.5, 'Dairy': 3.5}
-                else:
-                    self.recommendations = {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 7, 'Meat': 2.5, 'Dairy': 3.5}
-            else:  # Girl
-                if self.user.age <= 3:
-                    self.recommendations = {'Vegetables': 2.5, 'Fruits': 1, 'Grains': 4, 'Meat': 1, 'Dairy': 1.5}
-                elif self.user.age <= 8:
-                    self.recommendations = {'Vegetables': 4.5, 'Fruits': 1.5, 'Grains': 4, 'Meat': 1.5, 'Dairy': 1.5}
-                elif self.user.age <= 11:
-                    self.recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 4, 'Meat': 2.5, 'Dairy': 3}
-                elif self.user.age <= 13:
-                    self.recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 5, 'Meat': 2.5, 'Dairy': 3.5}
-                else:
-                    self.recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 7, 'Meat': 2.5, 'Dairy': 3.5}
+        # Look up the user's profile in the shared cache; the result is read-only
+        key = recommendation_key(self.user.age, self.user.gender, self.user.child_gender,
+                                 self.user.pregnant, self.user.breastfeeding)
+        self.recommendations = cached_recommendations(key)
+        return self.recommendations
+
+    @staticmethod
+    def batch_recommendations(age, gender=None, child_gender=None, pregnant=None, breastfeeding=None):
+        """
+        Compute recommendations for many people in one vectorised pass.
+        Each argument is a column (list or NumPy array) with one entry per person;
+        omitted columns default to None/False. Returns an (n, len(FOOD_GROUP_COLUMNS))
+        float matrix of servings, with NaN where a food group is not part of that
+        person's recommendations.
+        """
+        import numpy as np
+
+        age = np.asarray(age, dtype=np.float64)
+        count = age.shape[0]
+        gender = np.char.lower(np.asarray(gender if gender is not None else [None] * count).astype(str))
+        child_gender = np.asarray(child_gender if child_gender is not None else [None] * count).astype(str)
+        pregnant = np.asarray(pregnant if pregnant is not None else np.zeros(count), dtype=bool)
+        breastfeeding = np.asarray(breastfeeding if breastfeeding is not None else np.zeros(count), dtype=bool)
+
+        adult = age >= 19
+        adult_sex = np.where(gender == "male", 0, np.where(gender == "female", 1, 2))
+        child_sex = np.where(child_gender == "boy", 3, 4)
+        sex = np.where(adult, adult_sex, child_sex)
+        band = np.where(adult,
+                        np.searchsorted(ADULT_AGE_BANDS, age, side="left"),
+                        np.searchsorted(CHILD_AGE_BANDS, age, side="left"))
+        state = pregnant.astype(np.intp) + 2 * breastfeeding.astype(np.intp)
+        return _recommendation_matrix()[sex, band, state]
+
+    @staticmethod
+    def batch_recommendations_csv(stream):
+        """
+        Read a CSV stream with age, gender, child_gender, pregnant and breastfeeding
+        columns (only age is required) and return the servings matrix for every row.
+        """
+        columns = {"age": [], "gender": [], "child_gender": [], "pregnant": [], "breastfeeding": []}
+        for row in csv.DictReader(stream):
+            columns["age"].append(float(row["age"]))
+            columns["gender"].append(row.get("gender") or None)
+            columns["child_gender"].append(row.get("child_gender") or None)
+            columns["pregnant"].append(_parse_flag(row.get("pregnant")))
+            columns["breastfeeding"].append(_parse_flag(row.get("breastfeeding")))
+        return DietaryRecommendation.batch_recommendations(**columns)
 
     def display_recommendations(self):
         # Print the calculated recommendations
@@ -152,11 +305,7 @@ class DietaryRecommendation:
             servings = self.recommendations[food_group]  # Get servings for the current food group
             print(f"{food_group}: {servings:.1f} servings per day")
         # Print detailed single-serve information
-        print("\nAdditionally, each food category single serving recommendations are detailed as shown as follows:")
-        for food_group in self.food_groups_details:  # Loop through food groups for details
-            print(f"\n{food_group}")  # Print the food group name
-            for detail in self.food_groups_details[food_group]:  # Loop through details for each food group
-                print(f"  {detail}")  # Indent details for readability
+        print(serving_details_text(self.food_groups_details, "display"), end="")
 
     def export_recommendations(self, filename="DietaryRecommendations.txt"):
         # Export recommendations to a text file
@@ -166,17 +315,47 @@ class DietaryRecommendation:
                 servings = self.recommendations[food_group]  # Get servings for the current food group
                 file.write(f"{food_group}: {servings} serves per day\n")
 
-            file.write(
-                "\nAdditionally, each food category single serving recommendations are detailed as shown as follows:\n")
-            for food_group in self.food_groups_details:  # Loop through food groups for details
-                file.write(f"\n{food_group}:\n")  # Write the food group name
-                for detail in self.food_groups_details[food_group]:  # Loop through details for each food group
-                    file.write(f"  {detail}\n")  # Indent details for readability
+            file.write(serving_details_text(self.food_groups_details, "export"))
 
         print(f"Recommendations and serving sizes have been exported to  {filename}")
 
 
+# -----------------------------
+# Batch Mode
+# -----------------------------
+# python dietary_recommendation.py people.csv [--jobs N]
+# One record per person: age, gender, child_gender, pregnant, breastfeeding
+def process_record(record):
+    """
+    One person's profile to their recommended servings
+    """
+    user = User(age=float(record["age"]), gender=record.get("gender") or None,
+                child_gender=(record.get("child_gender") or "").lower() or None,
+                pregnant=_parse_flag(record.get("pregnant")),
+                breastfeeding=_parse_flag(record.get("breastfeeding")))
+    user.input_validation()
+    return {
+        "age": user.age,
+        "gender": user.gender,
+        "child_gender": user.child_gender,
+        "pregnant": user.pregnant,
+        "breastfeeding": user.breastfeeding,
+        "recommendations": dict(DietaryRecommendation(user).recommendations),
+    }
+
+def run_batch(argv=None):
+    """
+    Batch mode: process_record over CSV or JSON Lines records, one JSON result per line on stdout
+    """
+    batch_mode.run_batch(process_record, "Compute dietary recommendations in batch.", argv)
+
+
 if __name__ == '__main__':
+        # Any command-line arguments switch to batch mode, e.g. --jobs 4 people.csv ('-' reads stdin)
+        if len(sys.argv) > 1:
+            run_batch()
+            sys.exit()
+
         try:
             # User input prompts
             age = int(input("Enter your age: "))
@@ -0,0 +1,311 @@
+import argparse
+import ast
+import bisect
+import contextlib
+import functools
+import importlib
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+
+# The projects are standalone scripts in sibling folders
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for project in ("calorie_budget_planner", "dietary_recommendation", "Hydration Tracker", "nutrition_visualizer"):
+    sys.path.insert(0, os.path.join(ROOT, project))
+
+# Hot paths that enable() times: (module, class, method, metric name)
+TARGETS = (
+    ("calorie_budget_planner", "MealTracker", "summary", "meal_tracker_summary"),
+    ("calorie_budget_planner", "ColumnarMealTracker", "summary", "columnar_meal_tracker_summary"),
+    ("calorie_budget_planner", "DataProcessor", "export_data", "calorie_export_data"),
+    ("calorie_budget_planner", "DataProcessor", "to_record", "calorie_to_record"),
+    ("dietary_recommendation", "DietaryRecommendation", "get_recommendations", "get_recommendations"),
+    ("dietary_recommendation", "DietaryRecommendation", "export_recommendations", "export_recommendations"),
+    ("Hydration_Tracker", "ChartStrategy", "create_chart", "hydration_create_chart"),
+    ("Hydration_Tracker", "ChartStrategy", "render", "hydration_render"),
+    ("Hydration_Tracker", "DataProcessor", "export_data", "hydration_export_data"),
+    ("Hydration_Tracker", "DataProcessor", "to_record", "hydration_to_record"),
+    ("nutrition_visualizer", "ChartStrategy", "create_chart", "nutrition_create_chart"),
+    ("nutrition_visualizer", "ChartStrategy", "render", "nutrition_render"),
+    # export() and export_report() both go through export_async()
+    ("nutrition_visualizer", "ChartStrategy", "export_async", "nutrition_export"),
+    ("nutrition_visualizer", "BMIChartStrategy", "render_many", "nutrition_render_many"),
+    ("nutrition_visualizer", "DataProcessor", "save_data", "nutrition_save_data"),
+    ("nutrition_visualizer", "DataProcessor", "to_record", "nutrition_to_record"),
+)
+
+# Latency bucket upper bounds in seconds (Prometheus style, +Inf is implicit)
+BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# NUTRITION_PROFILE=cprofile or tracemalloc turns on capture(); the output
+# file defaults to nutrition.prof / nutrition.tracemalloc.txt
+PROFILE_ENV = "NUTRITION_PROFILE"
+PROFILE_OUTPUT_ENV = "NUTRITION_PROFILE_OUTPUT"
+
+
+# -----------------------------
+# Metrics
+# -----------------------------
+class Histogram:
+    """
+    Latency histogram with fixed buckets, plus call count and total time
+    """
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction):
+        """
+        Upper bound of the bucket holding the given quantile
+        """
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target and seen:
+                return bound
+        return 0.0
+
+
+class Registry:
+    """
+    Counters and latency histograms keyed by metric name
+    """
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def record(self, name, seconds):
+        """
+        Count one call of name and add its latency to the name histogram
+        """
+        with self._lock:
+            counter = name + "_calls"
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                        "buckets": dict(zip([str(bound) for bound in histogram.buckets] + ["+Inf"],
+                                            histogram.counts)),
+                    }
+                    for name, histogram in self.histograms.items()
+                },
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix="nutrition"):
+        """
+        Metrics in the Prometheus text exposition format
+        """
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.sum!r}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# -----------------------------
+# Hooks
+# -----------------------------
+def timed(function, name, registry=REGISTRY):
+    """
+    Wrap a function so every call counts towards name_calls and its latency
+    (errors included) towards the name histogram
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            registry.record(name, time.perf_counter() - start)
+
+    wrapper.__instrumented__ = function
+    return wrapper
+
+
+_originals = {}
+
+
+def enable(registry=REGISTRY, targets=TARGETS):
+    """
+    Time every target method. Until this is called the projects run their
+    original, unwrapped methods, so instrumentation costs nothing when it is off.
+    """
+    for module_name, class_name, method_name, metric in targets:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        key = (cls, method_name)
+        if key in _originals:
+            continue
+        original = cls.__dict__[method_name]
+        if isinstance(original, staticmethod):
+            wrapped = staticmethod(timed(original.__func__, metric, registry))
+        else:
+            wrapped = timed(original, metric, registry)
+        _originals[key] = original
+        setattr(cls, method_name, wrapped)
+    return registry
+
+
+def disable():
+    """
+    Put the original methods back
+    """
+    while _originals:
+        (cls, method_name), original = _originals.popitem()
+        setattr(cls, method_name, original)
+
+
+def enabled():
+    return bool(_originals)
+
+
+@contextlib.contextmanager
+def capture(mode=None, output=None):
+    """
+    Profile the enclosed block. mode is 'cprofile' or 'tracemalloc' and
+    defaults to the NUTRITION_PROFILE environment variable; with neither set
+    the block runs untouched.
+    :param output: cProfile stats file, or tracemalloc report file
+    """
+    mode = (mode or os.environ.get(PROFILE_ENV, "")).lower()
+    output = output or os.environ.get(PROFILE_OUTPUT_ENV)
+    if not mode:
+        yield
+    elif mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(output or "nutrition.prof")
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+    elif mode == "tracemalloc":
+        import tracemalloc
+
+        tracemalloc.start(25)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report = [f"Current {current / 1e6:.2f} MB, peak {peak / 1e6:.2f} MB"]
+            report += [str(stat) for stat in snapshot.statistics("lineno")[:20]]
+            with open(output or "nutrition.tracemalloc.txt", "w") as f:
+                f.write("\n".join(report) + "\n")
+            print(report[0], file=sys.stderr)
+    else:
+        raise ValueError(f"Unknown {PROFILE_ENV} mode '{mode}'. Use 'cprofile' or 'tracemalloc'.")
+
+
+# -----------------------------
+# Script Runner
+# -----------------------------
+def run_script(path, args=()):
+    """
+    Run a script as __main__ with instrumentation enabled. The projects'
+    own scripts are imported as modules first, so that their classes are the
+    instrumented ones, and then their __main__ block is executed.
+    """
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    sys.argv = [path] + list(args)
+    if module_name not in {target[0] for target in TARGETS}:
+        runpy.run_path(path, run_name="__main__")
+        return
+    module = importlib.import_module(module_name)
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    body = [node for statement in tree.body if _is_main_block(statement) for node in statement.body]
+    exec(compile(ast.Module(body=body, type_ignores=[]), path, "exec"), vars(module))
+
+
+def _is_main_block(statement):
+    return (isinstance(statement, ast.If) and isinstance(statement.test, ast.Compare)
+            and isinstance(statement.test.left, ast.Name) and statement.test.left.id == "__name__"
+            and any(isinstance(c, ast.Constant) and c.value == "__main__" for c in statement.test.comparators))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a script with the projects instrumented and report the metrics.",
+        epilog=f"Set {PROFILE_ENV}=cprofile or tracemalloc to profile the run as well.")
+    parser.add_argument("--format", choices=("json", "prometheus"), default="json")
+    parser.add_argument("--output", help="Metrics file (default: stderr)")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    options = parser.parse_args()
+
+    registry = enable()
+    try:
+        with capture():
+            run_script(options.script, options.args)
+    finally:
+        report = registry.to_json() + "\n" if options.format == "json" else registry.to_prometheus()
+        if options.output:
+            with open(options.output, "w") as f:
+                f.write(report)
+        else:
+            sys.stderr.write(report)
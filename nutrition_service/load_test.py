@@ -0,0 +1,114 @@
+"""
+Load test for nutrition_service: keeps --concurrency keep-alive connections
+busy until --requests requests have completed, then reports requests/sec and
+p50/p99 latency per endpoint.
+
+By default a local service is started in a subprocess on a free port; pass
+--url to test an instance that is already running.
+
+Usage: python nutrition_service/load_test.py [--requests 5000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+SCENARIOS = {
+    "recommendations": ("/recommendations", {"age": 34, "gender": "female", "pregnant": True}),
+    "meal_totals": ("/meals/totals", {"daily_goal": 2000, "foods": [
+        "banana", "oats", {"name": "sandwich", "calories": 420, "protein": 22, "carbs": 45, "fats": 14}]}),
+    "bmi": ("/bmi", {"weight": 72, "height": 178}),
+    "water": ("/water", {"weight": 72, "activity_level": "medium"}),
+    "chart_bmi": ("/charts/bmi", {"args": [23.4]}),
+}
+
+
+async def client(host, port, jobs, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while jobs:
+            name, path, payload = jobs.pop()
+            request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.setdefault(name, []).append(time.perf_counter() - start)
+            if not status_line.split()[1].startswith(b"2"):
+                latencies.setdefault(name + " (errors)", []).append(0)
+    finally:
+        writer.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(host, port, scenarios, requests, concurrency):
+    jobs = []
+    for i in range(requests):
+        name = scenarios[i % len(scenarios)]
+        path, body = SCENARIOS[name]
+        jobs.append((name, path, json.dumps(body).encode()))
+    latencies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, jobs, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{requests} requests, {concurrency} connections: {requests / elapsed:,.0f} requests/sec")
+    for name, values in sorted(latencies.items()):
+        if name.endswith("(errors)"):
+            print(f"  {name:<18} {len(values)}")
+            continue
+        print(f"  {name:<18} n={len(values):<6} p50={percentile(values, 0.5) * 1000:8.2f} ms"
+              f"  p99={percentile(values, 0.99) * 1000:8.2f} ms")
+
+
+def start_local_service():
+    service = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "nutrition_service.py"),
+         "--port", "0"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = service.stdout.readline()
+    if not line.startswith("Serving on "):
+        service.kill()
+        raise RuntimeError(f"Service did not start: {line!r}")
+    return service, line.split()[-1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the nutrition service.")
+    parser.add_argument("--url", help="Running service, e.g. http://127.0.0.1:8000 (default: start one)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--scenarios", default="recommendations,meal_totals,bmi,water",
+                        help=f"Comma separated, from: {', '.join(SCENARIOS)}")
+    options = parser.parse_args()
+
+    service = None
+    url = options.url
+    if url is None:
+        service, url = start_local_service()
+    try:
+        address = urlsplit(url)
+        asyncio.run(run(address.hostname, address.port, options.scenarios.split(","),
+                        options.requests, options.concurrency))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
@@ -0,0 +1,335 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+# The projects are standalone scripts in sibling folders
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for project in ("calorie_budget_planner", "dietary_recommendation", "Hydration Tracker", "nutrition_visualizer",
+                "instrumentation"):
+    sys.path.insert(0, os.path.join(ROOT, project))
+
+import calorie_budget_planner
+import dietary_recommendation
+import Hydration_Tracker
+import instrumentation
+import nutrition_visualizer
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class RequestError(Exception):
+    """
+    Error answered with an HTTP status instead of a server error
+    """
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -----------------------------
+# Chart Rendering (runs in worker processes)
+# -----------------------------
+def _render_chart(name, args):
+    strategy = CHART_STRATEGIES[name]()
+    return strategy.render(*args)
+
+
+CHART_STRATEGIES = {
+    "bmi": nutrition_visualizer.BMIChartStrategy,
+    "intake_bar": nutrition_visualizer.BarChartStrategy,
+    "intake_line": nutrition_visualizer.LineChartStrategy,
+    "intake_pie": nutrition_visualizer.PieChartStrategy,
+    "intake_small_multiples": nutrition_visualizer.SmallMultiplesChartStrategy,
+    "intake_box": nutrition_visualizer.BoxPlotChartStrategy,
+    "intake_violin": nutrition_visualizer.ViolinPlotChartStrategy,
+    "water_bar": Hydration_Tracker.BarChartStrategy,
+    "water_line": Hydration_Tracker.LineChartStrategy,
+}
+
+
+# -----------------------------
+# Service
+# -----------------------------
+class NutritionService:
+    """
+    Small asyncio HTTP/1.1 JSON service over the four projects.
+
+    Endpoints (JSON request bodies):
+    - GET  /health
+    - POST /recommendations  {age, gender, child_gender, pregnant, breastfeeding}
+    - POST /meals/totals     {daily_goal, foods: [food name or {name, calories, protein, carbs, fats}]}
+    - POST /bmi              {weight, height}
+    - POST /water            {weight, activity_level}
+    - POST /charts/<name>    chart arguments, answered with a PNG; <name> is one of CHART_STRATEGIES
+    - GET  /metrics          Prometheus metrics, when started with metrics=True
+    """
+    def __init__(self, chart_workers=None, metrics=False):
+        """
+        :param chart_workers: Processes used to render charts off the event loop
+        :param metrics: Instrument the projects and serve their metrics on /metrics
+        """
+        self.chart_workers = chart_workers
+        self.metrics = metrics
+        if metrics:
+            instrumentation.enable()
+        self.food_database = calorie_budget_planner.FoodDatabase.from_csv()
+        self._executor = None
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/recommendations"): self.recommendations,
+            ("POST", "/meals/totals"): self.meal_totals,
+            ("POST", "/bmi"): self.bmi,
+            ("POST", "/water"): self.water,
+        }
+
+    # Handlers return a dict that is sent back as JSON
+    def health(self, body):
+        return {"status": "ok"}
+
+    def recommendations(self, body):
+        user = dietary_recommendation.User(
+            age=_number(body, "age"),
+            gender=_string(body, "gender"),
+            # Lower-cased like the dietary_recommendation batch mode
+            child_gender=(_string(body, "child_gender") or "").lower() or None,
+            pregnant=_flag(body, "pregnant"),
+            breastfeeding=_flag(body, "breastfeeding"),
+        )
+        user.input_validation()
+        return {"recommendations": dict(dietary_recommendation.DietaryRecommendation(user).recommendations)}
+
+    def meal_totals(self, body):
+        user = calorie_budget_planner.User(_string(body, "name", ""), _number(body, "daily_goal"))
+        meal_tracker = calorie_budget_planner.MealTracker(self.food_database)
+        foods = body.get("foods", [])
+        if not isinstance(foods, list):
+            raise ValueError("'foods' must be a list.")
+        for food in foods:
+            if isinstance(food, str):
+                meal_tracker.add_food(food)
+            elif isinstance(food, dict):
+                meal_tracker.add_food(calorie_budget_planner.FoodItem(
+                    _string(food, "name", ""), _number(food, "calories"), _number(food, "protein"),
+                    _number(food, "carbs"), _number(food, "fats")))
+            else:
+                raise ValueError("Each food must be a food name or an object.")
+        total_cal = meal_tracker.total_calories()
+        protein, carbs, fats = meal_tracker.total_macros()
+        return {
+            "total_calories": total_cal,
+            "protein": protein,
+            "carbs": carbs,
+            "fats": fats,
+            "remaining": user.daily_goal - total_cal,
+            "exceeded": total_cal > user.daily_goal,
+        }
+
+    def bmi(self, body):
+        user = nutrition_visualizer.User(body.get("age"), body.get("gender"),
+                                         _positive(body, "weight"), _positive(body, "height"))
+        return {"bmi": user.calculate_bmi()}
+
+    def water(self, body):
+        user = Hydration_Tracker.User(_string(body, "name", ""), _positive(body, "weight"),
+                                      _string(body, "activity_level", "low"))
+        return {"recommended_liters": user.recommended_water_intake()}
+
+    async def chart(self, name, body):
+        if name not in CHART_STRATEGIES:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown chart '{name}'.")
+        args = body.get("args")
+        if not isinstance(args, list):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Chart requests need an 'args' list.")
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.chart_workers,
+                                                 initializer=nutrition_visualizer._use_agg_backend)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _render_chart, name, args)
+
+    async def dispatch(self, method, path, raw_body):
+        """
+        Route one request and return (status, content type, response bytes)
+        """
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object.")
+            if self.metrics:
+                instrumentation.REGISTRY.increment("http_requests")
+                if (method, path) == ("GET", "/metrics"):
+                    return (HTTPStatus.OK, "text/plain; version=0.0.4",
+                            instrumentation.REGISTRY.to_prometheus().encode())
+            if path.startswith("/charts/"):
+                if method != "POST":
+                    raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Charts are requested with POST.")
+                image = await self.chart(path[len("/charts/"):], body)
+                return HTTPStatus.OK, "image/png", image
+            handler = self.routes.get((method, path))
+            if handler is None:
+                if any(route_path == path for _, route_path in self.routes):
+                    raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on {path}.")
+                raise RequestError(HTTPStatus.NOT_FOUND, f"No endpoint at {path}.")
+            result = handler(body)
+            status = HTTPStatus.OK
+        except RequestError as error:
+            status, result = error.status, {"error": str(error)}
+        except (ValueError, KeyError, TypeError) as error:
+            message = error.args[0] if isinstance(error, KeyError) and error.args else str(error)
+            status, result = HTTPStatus.BAD_REQUEST, {"error": str(message)}
+        except Exception as error:
+            # Never drop the connection without an answer
+            print(f"Error handling {method} {path}: {error!r}", file=sys.stderr)
+            status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+        return status, "application/json", json.dumps(result).encode()
+
+    async def handle_connection(self, reader, writer):
+        # HTTP/1.1 with keep-alive: serve requests until the client closes
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = _content_length(headers.get("content-length"))
+                if length is None:
+                    status, content_type, payload = (HTTPStatus.BAD_REQUEST, "application/json",
+                                                     b'{"error": "Invalid Content-Length."}')
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, content_type, payload = (HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "application/json",
+                                                     b'{"error": "Request body too large."}')
+                    keep_alive = False
+                else:
+                    raw_body = await reader.readexactly(length) if length else b""
+                    status, content_type, payload = await self.dispatch(method, target.split("?")[0], raw_body)
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version == "HTTP/1.1")
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        """
+        Serve until cancelled (Ctrl+C) or sent SIGTERM; either way the chart
+        worker processes are shut down before returning
+        """
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # No signal handlers on Windows event loops or outside the main thread
+            pass
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Serving on http://{address[0]}:{address[1]}", flush=True)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            try:
+                loop.remove_signal_handler(signal.SIGTERM)
+            except (NotImplementedError, RuntimeError):
+                pass
+            self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+def _number(body, key):
+    try:
+        return float(body[key])
+    except KeyError:
+        raise ValueError(f"'{key}' is required.") from None
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be a number.") from None
+
+
+def _string(body, key, default=None):
+    """
+    A text field; missing or null gives default
+    """
+    value = body.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"'{key}' must be a string.")
+    return value
+
+
+def _flag(body, key):
+    """
+    A yes/no field: a JSON boolean, or one of the yes/no words the
+    dietary_recommendation batch mode accepts. Missing or null means no.
+    """
+    value = body.get(key)
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, (str, int)):
+        if dietary_recommendation._parse_flag(value):
+            return True
+        if str(value).strip().lower() in ("no", "false", "0", "n"):
+            return False
+    raise ValueError(f"'{key}' must be true or false.")
+
+
+def _positive(body, key):
+    value = _number(body, key)
+    if not value > 0:
+        raise ValueError(f"'{key}' must be greater than zero.")
+    return value
+
+
+def _content_length(value):
+    """
+    Content-Length header as a non-negative int (0 when absent), or None when invalid
+    """
+    if value is None or value == "":
+        return 0
+    if not (value.isascii() and value.isdigit()):
+        return None
+    return int(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the nutrition projects over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--chart-workers", type=int, default=None,
+                        help="Processes for chart rendering (default: CPU count)")
+    parser.add_argument("--metrics", action="store_true", help="Serve timing metrics on GET /metrics")
+    options = parser.parse_args()
+    try:
+        with instrumentation.capture():
+            asyncio.run(NutritionService(options.chart_workers, options.metrics).serve(options.host, options.port))
+    except KeyboardInterrupt:
+        pass
@@ -1,9 +1,20 @@
-import matplotlib.pyplot as plt
+import bisect
+import io
+import os
+import sys
 
-import numpy as np
+# Helpers shared by the scripts (batch mode, exact rounding, log storage) are in the sibling "shared" folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
+import batch_mode
+from exact_rounding import round_like_python
+
+# matplotlib and NumPy are imported inside the chart code so that importing
+# this module (and running it without charts) stays fast.
 
 # User Class
 class User:
+    __slots__ = ("age", "gender", "weight", "height")
+
     def __init__(self, age, gender, weight, height):
         # Represents a user with basic attributes such as age, gender, weight, and height
         self.age = age
@@ -17,6 +28,21 @@ class User:
         """
         return round(self.weight / (self.height / 100) ** 2, 2)
 
+    def bmi_category(self):
+        return bmi_category(self.calculate_bmi())
+
+    @staticmethod
+    def calculate_bmi_array(weight, height):
+        """
+        Vectorised calculate_bmi over arrays of weights (kg) and heights (cm).
+        Gives exactly the values calculate_bmi gives for each user.
+        """
+        import numpy as np
+
+        weight = np.asarray(weight, dtype=np.float64)
+        height = np.asarray(height, dtype=np.float64)
+        return round_like_python(weight / (height / 100) ** 2, 2)
+
 # Food Intake Class
 class FoodIntake:
     # Stores user's food intake and recommended servings for each food category
@@ -35,58 +61,309 @@ class FoodIntake:
         self.meats = meats
         self.dairy = dairy
 
+# -----------------------------
+# Multi-format Export
+# -----------------------------
+EXPORT_FORMATS = ("png", "svg", "thumbnail")
+VECTOR_FORMATS = {"svg", "pdf"}
+THUMBNAIL_SIZE = (320, 240)
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _write_png(basename, pixels, dpi):
+    import matplotlib.image
+
+    path = f"{basename}.png"
+    # Same encoder and metadata as Figure.savefig, without drawing the figure again
+    matplotlib.image.imsave(path, pixels, format="png", dpi=dpi)
+    return path
+
+
+def _write_jpeg(basename, pixels, dpi):
+    import matplotlib.image
+
+    path = f"{basename}.jpg"
+    matplotlib.image.imsave(path, pixels, format="jpeg", dpi=dpi)
+    return path
+
+
+def _write_thumbnail(basename, pixels, dpi):
+    from PIL import Image
+
+    path = f"{basename}_thumb.jpg"
+    image = Image.fromarray(pixels).convert("RGB")
+    image.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+    image.save(path, format="jpeg", quality=85)
+    return path
+
+
+EXPORT_WRITERS = {
+    "png": _write_png,
+    "jpg": _write_jpeg,
+    "thumbnail": _write_thumbnail,
+    "svg": _write_bytes,
+    "pdf": _write_bytes,
+}
+
+
+def _submit(executor, function, *args):
+    if executor is not None:
+        return executor.submit(function, *args)
+    from concurrent.futures import Future
+
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+
 # Strategy Interface
 class ChartStrategy:
-    # Abstract base class for chart strategies
-    def create_chart(self, *args):
+    # Abstract base class for chart strategies.
+    # Subclasses draw onto an explicit Figure in draw(); create_chart() shows the
+    # chart interactively and render() produces it headlessly.
+    filename = None
+    figsize = None
+
+    def draw(self, figure, *args):
         pass
 
+    def create_chart(self, *args):
+        # Interactive path: pyplot figure, saved to the strategy's file and shown
+        import matplotlib.pyplot as plt
+
+        figure = plt.figure(figsize=self.figsize)
+        self.draw(figure, *args)
+        figure.savefig(self.filename)
+        plt.show()
+
+    def render(self, *args, path=None, format=None):
+        """
+        Render the chart headlessly on an Agg canvas, without touching pyplot.
+        :param path: File to write; when omitted the image bytes are returned
+        :param format: Image format, defaults to the path extension or PNG
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=self.figsize)
+        FigureCanvasAgg(figure)
+        try:
+            self.draw(figure, *args)
+            if path is not None:
+                figure.savefig(path, format=format)
+                return path
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format=format or "png")
+            return buffer.getvalue()
+        finally:
+            figure.clear()
+
+    def export_async(self, *args, basename, formats=EXPORT_FORMATS, executor=None):
+        """
+        Draw the chart once and save it in several formats. The figure is
+        rasterised once: PNG, JPEG and the thumbnail are all encoded from the
+        same pixels, and only vector formats (SVG, PDF) are drawn again by
+        their own backend. Encoding and file writes run on the executor.
+        :param basename: Output path without extension, e.g. charts/report-x/bar_chart
+        :param formats: Any of 'png', 'jpg', 'svg', 'pdf' and 'thumbnail' (small JPEG)
+        :param executor: Thread pool for encoding and writes; without one they run inline
+        :return: Dict of format -> Future of the written path
+        """
+        import numpy as np
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        unknown = set(formats) - set(EXPORT_WRITERS)
+        if unknown:
+            raise ValueError(f"Unknown chart formats: {', '.join(sorted(unknown))}.")
+        figure = Figure(figsize=self.figsize)
+        canvas = FigureCanvasAgg(figure)
+        jobs = {}
+        try:
+            self.draw(figure, *args)
+            if any(fmt not in VECTOR_FORMATS for fmt in formats):
+                canvas.draw()
+                pixels = np.asarray(canvas.buffer_rgba()).copy()
+            for fmt in formats:
+                if fmt in VECTOR_FORMATS:
+                    # Vector output is produced here, while the figure is alive; only the write is deferred
+                    buffer = io.BytesIO()
+                    figure.savefig(buffer, format=fmt)
+                    jobs[fmt] = (_write_bytes, f"{basename}.{fmt}", buffer.getvalue())
+                else:
+                    jobs[fmt] = (EXPORT_WRITERS[fmt], basename, pixels, figure.dpi)
+        finally:
+            figure.clear()
+        return {fmt: _submit(executor, *job) for fmt, job in jobs.items()}
+
+    def export(self, *args, basename, formats=EXPORT_FORMATS, executor=None):
+        """
+        export_async() that waits for the files; returns a dict of format -> path
+        """
+        futures = self.export_async(*args, basename=basename, formats=formats, executor=executor)
+        return {fmt: future.result() for fmt, future in futures.items()}
+
 
 class BMIChartStrategy(ChartStrategy):
-    # Strategy for creating a BMI visualization chart
-    def create_chart(self, bmi):
-        categories = [
-            "Very Underweight",
-            "Underweight",
-            "Healthy Weight",
-            "Overweight",
-            "Obese",
-        ]
-        thresholds = [15, 18.5, 24.9, 29.9, 35]
-        y_positions = range(len(categories))
-
-        plt.figure(figsize=(8, 6))
-        plt.hlines(y=y_positions, xmin=0, xmax=thresholds, colors="black", linewidth=2)
-        plt.axvline(x=bmi, color="red", linewidth=2)
+    # Strategy for creating a BMI visualization chart.
+    # Only the red BMI marker changes between users, so render_many() draws the
+    # static layers once into a cached template and blits just the marker.
+    filename = "bmi_chart_updated.jpg"
+    figsize = (8, 6)
+    CATEGORIES = [
+        "Very Underweight",
+        "Underweight",
+        "Healthy Weight",
+        "Overweight",
+        "Obese",
+    ]
+    THRESHOLDS = [15, 18.5, 24.9, 29.9, 35]
+
+    def __init__(self):
+        self._template = None
+
+    def __getstate__(self):
+        # The cached template holds a live figure; workers build their own
+        state = self.__dict__.copy()
+        state["_template"] = None
+        return state
+
+    def draw(self, figure, bmi):
+        ax = figure.subplots()
+        self._draw_thresholds(ax)
+        self._draw_marker(ax, bmi)
+        self._decorate(ax)
+        figure.tight_layout()
+
+    def _draw_thresholds(self, ax):
+        y_positions = range(len(self.CATEGORIES))
+        ax.hlines(y=y_positions, xmin=0, xmax=self.THRESHOLDS, colors="black", linewidth=2)
+
+    def _draw_marker(self, ax, bmi):
+        line = ax.axvline(x=bmi, color="red", linewidth=2)
 
         # Display the user's BMI on the chart
-        plt.text(
+        text = ax.text(
             bmi,
-            len(categories),
+            len(self.CATEGORIES),
             f"Your BMI: {bmi:.2f}",
             color="red",
             fontsize=10,
             fontweight="bold",
             ha="center",
         )
+        return line, text
 
-        plt.gca().invert_yaxis()
+    def _decorate(self, ax):
+        ax.invert_yaxis()
 
         # Add labels and title
-        plt.yticks(y_positions, categories)
-        plt.xticks(range(0, 40, 5))
-        plt.xlabel("BMI")
-        plt.ylabel("Weight Category")
-        plt.title("BMI Chart for Adults")
-
-        plt.tight_layout()
-        plt.savefig("bmi_chart_updated.jpg")
-        plt.show()
+        ax.set_yticks(range(len(self.CATEGORIES)), self.CATEGORIES)
+        ax.set_xticks(range(0, 40, 5))
+        ax.set_xlabel("BMI")
+        ax.set_ylabel("Weight Category")
+        ax.set_title("BMI Chart for Adults")
+
+    def _build_template(self, low, high):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(figsize=self.figsize)
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.subplots()
+        self._draw_thresholds(ax)
+        line, text = self._draw_marker(ax, low)
+        # Invisible line so the x-axis also covers the largest BMI in the batch
+        ax.axvline(x=high, visible=False)
+        line.set_animated(True)
+        text.set_animated(True)
+        self._decorate(ax)
+        figure.tight_layout()
+        canvas.draw()
+        return {
+            "figure": figure,
+            "canvas": canvas,
+            "ax": ax,
+            "line": line,
+            "text": text,
+            "xlim": ax.get_xlim(),
+            "background": canvas.copy_from_bbox(figure.bbox),
+        }
+
+    def _template_for(self, low, high):
+        template = self._template
+        if template is None or low < template["xlim"][0] or high > template["xlim"][1]:
+            template = self._template = self._build_template(low, high)
+        return template
+
+    def render_many(self, bmis, paths=None, format="png"):
+        """
+        Render one BMI chart per value, reusing a cached background template.
+        :param bmis: Sequence of BMI values
+        :param paths: Optional file path per BMI; when omitted image bytes are returned
+        :param format: Raster image format (png, jpg, ...)
+        :return: List of paths or image bytes, one per BMI
+        """
+        import matplotlib.image
+        import numpy as np
+
+        bmis = [float(bmi) for bmi in bmis]
+        if not bmis:
+            return []
+        template = self._template_for(min(bmis), max(bmis))
+        canvas, ax = template["canvas"], template["ax"]
+        line, text = template["line"], template["text"]
+
+        results = []
+        for i, bmi in enumerate(bmis):
+            canvas.restore_region(template["background"])
+            line.set_xdata([bmi, bmi])
+            text.set_x(bmi)
+            text.set_text(f"Your BMI: {bmi:.2f}")
+            ax.draw_artist(line)
+            ax.draw_artist(text)
+            pixels = np.asarray(canvas.buffer_rgba())
+            if format in ("jpg", "jpeg"):
+                pixels = pixels[:, :, :3]
+            target = paths[i] if paths is not None else io.BytesIO()
+            matplotlib.image.imsave(target, pixels, format=format)
+            results.append(paths[i] if paths is not None else target.getvalue())
+        return results
+
+
+def bmi_category(bmi):
+    """
+    BMIChartStrategy category for a BMI: each category runs up to and
+    including its threshold, and everything above the last one is Obese.
+    """
+    index = bisect.bisect_left(BMIChartStrategy.THRESHOLDS, bmi)
+    return BMIChartStrategy.CATEGORIES[min(index, len(BMIChartStrategy.CATEGORIES) - 1)]
+
+
+def bmi_category_array(bmi):
+    """
+    Vectorised bmi_category: returns an array of category names
+    """
+    import numpy as np
+
+    index = np.searchsorted(BMIChartStrategy.THRESHOLDS, np.asarray(bmi, dtype=np.float64), side="left")
+    categories = np.array(BMIChartStrategy.CATEGORIES, dtype=object)
+    return categories[np.minimum(index, len(categories) - 1)]
 
 
 class BarChartStrategy(ChartStrategy):
     # Strategy for creating a bar chart comparing actual and recommended food intake
-    def create_chart(self, actual, recommended):
+    filename = "grouped_bar_chart.jpg"
+    figsize = (10, 5)
+
+    def draw(self, figure, actual, recommended):
+        import numpy as np
+
         categories = list(actual.keys())
         actual_values = list(actual.values())
         recommended_values = list(recommended.values())
@@ -95,62 +372,64 @@ class BarChartStrategy(ChartStrategy):
         x = np.arange(len(categories))  # The label locations
         width = 0.35  # The width of the bars
 
-        # Create the figure and the axes
-        plt.figure(figsize=(10, 5))
+        ax = figure.subplots()
 
         # Plot bars for recommended and actual values
-        plt.bar(
+        ax.bar(
             x - width / 2, recommended_values, width, label="Recommended", color="blue"
         )
-        plt.bar(x + width / 2, actual_values, width, label="Actual", color="orange")
+        ax.bar(x + width / 2, actual_values, width, label="Actual", color="orange")
 
         # Add labels, title, and legend
-        plt.xlabel("Food Group")
-        plt.ylabel("Servings")
-        plt.title("Recommended vs Actual Intake")
-        plt.xticks(
+        ax.set_xlabel("Food Group")
+        ax.set_ylabel("Servings")
+        ax.set_title("Recommended vs Actual Intake")
+        ax.set_xticks(
             ticks=x, labels=categories
         )  # Set the tick labels to the food group names
-        plt.legend()
+        ax.legend()
 
-        # Save and display the chart
-        plt.tight_layout()
-        plt.savefig("grouped_bar_chart.jpg")
-        plt.show()
+        figure.tight_layout()
 
 
 class LineChartStrategy(ChartStrategy):
     # Strategy for creating a line chart comparing actual and recommended food intake
-    def create_chart(self, actual, recommended):
+    filename = "line_chart.jpg"
+
+    def draw(self, figure, actual, recommended):
         categories = list(actual.keys())  # Food categories
         actual_values = list(actual.values())  # Actual intake values
         recommended_values = list(recommended.values())  # Recommended intake values
 
         # Create line chart
-        plt.plot(categories, actual_values, marker="o", label="Actual", linestyle="-")
-        plt.plot(
+        ax = figure.subplots()
+        ax.plot(categories, actual_values, marker="o", label="Actual", linestyle="-")
+        ax.plot(
             categories,
             recommended_values,
             marker="x",
             label="Recommended",
             linestyle="--",
         )
-        plt.xlabel("Food Categories")
-        plt.ylabel("Servings")
-        plt.title("Line Chart: Food Intake vs Recommendations")
-        plt.legend()
-        plt.savefig("line_chart.jpg")  # Save as .jpg
-        plt.show()
+        ax.set_xlabel("Food Categories")
+        ax.set_ylabel("Servings")
+        ax.set_title("Line Chart: Food Intake vs Recommendations")
+        ax.legend()
 
 
 class PieChartStrategy(ChartStrategy):
     # Strategy for creating a pie chart to visualize actual and recommended intake
-    def create_chart(self, actual):
+    filename = "pie_chart.jpg"
+    figsize = (12, 6)
+
+    def draw(self, figure, actual, recommended=None):
+        if recommended is None:
+            recommended = FoodIntake.RECOMMENDATION
         categories = actual.keys()  # Food categories
         actual_values = actual.values()  # Actual intake value
         recommended_values = recommended.values()
         # Create subplots for side-by-side pie charts
-        fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+        axes = figure.subplots(1, 2)
 
         # Create pie chart
         # User Intake Pie Chart
@@ -162,20 +441,215 @@ class PieChartStrategy(ChartStrategy):
         )
         axes[1].set_title("Recommended Intake")
         # Overall Title
-        fig.suptitle("Daily Serving Intake")
-
-        plt.savefig("pie_chart.jpg")  # Save as .jpg
-        plt.show()
+        figure.suptitle("Daily Serving Intake")
+
+
+# -----------------------------
+# Multi-user Charts
+# -----------------------------
+FOOD_GROUPS = tuple(FoodIntake.RECOMMENDATION)
+
+
+def intake_matrix(intakes):
+    """
+    Stack many users' intake into one (users, food groups) array with the
+    columns in FOOD_GROUPS order.
+    :param intakes: 2D array-like of servings, or FoodIntake objects
+    """
+    import numpy as np
+
+    if isinstance(intakes, np.ndarray):
+        matrix = intakes.astype(np.float64, copy=False)
+    else:
+        intakes = list(intakes)
+        if intakes and isinstance(intakes[0], FoodIntake):
+            intakes = [[getattr(intake, group) for group in FOOD_GROUPS] for intake in intakes]
+        matrix = np.array(intakes, dtype=np.float64).reshape(-1, len(FOOD_GROUPS))
+    if matrix.ndim != 2 or matrix.shape[1] != len(FOOD_GROUPS):
+        raise ValueError(f"Intake matrix needs one column per food group: {', '.join(FOOD_GROUPS)}.")
+    return matrix
+
+
+def _recommended_row(recommended):
+    import numpy as np
+
+    if recommended is None:
+        recommended = FoodIntake.RECOMMENDATION
+    return np.array([recommended[group] for group in FOOD_GROUPS], dtype=np.float64)
+
+
+class SmallMultiplesChartStrategy(ChartStrategy):
+    # Strategy for a grid of small bar charts, one panel per user, in a single figure.
+    # Creating an Axes per user is what makes hundreds of panels slow, so every
+    # panel is laid out in one shared Axes and all bars are drawn with one call.
+    filename = "small_multiples_chart.png"
+    panel_size = (2.0, 1.4)
+
+    def draw(self, figure, intake, labels=None, recommended=None, columns=None):
+        import numpy as np
+
+        matrix = intake_matrix(intake)
+        target = _recommended_row(recommended)
+        users, groups = matrix.shape
+        columns = columns or max(1, int(np.ceil(np.sqrt(users))))
+        rows = max(1, -(-users // columns))
+        height = rows * self.panel_size[1] + 0.5
+        figure.set_size_inches(columns * self.panel_size[0], height)
+
+        # Panel origins: columns left to right, rows top to bottom
+        panel_width = groups + 1
+        panel_height = max(float(matrix.max(initial=0)), float(target.max())) * 1.3
+        row, column = np.divmod(np.arange(users), columns)
+        left = column * panel_width
+        bottom = (rows - 1 - row) * panel_height
+        x = (left[:, None] + np.arange(groups)).ravel()
+        base = np.repeat(bottom, groups)
+
+        ax = figure.add_axes((0.01, 0.01, 0.98, 0.98 - 0.5 / height))
+        ax.bar(x, matrix.ravel(), bottom=base, width=0.8,
+               color=np.where(matrix >= target, "green", "orange").ravel())
+        ax.hlines(base + np.tile(target, users), x - 0.4, x + 0.4, color="blue", linewidth=1)
+        ax.hlines(bottom, left - 0.5, left + groups - 0.5, color="gray", linewidth=0.5)
+        for i in range(users):
+            ax.text(left[i] - 0.4, bottom[i] + panel_height * 0.95,
+                    labels[i] if labels is not None else f"User {i + 1}", fontsize=7, va="top")
+        ax.set_xlim(-1, columns * panel_width - 1)
+        ax.set_ylim(-panel_height * 0.05, rows * panel_height)
+        ax.set_axis_off()
+        figure.suptitle("Daily Servings vs Recommended (blue)\n" + ", ".join(FOOD_GROUPS), fontsize=8)
+
+
+class BoxPlotChartStrategy(ChartStrategy):
+    # Strategy for the distribution of intake across users, one box per food group,
+    # with the recommended servings marked and the share of users meeting them
+    filename = "intake_box_plot.png"
+    figsize = (10, 5)
+    title = "Daily Servings Across Users"
+
+    def draw(self, figure, intake, recommended=None):
+        import numpy as np
+
+        matrix = intake_matrix(intake)
+        target = _recommended_row(recommended)
+        meeting = (matrix >= target).mean(axis=0) * 100 if len(matrix) else np.zeros(len(target))
+        positions = np.arange(1, len(FOOD_GROUPS) + 1)
+
+        ax = figure.subplots()
+        self._plot(ax, matrix, positions)
+        ax.scatter(positions, target, marker="x", color="blue", zorder=3, label="Recommended")
+        ax.set_xticks(positions, [f"{group}\n{share:.0f}% meet" for group, share in zip(FOOD_GROUPS, meeting)])
+        ax.set_ylabel("Servings")
+        ax.set_title(f"{self.title} (n={len(matrix)})")
+        ax.legend()
+        figure.tight_layout()
+
+    def _plot(self, ax, matrix, positions):
+        ax.boxplot(matrix, positions=positions, showfliers=False)
+
+
+class ViolinPlotChartStrategy(BoxPlotChartStrategy):
+    # Same as the box plot, drawn as violins (a violin needs at least two users)
+    filename = "intake_violin_plot.png"
+
+    def _plot(self, ax, matrix, positions):
+        if len(matrix) < 2:
+            super()._plot(ax, matrix, positions)
+        else:
+            ax.violinplot(matrix, positions=positions, showmedians=True)
 
 
 class Visualiser:
-    # Uses a strategy to create different types of charts
-    def __init__(self, strategy: ChartStrategy):
+    # Uses a strategy to create different types of charts.
+    # With a cache (e.g. chart_cache.ChartCache) charts are rendered headlessly
+    # and identical inputs are served from the cache instead of drawn again.
+    def __init__(self, strategy: ChartStrategy, cache=None):
         self.strategy = strategy
+        self.cache = cache
 
     def create_chart(self, *args):
+        if self.cache is not None:
+            return self.cache.fetch(self.strategy, args, path=self.strategy.filename)
         self.strategy.create_chart(*args)
 
+    def render(self, *args, path=None, format=None):
+        # Headless, non-blocking version of create_chart
+        if self.cache is not None:
+            return self.cache.fetch(self.strategy, args, path=path, format=format)
+        return self.strategy.render(*args, path=path, format=format)
+
+    def export(self, *args, basename, formats=EXPORT_FORMATS, executor=None):
+        # Headless, drawn once and saved in several formats
+        return self.strategy.export(*args, basename=basename, formats=formats, executor=executor)
+
+
+def _use_agg_backend():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render_job(job):
+    strategy, args, path = job
+    return strategy.render(*args, path=path)
+
+
+def render_charts(jobs, processes=None, chunksize=16, maxtasksperchild=1000):
+    """
+    Render many charts headlessly on a pool of worker processes.
+    :param jobs: Iterable of (strategy, args, path) tuples, e.g.
+                 (BMIChartStrategy(), (bmi,), "user_1_bmi.png")
+    :param processes: Number of workers, defaults to the CPU count
+    :param maxtasksperchild: Recycle workers after this many charts so memory stays flat
+    :return: List of written paths (or image bytes for jobs whose path is None)
+    """
+    import multiprocessing
+
+    with multiprocessing.Pool(processes, initializer=_use_agg_backend,
+                              maxtasksperchild=maxtasksperchild) as pool:
+        return list(pool.imap(_render_job, jobs, chunksize))
+
+
+REPORT_CHARTS = ("bmi_chart", "bar_chart", "line_chart", "pie_chart")
+
+
+def new_report_folder(directory="charts", name=None):
+    """
+    Create a chart folder unique to one user and run, so concurrent runs never
+    overwrite each other's files
+    :param name: Optional label included in the folder name
+    """
+    import tempfile
+
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"report-{name}-" if name else "report-", dir=directory)
+
+
+def export_report(user, food_intake, folder, charts=REPORT_CHARTS, formats=EXPORT_FORMATS, max_workers=4):
+    """
+    Save a user's charts into folder. Each chart is drawn once and written in
+    every format; encoding and writes run on a thread pool while the next
+    chart is being drawn.
+    :param charts: Any of REPORT_CHARTS
+    :return: Dict of chart name -> {format: path}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    actual = {group: getattr(food_intake, group) for group in FOOD_GROUPS}
+    jobs = {
+        "bmi_chart": (BMIChartStrategy(), (user.calculate_bmi(),)),
+        "bar_chart": (BarChartStrategy(), (actual, FoodIntake.RECOMMENDATION)),
+        "line_chart": (LineChartStrategy(), (actual, FoodIntake.RECOMMENDATION)),
+        "pie_chart": (PieChartStrategy(), (actual,)),
+    }
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = {
+            chart: jobs[chart][0].export_async(*jobs[chart][1], basename=os.path.join(folder, chart),
+                                               formats=formats, executor=executor)
+            for chart in charts
+        }
+        return {chart: {fmt: future.result() for fmt, future in paths.items()}
+                for chart, paths in futures.items()}
+
 
 class DataProcessor:
     @staticmethod
@@ -195,8 +669,55 @@ class DataProcessor:
             f.write(f"Meats: {food_intake.meats} servings\n")
             f.write(f"Dairy: {food_intake.dairy} servings\n")
 
+    @staticmethod
+    def to_record(user, food_intake):
+        # Flattens user details and food intake into one record for bulk exports
+        return {
+            "age": user.age,
+            "gender": user.gender,
+            "weight": user.weight,
+            "height": user.height,
+            "bmi": user.calculate_bmi(),
+            "vegetables": food_intake.vegetables,
+            "fruits": food_intake.fruits,
+            "grains": food_intake.grains,
+            "meats": food_intake.meats,
+            "dairy": food_intake.dairy,
+        }
+
+
+# -----------------------------
+# Batch Mode
+# -----------------------------
+# python nutrition_visualizer.py people.csv [--jobs N]
+# One record per person: age, gender, weight, height and the servings of each food group
+def process_record(record):
+    """
+    One person's details and intake to their DataProcessor.to_record summary
+    """
+    age = record.get("age")
+    weight, height = float(record["weight"]), float(record["height"])
+    if not (weight > 0 and height > 0):
+        raise ValueError("weight and height must be greater than zero.")
+    user = User(float(age) if age not in (None, "") else None, record.get("gender"), weight, height)
+    food_intake = FoodIntake(*(float(record.get(group) or 0) for group in FOOD_GROUPS))
+    result = DataProcessor.to_record(user, food_intake)
+    result["bmi_category"] = user.bmi_category()
+    return result
+
+def run_batch(argv=None):
+    """
+    Batch mode: process_record over CSV or JSON Lines records, one JSON result per line on stdout
+    """
+    batch_mode.run_batch(process_record, "Compute BMI and intake summaries in batch.", argv)
+
 
 if __name__ == "__main__":
+    # Any command-line arguments switch to batch mode, e.g. --jobs 4 people.csv ('-' reads stdin)
+    if len(sys.argv) > 1:
+        run_batch()
+        sys.exit()
+
     # Input user details and food intake
     age = int(input("Enter your age (in years): "))
     gender = input("Enter your gender (male or female): ")
@@ -215,40 +736,27 @@ if __name__ == "__main__":
     bmi = user.calculate_bmi()
     print(f"Your BMI is: {bmi}")
 
+    # Each chart is drawn once and saved as PNG, SVG and a JPEG thumbnail in a
+    # folder of its own for this run, so concurrent runs never overwrite each other
+    report_folder = None
+    saved_charts = []
+
     # Save BMI Chart
     save_bmi = input("Would you like to save the BMI chart? (yes/no): ").lower()
     if save_bmi == "yes":
-        visualiser = Visualiser(BMIChartStrategy())
-        visualiser.create_chart(bmi)
-        print("Visualize BMI saved as visualize_bmi_chart.jpg")
-
-    # Prepare data for visualisation
-    actual = {
-        "vegetables": food_intake.vegetables,
-        "fruits": food_intake.fruits,
-        "grains": food_intake.grains,
-        "meats": food_intake.meats,
-        "dairy": food_intake.dairy,
-    }
-    recommended = FoodIntake.RECOMMENDATION
+        report_folder = new_report_folder()
+        report = export_report(user, food_intake, report_folder, charts=["bmi_chart"])
+        saved_charts.append("bmi_chart")
+        print(f"BMI chart saved as {', '.join(report['bmi_chart'].values())}")
 
-    # Ask to save other charts
+    # Ask to save other charts (the BMI chart is not drawn again if it was already saved)
     save_charts = input("Would you like to save the charts? (yes/no): ").lower()
     if save_charts == "yes":
-        visualiser = Visualiser(BMIChartStrategy())
-        visualiser.create_chart(bmi)
-        print("Visualize BMI saved as visualize_bmi_chart.jpg")
-        visualiser = Visualiser(BarChartStrategy())
-        visualiser.create_chart(actual, recommended)
-        print("Visualize Bar Chart saved as visualize_bar_chart_chart.jpg")
-
-        visualiser = Visualiser(LineChartStrategy())
-        visualiser.create_chart(actual, recommended)
-        print("Visualize Line Chart saved as visualize_line_chart_chart.jpg")
-
-        visualiser = Visualiser(PieChartStrategy())
-        visualiser.create_chart(actual)
-        print("Visualize Pie Chart saved as visualize_pie_charts_chart.jpg")
+        report_folder = report_folder or new_report_folder()
+        charts = [chart for chart in REPORT_CHARTS if chart not in saved_charts]
+        report = export_report(user, food_intake, report_folder, charts=charts)
+        for chart, paths in report.items():
+            print(f"{chart.replace('_', ' ').capitalize()} saved as {', '.join(paths.values())}")
 
     # Optionally export user data
     export_data = input("Do you also want to export your data? (yes/no): ").lower()
@@ -0,0 +1,76 @@
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+
+# The projects are standalone scripts in sibling folders
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for project in ("Hydration Tracker", "nutrition_visualizer"):
+    sys.path.insert(0, os.path.join(ROOT, project))
+
+import Hydration_Tracker
+import nutrition_visualizer
+
+RESULT_COLUMNS = ("bmi", "bmi_category", "recommended_liters")
+
+
+def screen(weight, height, activity_level):
+    """
+    BMI, BMI category and recommended water intake for a whole population.
+    :param weight: Weights in kg
+    :param height: Heights in cm
+    :param activity_level: 'low', 'medium' or 'high' per person
+    :return: Dict of arrays keyed by RESULT_COLUMNS; the values match
+             User.calculate_bmi, bmi_category and User.recommended_water_intake
+    """
+    weight = np.asarray(weight, dtype=np.float64)
+    bmi = nutrition_visualizer.User.calculate_bmi_array(weight, height)
+    return {
+        "bmi": bmi,
+        "bmi_category": nutrition_visualizer.bmi_category_array(bmi),
+        "recommended_liters": Hydration_Tracker.User.recommended_water_intake_array(weight, activity_level),
+    }
+
+
+def screen_csv(stream, chunk_rows=100_000):
+    """
+    Screen a CSV stream with weight, height and activity_level columns.
+    Rows are processed in chunks so memory stays bounded; yields
+    (rows, results) per chunk, where rows are the input dicts.
+    """
+    rows = []
+    for row in csv.DictReader(stream):
+        rows.append(row)
+        if len(rows) >= chunk_rows:
+            yield rows, _screen_rows(rows)
+            rows = []
+    if rows:
+        yield rows, _screen_rows(rows)
+
+
+def _screen_rows(rows):
+    return screen(
+        [float(row["weight"]) for row in rows],
+        [float(row["height"]) for row in rows],
+        [row.get("activity_level") or "low" for row in rows],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Add BMI, BMI category and recommended water intake to a CSV of people.")
+    parser.add_argument("input", nargs="?", help="CSV file (default: stdin)")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    options = parser.parse_args()
+
+    source = open(options.input, newline="") if options.input else sys.stdin
+    writer = None
+    with source:
+        for rows, results in screen_csv(source, options.chunk_rows):
+            if writer is None:
+                writer = csv.writer(sys.stdout, lineterminator="\n")
+                writer.writerow(list(rows[0]) + list(RESULT_COLUMNS))
+            columns = [results[column].tolist() for column in RESULT_COLUMNS]
+            writer.writerows(list(row.values()) + list(values) for row, values in zip(rows, zip(*columns)))
@@ -0,0 +1,208 @@
+# -----------------------------
+# Population Statistics
+# -----------------------------
+class RunningMoments:
+    """
+    Streaming count, mean and variance of several columns at once.
+    Chunks are folded in with the Welford / Chan et al. update, which stays
+    accurate over millions of values and lets two partial results (e.g. from
+    separate processes) be merged exactly.
+    """
+    def __init__(self, columns):
+        import numpy as np
+
+        self.count = 0
+        self.mean = np.zeros(columns)
+        self.m2 = np.zeros(columns)
+
+    def update(self, values):
+        """
+        :param values: An (n, columns) array-like
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.mean.size)
+        if len(values):
+            mean = values.mean(axis=0)
+            self._combine(len(values), mean, ((values - mean) ** 2).sum(axis=0))
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+        return self
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def variance(self, ddof=0):
+        import numpy as np
+
+        if self.count <= ddof:
+            return np.full(self.mean.size, np.nan)
+        return self.m2 / (self.count - ddof)
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (Dunning's merging t-digest).
+    Values are buffered and folded into at most about compression / 2
+    weighted centroids, which are small near the tails so p99 stays accurate.
+    Each fold is one NumPy sort and reduction over the buffer, and two
+    digests merge by folding one's centroids into the other's.
+    A quantile q is off by at most one centroid's share of the values,
+    2 * pi * sqrt(q * (1 - q)) / compression in rank (about 0.3% at p99 with
+    the default compression).
+    """
+    def __init__(self, compression=200, buffer_size=100_000):
+        """
+        :param compression: Larger keeps more centroids and gives more accurate quantiles
+        :param buffer_size: Values collected before they are folded into the centroids
+        """
+        import numpy as np
+
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values):
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._buffer.append(values)
+        self._buffered += len(values)
+        if self._buffered >= self.buffer_size:
+            self._fold()
+
+    def merge(self, other):
+        if other.count:
+            other._fold()
+            self._fold(other.means, other.weights)
+            self.count += other.count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def _fold(self, means=None, weights=None):
+        import numpy as np
+
+        if not self._buffer and means is None:
+            return
+        # Sort the raw values, then slot the (few) centroids into place
+        values = np.sort(np.concatenate(self._buffer)) if self._buffer else np.empty(0)
+        centroids = self.means if means is None else np.concatenate([self.means, means])
+        centroid_weights = self.weights if weights is None else np.concatenate([self.weights, weights])
+        order = np.argsort(centroids, kind="stable")
+        positions = np.searchsorted(values, centroids[order])
+        all_means = np.insert(values, positions, centroids[order])
+        all_weights = np.insert(np.ones(len(values)), positions, centroid_weights[order])
+        # Centroids whose mid-point falls in the same unit of the k1 scale
+        # function k(q) = compression / (2 pi) * asin(2q - 1) are merged
+        cumulative = np.cumsum(all_weights)
+        q = (cumulative - all_weights / 2) / cumulative[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1)))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(all_weights, starts)
+        self.means = np.add.reduceat(all_means * all_weights, starts) / self.weights
+        self._buffer = []
+        self._buffered = 0
+
+    def quantile(self, q):
+        """
+        Estimated quantile(s), interpolated between centroid mid-points
+        :param q: A fraction in [0, 1], or an array of them
+        """
+        import numpy as np
+
+        self._fold()
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        cumulative = np.cumsum(self.weights)
+        positions = np.r_[0.0, cumulative - self.weights / 2, cumulative[-1]]
+        values = np.r_[self.min, self.means, self.max]
+        result = np.interp(np.asarray(q, dtype=np.float64) * cumulative[-1], positions, values)
+        return result if np.ndim(q) else float(result)
+
+
+class PopulationStats:
+    """
+    Calorie and macro statistics across many users' days in one streaming pass:
+    mean, variance and p50/p90/p99 of each metric, and the fraction of days
+    over the user's daily goal. Memory stays constant however many days are
+    added, and results built on separate processes can be merged.
+    """
+    METRICS = ("calories", "protein", "carbs", "fats")
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, compression=200):
+        self.moments = RunningMoments(len(self.METRICS))
+        self.digests = [TDigest(compression) for _ in self.METRICS]
+        self.over_goal = 0
+
+    @property
+    def days(self):
+        return self.moments.count
+
+    def add_day(self, user, meal_tracker):
+        """
+        Add one user's day from their MealTracker (or ColumnarMealTracker)
+        """
+        self.add_days([[meal_tracker.total_calories(), *meal_tracker.total_macros()]], [user.daily_goal])
+
+    def add_days(self, totals, daily_goals):
+        """
+        Add many days at once.
+        :param totals: An (n, 4) array-like of calories, protein, carbs and fats per day
+        :param daily_goals: The user's daily calorie goal for each day, or one goal for all
+        """
+        import numpy as np
+
+        totals = np.asarray(totals, dtype=np.float64).reshape(-1, len(self.METRICS))
+        self.moments.update(totals)
+        for column, digest in enumerate(self.digests):
+            digest.update(totals[:, column])
+        self.over_goal += int(np.count_nonzero(totals[:, 0] > np.asarray(daily_goals, dtype=np.float64)))
+
+    def merge(self, other):
+        """
+        Fold in statistics computed elsewhere, e.g. on another process
+        """
+        self.moments.merge(other.moments)
+        for digest, other_digest in zip(self.digests, other.digests):
+            digest.merge(other_digest)
+        self.over_goal += other.over_goal
+        return self
+
+    def summary(self):
+        """
+        :return: Dict with days, over_goal_fraction and, per metric, mean,
+                 variance, std, p50, p90 and p99
+        """
+        variance = self.moments.variance().tolist()
+        result = {
+            "days": self.days,
+            "over_goal_fraction": self.over_goal / self.days if self.days else float("nan"),
+        }
+        for column, metric in enumerate(self.METRICS):
+            quantiles = self.digests[column].quantile(self.QUANTILES).tolist()
+            result[metric] = {
+                "mean": float(self.moments.mean[column]) if self.days else float("nan"),
+                "variance": variance[column],
+                "std": variance[column] ** 0.5,
+                **{f"p{round(q * 100)}": value for q, value in zip(self.QUANTILES, quantiles)},
+            }
+        return result
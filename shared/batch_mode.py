@@ -0,0 +1,92 @@
+import argparse
+import csv
+import json
+import sys
+
+
+# -----------------------------
+# Input
+# -----------------------------
+def read_records(paths, format=None):
+    """
+    Yield input records (dicts) one at a time from CSV or JSON Lines files.
+    :param paths: File paths; '-' reads stdin
+    :param format: 'csv' or 'jsonl'; by default taken from each file's extension (stdin is CSV)
+    """
+    for path in paths:
+        file_format = format or ("jsonl" if path.endswith((".jsonl", ".json")) else "csv")
+        f = sys.stdin if path == "-" else open(path, newline="")
+        try:
+            if file_format == "jsonl":
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            else:
+                yield from csv.DictReader(f)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+# -----------------------------
+# Processing
+# -----------------------------
+def _safe_process(process, record):
+    # A bad record becomes an error record instead of stopping the whole batch
+    try:
+        return process(record)
+    except (ValueError, KeyError, TypeError, ArithmeticError) as error:
+        return {"error": str(error.args[0] if isinstance(error, KeyError) else error), "record": record}
+
+
+def _process_chunk(process, chunk):
+    return [_safe_process(process, record) for record in chunk]
+
+
+def batch_results(records, process, jobs=1, chunk_size=1000):
+    """
+    Results of process(record) in input order. With jobs > 1, chunks of
+    records are spread over worker processes and at most 2 * jobs chunks are
+    in flight, so memory stays bounded however large the input is.
+    :param process: Module-level function (so it can be sent to workers)
+    """
+    if jobs <= 1:
+        for record in records:
+            yield _safe_process(process, record)
+        return
+    import itertools
+    import multiprocessing
+    from collections import deque
+
+    with multiprocessing.Pool(jobs) as pool:
+        pending = deque()
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if chunk:
+                pending.append(pool.apply_async(_process_chunk, (process, chunk)))
+            if pending and (not chunk or len(pending) >= 2 * jobs):
+                yield from pending.popleft().get()
+            elif not chunk:
+                break
+
+
+def run_batch(process, description, argv=None, prepare=None):
+    """
+    Batch mode: read records from CSV or JSON Lines files (or stdin) and write
+    one JSON result per record to stdout as it is produced.
+    :param process: Turns one record into a JSON-serialisable result
+    :param description: Command line help text
+    :param prepare: Optional function over the record stream, e.g. grouping rows
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("inputs", nargs="*", default=["-"], help="CSV or JSON Lines files ('-' is stdin)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Input format (default: from the file extension)")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Records sent to a worker at a time")
+    options = parser.parse_args(argv)
+    records = read_records(options.inputs, options.format)
+    if prepare is not None:
+        records = prepare(records)
+    for result in batch_results(records, process, options.jobs, options.chunk_size):
+        sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
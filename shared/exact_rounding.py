@@ -0,0 +1,39 @@
+def round_like_python(values, ndigits):
+    """
+    Round a NumPy array exactly as Python's round() rounds each float.
+    np.round works on values * 10**ndigits, and that product is itself rounded,
+    so values next to a tie can go the wrong way. Here the product's rounding
+    error is recovered exactly (Dekker's two-product) to settle every tie the
+    way round() does: on the exact value, halves to even.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    # inf and nan inputs pass straight through
+    with np.errstate(invalid="ignore", over="ignore", under="ignore"):
+        product = values * scale
+        # Exact error of the product, so that values * scale == product + error
+        split = 134217729.0  # 2**27 + 1
+        values_high = split * values
+        values_high = values_high - (values_high - values)
+        values_low = values - values_high
+        scale_high = split * scale
+        scale_high = scale_high - (scale_high - scale)
+        scale_low = scale - scale_high
+        error = (((values_high * scale_high - product) + values_high * scale_low + values_low * scale_high)
+                 + values_low * scale_low)
+
+        lower = np.floor(product)
+        # The product may have been rounded up onto a whole number
+        lower = np.where((lower == product) & (error < 0), lower - 1, lower)
+        # Sign of (exact product - lower - 0.5); both terms are exact so the sign is too
+        above_half = (product - lower - 0.5) + error
+        odd = np.fmod(lower, 2) != 0
+        rounded = lower + ((above_half > 0) | ((above_half == 0) & odd))
+        # round() keeps the sign of values that round to zero, e.g. -0.001 -> -0.0
+        rounded = np.copysign(rounded / scale, values)
+        # Where floats are further apart than 10**-ndigits, the nearest float to
+        # the rounded value is the value itself; the products there may overflow
+        coarse = np.spacing(np.abs(values)) > 1 / scale
+    return np.where(coarse, values, rounded)
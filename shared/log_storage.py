@@ -0,0 +1,203 @@
+import json
+import os
+import sqlite3
+
+
+# -----------------------------
+# Log Storage Backends
+# -----------------------------
+class LogStorage:
+    """
+    Base storage backend for users' logs. save() stores one (user, log) pair
+    and returns where it went; load() reads it back as a pair.
+
+    Each script subclasses this once with its record format, and mixes that
+    subclass into the backends below:
+    - USER_COLUMNS: the user's fields after the name, with their SQLite types
+    - ITEMS: record key of the log's item list; ITEM_TABLE, ITEM_POSITION and
+      ITEM_COLUMNS store those items in SQLite (items with one column are
+      plain values, the others lists)
+    - _record(user, log): the pair as a JSON-ready dict with a "user" name, the
+      USER_COLUMNS fields and the ITEMS list
+    - _restore(name, *fields, items): a record's values back to a (user, log) pair
+    """
+    USER_COLUMNS = {}
+    ITEMS = "items"
+    ITEM_TABLE = "items"
+    ITEM_POSITION = "position"
+    ITEM_COLUMNS = {}
+
+    def save(self, user, log):
+        raise NotImplementedError
+
+    def save_many(self, pairs):
+        """
+        Store many (user, log) pairs; returns how many were stored
+        """
+        count = 0
+        for user, log in pairs:
+            self.save(user, log)
+            count += 1
+        return count
+
+    def load(self, name):
+        raise NotImplementedError
+
+    def load_all(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _record(user, log):
+        raise NotImplementedError
+
+    @staticmethod
+    def _restore(name, *values):
+        raise NotImplementedError
+
+    def _restore_record(self, record):
+        return self._restore(record["user"], *(record[field] for field in self.USER_COLUMNS),
+                             record[self.ITEMS])
+
+
+class TextLogStorage(LogStorage):
+    """
+    One human readable <name><SUFFIX> file per user in a folder; the script's
+    subclass writes and parses the file in save() and load()
+    """
+    SUFFIX = ".txt"
+
+    def __init__(self, directory=""):
+        """
+        :param directory: Folder holding the text files (default: current folder)
+        """
+        self.directory = directory
+
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}{self.SUFFIX}")
+
+    def load_all(self):
+        for filename in sorted(os.listdir(self.directory or ".")):
+            if filename.endswith(self.SUFFIX):
+                yield self.load(filename[:-len(self.SUFFIX)])
+
+
+class JsonLinesLogStorage(LogStorage):
+    """
+    One JSON object per saved log, appended to a single file.
+    Saving a user again appends a newer record, which load() prefers.
+    load() reads the whole file, so use load_all() to read many users.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, user, log):
+        self.save_many([(user, log)])
+        return self.path
+
+    def save_many(self, pairs):
+        lines = [json.dumps(self._record(user, log)) + "\n" for user, log in pairs]
+        with open(self.path, "a") as f:
+            f.write("".join(lines))
+        return len(lines)
+
+    def _records(self):
+        if not os.path.exists(self.path):
+            return {}
+        records = {}
+        with open(self.path) as f:
+            for line in f:
+                record = json.loads(line)
+                records[record["user"]] = record
+        return records
+
+    def load(self, name):
+        return self._restore_record(self._records()[name])
+
+    def load_all(self):
+        for record in self._records().values():
+            yield self._restore_record(record)
+
+
+class SqliteLogStorage(LogStorage):
+    """
+    SQLite database of logs in WAL mode: a users table and an ITEM_TABLE of
+    log items. Every save_many() call is one transaction, and rows go through
+    executemany() so each statement is prepared once.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        user_columns = "".join(f", {name} {kind}" for name, kind in self.USER_COLUMNS.items())
+        item_columns = "".join(f", {name} {kind}" for name, kind in self.ITEM_COLUMNS.items())
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS users (name TEXT PRIMARY KEY{user_columns}) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS {self.ITEM_TABLE} (
+                user TEXT, {self.ITEM_POSITION} INTEGER{item_columns},
+                PRIMARY KEY (user, {self.ITEM_POSITION})) WITHOUT ROWID;
+        """)
+        marks = ", ".join("?" * (len(self.USER_COLUMNS) + 1))
+        self._insert_user = f"INSERT OR REPLACE INTO users VALUES ({marks})"
+        marks = ", ".join("?" * (len(self.ITEM_COLUMNS) + 2))
+        self._insert_item = f"INSERT INTO {self.ITEM_TABLE} VALUES ({marks})"
+
+    def save(self, user, log):
+        self.save_many([(user, log)])
+        return self.path
+
+    def save_many(self, pairs):
+        count = 0
+        latest = {}
+        for user, log in pairs:
+            # A user saved twice in one batch keeps the last record, as in the other backends
+            record = self._record(user, log)
+            latest[record["user"]] = record
+            count += 1
+        single = len(self.ITEM_COLUMNS) == 1
+        users = []
+        items = []
+        for name, record in latest.items():
+            users.append((name, *(record[field] for field in self.USER_COLUMNS)))
+            items.extend((name, position, item) if single else (name, position, *item)
+                         for position, item in enumerate(record[self.ITEMS]))
+        with self.connection:
+            self.connection.executemany(f"DELETE FROM {self.ITEM_TABLE} WHERE user = ?", [(name,) for name in latest])
+            self.connection.executemany(self._insert_user, users)
+            self.connection.executemany(self._insert_item, items)
+        return count
+
+    def load(self, name):
+        row = self.connection.execute(f"SELECT {self._select_user()} FROM users WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        rows = self.connection.execute(
+            f"SELECT {', '.join(self.ITEM_COLUMNS)} FROM {self.ITEM_TABLE} WHERE user = ? ORDER BY {self.ITEM_POSITION}",
+            (name,))
+        if len(self.ITEM_COLUMNS) == 1:
+            return self._restore(*row, [item for item, in rows])
+        return self._restore(*row, [list(item) for item in rows])
+
+    def load_all(self):
+        items = {}
+        single = len(self.ITEM_COLUMNS) == 1
+        for user, *item in self.connection.execute(
+                f"SELECT user, {', '.join(self.ITEM_COLUMNS)} FROM {self.ITEM_TABLE} ORDER BY user, {self.ITEM_POSITION}"):
+            items.setdefault(user, []).append(item[0] if single else item)
+        for row in self.connection.execute(f"SELECT {self._select_user()} FROM users ORDER BY name"):
+            yield self._restore(*row, items.get(row[0], []))
+
+    def close(self):
+        self.connection.close()
+
+    def _select_user(self):
+        return ", ".join(["name", *self.USER_COLUMNS])
@@ -0,0 +1,29 @@
+"""
+The projects are standalone scripts in their own folders, so the tests put
+those folders on sys.path before importing them.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIRS = [
+    "bulk_export",
+    "calorie_budget_planner",
+    "chart_cache",
+    "dietary_recommendation",
+    "instrumentation",
+    "Hydration Tracker",
+    "nutrition_service",
+    "nutrition_visualizer",
+    "population_screening",
+    "population_stats",
+    "shared",
+]
+
+for _project in PROJECT_DIRS:
+    _path = os.path.join(ROOT, _project)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# Charts are rendered headlessly
+os.environ.setdefault("MPLBACKEND", "Agg")
@@ -0,0 +1,52 @@
+import json
+
+import batch_mode
+import calorie_budget_planner
+import nutrition_visualizer
+
+PEOPLE = [
+    {"age": "30", "gender": "female", "weight": "60", "height": "165", "vegetables": "5", "fruits": "2",
+     "grains": "6", "meats": "2.5", "dairy": "2.5"},
+    {"age": "40", "gender": "male", "weight": "80", "height": "abc"},
+    {"age": "", "gender": "male", "weight": "90", "height": "180"},
+]
+
+
+def test_bad_records_become_error_results():
+    results = list(batch_mode.batch_results(iter(PEOPLE), nutrition_visualizer.process_record))
+    assert results[0]["bmi"] == 22.04
+    assert results[1] == {"error": "could not convert string to float: 'abc'", "record": PEOPLE[1]}
+    assert results[2]["bmi_category"] == "Overweight"
+
+
+def test_worker_processes_keep_input_order():
+    records = [dict(PEOPLE[0], weight=str(40 + i)) for i in range(50)] + PEOPLE
+    serial = list(batch_mode.batch_results(iter(records), nutrition_visualizer.process_record))
+    parallel = list(batch_mode.batch_results(iter(records), nutrition_visualizer.process_record,
+                                             jobs=2, chunk_size=7))
+    assert parallel == serial
+
+
+def test_run_batch_groups_csv_rows(tmp_path, capsys):
+    path = tmp_path / "meals.csv"
+    path.write_text("user,daily_goal,food,calories,protein,carbs,fats\n"
+                    "ann,2000,Apple,,,,\nann,2000,cake,500,5,60,20\nbob,1800,Bagel,,,,\n")
+    calorie_budget_planner.run_batch([str(path)])
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["user"], r["total_calories"]) for r in results] == [("ann", 595.0), ("bob", 270.0)]
+
+
+def test_zero_height_is_a_row_error():
+    records = [dict(PEOPLE[0], height="0"), PEOPLE[0]]
+    results = list(batch_mode.batch_results(iter(records), nutrition_visualizer.process_record))
+    assert results[0] == {"error": "weight and height must be greater than zero.", "record": records[0]}
+    assert results[1]["bmi"] == 22.04
+
+
+def test_arithmetic_errors_become_row_errors():
+    results = list(batch_mode.batch_results(iter([{"n": 0}, {"n": 4}]), _reciprocal))
+    assert results == [{"error": "division by zero", "record": {"n": 0}}, 0.25]
+
+
+def _reciprocal(record):
+    return 1 / record["n"]
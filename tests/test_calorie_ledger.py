@@ -0,0 +1,41 @@
+import datetime
+
+from calorie_budget_planner import CalorieLedger, FoodItem, User
+
+JANUARY = datetime.date(2024, 1, 1)
+
+
+def _ledger(days):
+    ledger = CalorieLedger(User("ann", 2000), JANUARY)
+    for offset in range(days):
+        ledger.add_food(JANUARY + datetime.timedelta(days=offset), FoodItem("meal", 1800 + offset, 90, 200, 60))
+    return ledger
+
+
+def test_len_is_the_last_recorded_day():
+    assert len(CalorieLedger(User("ann", 2000), JANUARY)) == 0
+    ledger = _ledger(31)
+    assert len(ledger) == 31
+    # Opening a day without recording it does not extend the ledger
+    ledger.day(datetime.date(2024, 3, 1))
+    assert len(ledger) == 31
+
+
+def test_monthly_rollup_has_no_phantom_month():
+    rollup = _ledger(31).monthly_rollup()
+    assert [month for month, _ in rollup] == [(2024, 1)]
+    assert rollup[0][1]["calories"] == sum(1800 + offset for offset in range(31))
+
+
+def test_weekly_rollup_ends_at_the_last_recorded_week():
+    rollup = _ledger(31).weekly_rollup()
+    assert rollup[0][0] == datetime.date(2024, 1, 1)
+    assert rollup[-1][0] == datetime.date(2024, 1, 29)
+    assert sum(totals["calories"] for _, totals in rollup) == sum(1800 + offset for offset in range(31))
+
+
+def test_backdated_edits_update_rollups():
+    ledger = _ledger(10)
+    ledger.update_food(JANUARY, 0, FoodItem("meal", 1000, 50, 100, 30))
+    assert ledger.day_totals(JANUARY)["calories"] == 1000
+    assert ledger.monthly_rollup()[0][1]["calories"] == 1000 + sum(1800 + offset for offset in range(1, 10))
@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+import nutrition_visualizer
+from chart_cache import ChartCache, chart_key
+
+
+def _digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_overwriting_an_output_leaves_the_cache_entry_unchanged(tmp_path):
+    cache = ChartCache(str(tmp_path / "cache"))
+    strategy = nutrition_visualizer.BMIChartStrategy()
+    output = str(tmp_path / "out.png")
+    cached = os.path.join(cache.directory, f"{chart_key(strategy, (22.5,), 'png')}.png")
+
+    cache.fetch(strategy, (22.5,), path=output)
+    cache.fetch(strategy, (22.5,), path=output)
+    before = _digest(cached)
+    assert _digest(output) == before
+    assert not os.path.samefile(output, cached)
+
+    # An uncached render with different data to the same path
+    strategy.render(31.0, path=output)
+    assert _digest(cached) == before
+    assert _digest(output) != before
+
+    cache.fetch(strategy, (22.5,), path=output)
+    assert _digest(output) == before
+    assert cache.stats()["hits"] == 2
+
+
+def test_equal_inputs_share_a_key():
+    strategy = nutrition_visualizer.BarChartStrategy()
+    recommended = nutrition_visualizer.FoodIntake.RECOMMENDATION
+    a = {"vegetables": 5, "fruits": 2}
+    b = {"fruits": 2.0, "vegetables": 5.0}
+    assert chart_key(strategy, (a, recommended), "png") == chart_key(strategy, (b, recommended), "png")
+    assert chart_key(strategy, (a, recommended), "png") != chart_key(strategy, (a, recommended), "svg")
+
+
+def test_eviction_keeps_the_cache_within_max_bytes(tmp_path):
+    cache = ChartCache(str(tmp_path / "cache"), max_bytes=60_000)
+    strategy = nutrition_visualizer.BMIChartStrategy()
+    for bmi in range(20, 30):
+        cache.fetch(strategy, (float(bmi),))
+    stats = cache.stats()
+    assert stats["bytes"] <= 60_000 or stats["entries"] == 1
+    assert stats["evictions"] > 0
+    assert stats["bytes"] == sum(entry.stat().st_size for entry in os.scandir(cache.directory))
+
+
+def test_cached_and_placed_files_follow_the_umask(tmp_path):
+    previous = os.umask(0o027)
+    try:
+        cache = ChartCache(str(tmp_path / "cache"))
+        output = str(tmp_path / "out.png")
+        cache.fetch(nutrition_visualizer.BMIChartStrategy(), (22.5,), path=output)
+    finally:
+        os.umask(previous)
+    assert [entry.stat().st_mode & 0o777 for entry in os.scandir(cache.directory)] == [0o640]
+    assert os.stat(output).st_mode & 0o777 == 0o640
+    assert sorted(os.listdir(tmp_path)) == ["cache", "out.png"]
@@ -0,0 +1,105 @@
+import io
+import itertools
+import math
+
+from dietary_recommendation import FOOD_GROUP_COLUMNS, DietaryRecommendation, User
+
+AGES = [*range(0, 101), 2.5, 3.5, 8.5, 11.5, 13.5, 18.5, 18.999, 50.5, 70.5]
+GENDERS = ["male", "female", "Male", "FEMALE", "other", None]
+CHILD_GENDERS = ["boy", "girl", None]
+FLAGS = [False, True]
+
+
+def decision_tree(user):
+    # get_recommendations as it was before RECOMMENDATION_TABLE, kept as the reference
+    recommendations = {}
+    if user.age >= 19:
+        if user.gender == "male":
+            recommendations = {'Vegetables': 6, 'Fruits': 2, 'Grains': 6, 'Meat': 3, 'Diary': 2.5}
+        if user.age > 50:
+            recommendations['Vegetables'] = 5.5
+            recommendations['Meat'] = 2.5
+            if user.age > 70:
+                recommendations['Vegetables'] = 5
+                recommendations['Grains'] = 4.5
+                recommendations['Dairy'] = 3.5
+
+        elif user.gender == "female":
+            recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 6, 'Meat': 2.5, 'Dairy': 2.5}
+            if user.age > 50:
+                recommendations['Grains'] = 4
+                recommendations['Meat'] = 2
+                recommendations['Dairy'] = 4
+                if user.age > 70:
+                    recommendations['Grains'] = 3
+
+            if user.pregnant:
+                recommendations['Grains'] = 8.5
+                recommendations['Meat'] = 3.5
+            if user.breastfeeding:
+                recommendations['Vegetables'] = 7.5
+                recommendations['Grains'] = 9
+    elif user.child_gender == 'boy':
+        if user.age <= 3:
+            recommendations = {'Vegetables': 2.5, 'Fruits': 1, 'Grains': 4, 'Meat': 1, 'Dairy': 1.5}
+        elif user.age <= 8:
+            recommendations = {'Vegetables': 4.5, 'Fruits': 1.5, 'Grains': 4, 'Meat': 1.5, 'Dairy': 2}
+        elif user.age <= 11:
+            recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 5, 'Meat': 2.5, 'Dairy': 2.5}
+        elif user.age <= 13:
+            recommendations = {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 6, 'Meat': 2.5, 'Dairy': 3.5}
+        else:
+            recommendations = {'Vegetables': 5.5, 'Fruits': 2, 'Grains': 7, 'Meat': 2.5, 'Dairy': 3.5}
+    else:
+        if user.age <= 3:
+            recommendations = {'Vegetables': 2.5, 'Fruits': 1, 'Grains': 4, 'Meat': 1, 'Dairy': 1.5}
+        elif user.age <= 8:
+            recommendations = {'Vegetables': 4.5, 'Fruits': 1.5, 'Grains': 4, 'Meat': 1.5, 'Dairy': 1.5}
+        elif user.age <= 11:
+            recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 4, 'Meat': 2.5, 'Dairy': 3}
+        elif user.age <= 13:
+            recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 5, 'Meat': 2.5, 'Dairy': 3.5}
+        else:
+            recommendations = {'Vegetables': 5, 'Fruits': 2, 'Grains': 7, 'Meat': 2.5, 'Dairy': 3.5}
+    return recommendations
+
+
+def _profiles():
+    return list(itertools.product(AGES, GENDERS, CHILD_GENDERS, FLAGS, FLAGS))
+
+
+def _row(recommendations):
+    return [recommendations.get(group, math.nan) for group in FOOD_GROUP_COLUMNS]
+
+
+def _same_rows(a, b):
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a, b))
+
+
+def test_table_matches_the_decision_tree_for_every_profile():
+    mismatches = []
+    for profile in _profiles():
+        user = User(*profile)
+        if dict(DietaryRecommendation(user).recommendations) != decision_tree(user):
+            mismatches.append(profile)
+    assert mismatches == []
+
+
+def test_batch_matches_the_decision_tree_for_every_profile():
+    profiles = _profiles()
+    age, gender, child_gender, pregnant, breastfeeding = (list(column) for column in zip(*profiles))
+    matrix = DietaryRecommendation.batch_recommendations(age, gender, child_gender, pregnant, breastfeeding)
+    mismatches = [profile for profile, row in zip(profiles, matrix.tolist())
+                  if not _same_rows(row, _row(decision_tree(User(*profile))))]
+    assert mismatches == []
+
+
+def test_batch_csv_matches_the_decision_tree():
+    profiles = [profile for profile in _profiles() if profile[0] in (2, 10, 18.5, 30, 60, 80)]
+    lines = ["age,gender,child_gender,pregnant,breastfeeding"]
+    for age, gender, child_gender, pregnant, breastfeeding in profiles:
+        lines.append(f"{age},{gender or ''},{child_gender or ''},{'yes' if pregnant else 'no'},"
+                     f"{'yes' if breastfeeding else 'no'}")
+    matrix = DietaryRecommendation.batch_recommendations_csv(io.StringIO("\n".join(lines)))
+    for profile, row in zip(profiles, matrix.tolist()):
+        assert _same_rows(row, _row(decision_tree(User(*profile))))
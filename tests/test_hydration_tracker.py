@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+
+import Hydration_Tracker
+from Hydration_Tracker import StoredWaterIntake, WaterIntake, WaterLogStore
+
+
+def test_totals_follow_edits():
+    days = [1.0, 2.0, 3.0]
+    water = WaterIntake(days, recommended=2.5)
+    assert water.total_intake() == 6.0
+
+    # The caller's list is copied, so changing it later has no effect
+    days[0] = 10.0
+    assert water.total_intake() == 6.0
+
+    assert water.update_day(0, 10.0) == 1.0
+    assert water.total_intake() == 15.0
+    assert water.days_below() == 1
+
+    assert water.remove_day() == 3.0
+    assert water.total_intake() == 12.0
+    assert water.average_intake() == 6.0
+    assert water.daily_intake == (10.0, 2.0)
+
+    water.add_day(1.5)
+    assert water.range_total(1) == 3.5
+    assert water.days_below() == 2
+    assert water.cumulative_series().tolist() == [10.0, 12.0, 13.5]
+
+
+def test_edits_match_a_fresh_tracker():
+    water = WaterIntake([2.1, 1.8, 2.6, 2.4, 1.9, 2.2, 2.0], recommended=2.0)
+    water.total_intake()
+    water.update_day(-3, 0.5)
+    water.remove_day(1)
+    water.add_day(3.0)
+    fresh = WaterIntake(list(water.daily_intake), recommended=2.0)
+    assert water.total_intake() == fresh.total_intake()
+    assert water.rolling_averages() == fresh.rolling_averages()
+    assert water.days_below() == fresh.days_below()
+    assert water.rolling_average_series(3).tolist() == fresh.rolling_average_series(3).tolist()
+
+
+def test_stored_water_intake_add_day(tmp_path):
+    store = WaterLogStore(str(tmp_path / "alice_water_log.bin"))
+    store.extend([(datetime.date(2024, 1, 1), 2.0), (datetime.date(2024, 1, 2), 1.5)])
+    water = StoredWaterIntake(store, recommended=1.8)
+    assert water.range_total(0) == 3.5
+
+    water.add_day(2.5)
+    water.add_day(1.0, datetime.date(2024, 1, 10))
+    assert water.daily_intake.tolist() == [2.0, 1.5, 2.5, 1.0]
+    assert water.range_total(0) == 7.0
+    assert water.days_below() == 2
+    assert water.total_intake(start=datetime.date(2024, 1, 3)) == 3.5
+    assert datetime.date.fromordinal(int(store.records()["day"][2])) == datetime.date(2024, 1, 3)
+    assert store.last_day == datetime.date(2024, 1, 10)
+    assert WaterLogStore(store.path).last_day == datetime.date(2024, 1, 10)
+    assert WaterLogStore(str(tmp_path / "empty.bin")).last_day is None
+
+    with pytest.raises(TypeError, match="append-only"):
+        water.remove_day()
+    with pytest.raises(TypeError, match="append-only"):
+        water.update_day(0, 3.0)
+    assert water.daily_intake.tolist() == [2.0, 1.5, 2.5, 1.0]
+    store.close()
+
+
+def test_recommended_water_intake_unchanged():
+    assert Hydration_Tracker.User("bob", 70, "Medium").recommended_water_intake() == 2.95
@@ -0,0 +1,47 @@
+import pytest
+
+import Hydration_Tracker
+import instrumentation
+import nutrition_visualizer
+from calorie_budget_planner import ColumnarMealTracker, FoodItem
+
+
+@pytest.fixture
+def registry():
+    registry = instrumentation.Registry()
+    instrumentation.enable(registry)
+    yield registry
+    instrumentation.disable()
+
+
+def test_headless_paths_are_timed(registry, tmp_path, capsys):
+    strategy = nutrition_visualizer.BMIChartStrategy()
+    assert strategy.render(22.5)[:4] == b"\x89PNG"
+    strategy.export(22.5, basename=str(tmp_path / "bmi"), formats=("png", "svg"))
+    nutrition_visualizer.export_report(nutrition_visualizer.User(30, "female", 60, 165),
+                                       nutrition_visualizer.FoodIntake(5, 2, 6, 2.5, 2.5), str(tmp_path),
+                                       charts=("bar_chart",), formats=("png",))
+    assert len(strategy.render_many([18.0, 24.0, 31.0])) == 3
+    Hydration_Tracker.BarChartStrategy().render([2.0, 2.5, 1.5, 3.0, 2.0, 2.2, 2.8], 2.5)
+
+    meal_tracker = ColumnarMealTracker()
+    meal_tracker.add_food(FoodItem("oats", 380, 13, 67, 7))
+    assert meal_tracker.summary() == 380
+    capsys.readouterr()
+
+    counters = registry.to_dict()["counters"]
+    assert counters["nutrition_render_calls"] == 1
+    assert counters["nutrition_export_calls"] == 2
+    assert counters["nutrition_render_many_calls"] == 1
+    assert counters["hydration_render_calls"] == 1
+    assert counters["columnar_meal_tracker_summary_calls"] == 1
+
+
+def test_disable_puts_the_originals_back(registry):
+    assert instrumentation.enabled()
+    assert hasattr(nutrition_visualizer.ChartStrategy.render, "__instrumented__")
+    instrumentation.disable()
+    assert not instrumentation.enabled()
+    for module_name, class_name, method_name, _ in instrumentation.TARGETS:
+        cls = getattr(__import__(module_name), class_name)
+        assert not hasattr(cls.__dict__[method_name], "__instrumented__")
@@ -0,0 +1,61 @@
+import pytest
+
+import calorie_budget_planner
+import Hydration_Tracker
+
+
+def _backend(module, name, tmp_path):
+    if name == "text":
+        return module.TextLogStorage(str(tmp_path))
+    return module.STORAGE_BACKENDS[name](str(tmp_path / f"logs.{name}"))
+
+
+def _meals(*foods):
+    meal_tracker = calorie_budget_planner.MealTracker()
+    for food in foods:
+        meal_tracker.add_food(calorie_budget_planner.FoodItem(*food))
+    return meal_tracker
+
+
+def _calorie_days(storage):
+    return {user.name: (user.daily_goal, [(f.name, f.calories, f.protein, f.carbs, f.fats)
+                                          for f in meal_tracker.food_items])
+            for user, meal_tracker in storage.load_all()}
+
+
+def _water_days(storage):
+    return {user.name: (user.weight, user.activity_level, list(water.daily_intake))
+            for user, water in storage.load_all()}
+
+
+@pytest.mark.parametrize("backend", ["text", "jsonl", "sqlite"])
+def test_calorie_batch_with_a_repeated_user_keeps_the_last_record(tmp_path, backend):
+    User = calorie_budget_planner.User
+    batch = [
+        (User("ann", 2000), _meals(("Apple", 95, 0.5, 25, 0.3), ("Bagel", 270, 10.5, 53, 1.7))),
+        (User("bob", 1800), _meals(("Egg", 78, 6, 0.6, 5))),
+        (User("ann", 2100), _meals(("Pizza", 285, 12, 36, 10))),
+    ]
+    with _backend(calorie_budget_planner, backend, tmp_path) as storage:
+        assert storage.save_many(batch) == 3
+        assert _calorie_days(storage) == {
+            "ann": (2100, [("Pizza", 285, 12, 36, 10)]),
+            "bob": (1800, [("Egg", 78, 6, 0.6, 5)]),
+        }
+
+
+@pytest.mark.parametrize("backend", ["text", "jsonl", "sqlite"])
+def test_water_batch_with_a_repeated_user_keeps_the_last_record(tmp_path, backend):
+    User = Hydration_Tracker.User
+    WaterIntake = Hydration_Tracker.WaterIntake
+    batch = [
+        (User("ann", 60, "low"), WaterIntake([2.0, 1.5, 2.5])),
+        (User("bob", 80, "high"), WaterIntake([3.0])),
+        (User("ann", 61, "medium"), WaterIntake([1.0, 2.0])),
+    ]
+    with _backend(Hydration_Tracker, backend, tmp_path) as storage:
+        assert storage.save_many(batch) == 3
+        assert _water_days(storage) == {
+            "ann": (61, "medium", [1.0, 2.0]),
+            "bob": (80, "high", [3.0]),
+        }
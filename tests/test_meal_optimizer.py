@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from calorie_budget_planner import FoodDatabase, FoodItem, FoodItemBatch, MealTracker, User
+from meal_optimizer import MealOptimizer
+
+SLACK = 1e-6
+
+
+def _catalog(size, seed):
+    rng = np.random.default_rng(seed)
+    batch = FoodItemBatch.empty(size)
+    batch.records["name"] = [f"food{i}" for i in range(size)]
+    batch.records["calories"] = rng.gamma(2.0, 120.0, size).round(0)
+    batch.records["protein"] = rng.gamma(1.5, 6.0, size).round(1)
+    batch.records["carbs"] = rng.gamma(1.5, 12.0, size).round(1)
+    batch.records["fats"] = rng.gamma(1.2, 5.0, size).round(1)
+    return batch
+
+
+def _targets(count, seed):
+    rng = np.random.default_rng(seed)
+    for calories in rng.uniform(50, 2200, count).tolist():
+        protein, carbs, fats = (calories * share / unit for share, unit in
+                                zip(rng.dirichlet([3, 5, 2]).tolist(), (4, 4, 9)))
+        # Each macro target is sometimes left free
+        yield [calories, *(None if rng.random() < 0.3 else target for target in (protein, carbs, fats))]
+
+
+@pytest.mark.parametrize("iterations, time_limit", [(0, None), (20, None), (20, 0.0)])
+def test_suggestions_never_go_over_any_target(iterations, time_limit):
+    optimizer = MealOptimizer(_catalog(2_000, 0))
+    for targets in _targets(200, 1):
+        meal = optimizer.suggest(*targets, iterations=iterations, time_limit=time_limit)
+        totals = [meal.total_calories(), *meal.total_macros()]
+        for total, target in zip(totals, targets):
+            assert target is None or total <= target + SLACK
+        assert len(meal.food_items) <= 5
+        assert len({item.name for item in meal.food_items}) == len(meal.food_items)
+
+
+def test_suggestions_come_close_to_the_calories():
+    optimizer = MealOptimizer(_catalog(5_000, 2))
+    for calories in (300, 800, 1500):
+        meal = optimizer.suggest(calories)
+        assert calories * 0.98 <= meal.total_calories() <= calories
+
+
+def test_macro_target_decides_between_foods():
+    foods = [FoodItem("rice", 400, 8, 88, 1), FoodItem("chicken", 400, 75, 0, 9), FoodItem("butter", 400, 0, 0, 44)]
+    optimizer = MealOptimizer(foods)
+    assert [item.name for item in optimizer.suggest(400, protein=75).food_items] == ["chicken"]
+    assert [item.name for item in optimizer.suggest(400, carbs=90).food_items] == ["rice"]
+    # Every food goes over a 0.5 g fat cap
+    assert optimizer.suggest(400, fats=0.5).food_items == []
+
+
+def test_suggest_for_subtracts_what_was_eaten():
+    database = FoodDatabase()
+    database.add_foods({"name": item.name, "calories": item.calories, "protein": item.protein,
+                        "carbs": item.carbs, "fats": item.fats} for item in _catalog(500, 3))
+    optimizer = MealOptimizer(database)
+    assert len(optimizer) == 500
+
+    user = User("ann", 2000)
+    meal_tracker = MealTracker()
+    meal_tracker.add_food(FoodItem("breakfast", 1200, 40, 150, 30))
+    suggestion = optimizer.suggest_for(user, meal_tracker, protein=90, fats=60)
+    assert suggestion.food_items
+    assert suggestion.total_calories() <= 800 + SLACK
+    protein, _, fats = suggestion.total_macros()
+    assert protein <= 50 + SLACK and fats <= 30 + SLACK
+
+    meal_tracker.add_food(FoodItem("dinner", 900, 50, 80, 40))
+    assert optimizer.suggest_for(user, meal_tracker).food_items == []
+
+
+def test_unusable_foods_are_never_suggested():
+    foods = [FoodItem("broken", float("nan"), 1, 1, 1), FoodItem("negative", -300, 0, 0, 0),
+             FoodItem("apple", 95, 0.5, 25, 0.3)]
+    optimizer = MealOptimizer(foods)
+    assert len(optimizer) == 1
+    assert [item.name for item in optimizer.suggest(200).food_items] == ["apple"]
+    assert MealOptimizer([]).suggest(500).food_items == []
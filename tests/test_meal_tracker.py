@@ -0,0 +1,91 @@
+import math
+
+import pytest
+
+from calorie_budget_planner import FoodItem, MealTracker, RunningTotal
+
+FOODS = [FoodItem("oats", 380, 13, 67, 7), FoodItem("egg", 155, 13, 1.1, 11),
+         FoodItem("apple", 95, 0.5, 25, 0.3), FoodItem("rice", 206, 4.3, 45, 0.4)]
+
+
+def _totals(items):
+    return [math.fsum(getattr(item, field) for item in items) for field in ("calories", "protein", "carbs", "fats")]
+
+
+def _tracker(items):
+    meal_tracker = MealTracker()
+    for item in items:
+        meal_tracker.add_food(item)
+    return meal_tracker
+
+
+def _assert_totals(meal_tracker, items):
+    # Compensated sums are within an ulp of the correctly rounded ones, however many items there are
+    for total, exact in zip([meal_tracker.total_calories(), *meal_tracker.total_macros()], _totals(items)):
+        assert abs(total - exact) <= math.ulp(exact)
+
+
+def test_running_total_does_not_drift():
+    total = RunningTotal()
+    for _ in range(100_000):
+        total.add(0.1)
+    assert total.value == math.fsum([0.1] * 100_000)
+    assert sum([0.1] * 100_000) != total.value
+
+
+def test_running_total_recovers_small_values_after_a_huge_one():
+    values = [1e16, *[0.1] * 1_000, -1e16]
+    total = RunningTotal()
+    for value in values:
+        total.add(value)
+    # A plain sum loses every 0.1 added to 1e16
+    assert sum(values) == 0
+    assert abs(total.value - math.fsum(values)) <= math.ulp(100)
+
+
+def test_totals_follow_remove_food():
+    meal_tracker = _tracker(FOODS)
+    assert meal_tracker.remove_food(1) is FOODS[1]
+    _assert_totals(meal_tracker, [FOODS[0], FOODS[2], FOODS[3]])
+    assert meal_tracker.remove_food(-1) is FOODS[3]
+    _assert_totals(meal_tracker, [FOODS[0], FOODS[2]])
+    meal_tracker.remove_food(0)
+    meal_tracker.remove_food(0)
+    assert meal_tracker.food_items == []
+    _assert_totals(meal_tracker, [])
+    with pytest.raises(IndexError):
+        meal_tracker.remove_food(0)
+
+
+def test_totals_follow_update_food():
+    meal_tracker = _tracker(FOODS)
+    banana = FoodItem("banana", 105, 1.3, 27, 0.4)
+    assert meal_tracker.update_food(2, banana) is FOODS[2]
+    items = [FOODS[0], FOODS[1], banana, FOODS[3]]
+    assert meal_tracker.food_items == items
+    _assert_totals(meal_tracker, items)
+    # A failed update leaves the items and totals alone
+    with pytest.raises(IndexError):
+        meal_tracker.update_food(10, FOODS[0])
+    _assert_totals(meal_tracker, items)
+
+
+def test_totals_stay_accurate_through_a_huge_item():
+    small = [FoodItem("tea", 0.1, 0.1, 0.1, 0.1)] * 1_000
+    huge = FoodItem("typo", 1e16, 1e16, 1e16, 1e16)
+    meal_tracker = _tracker([huge, *small])
+    _assert_totals(meal_tracker, [huge, *small])
+
+    # Removing the huge item gives back the small items' totals, though each 0.1 was added to 1e16
+    meal_tracker.remove_food(0)
+    _assert_totals(meal_tracker, small)
+
+    # So does replacing it
+    meal_tracker = _tracker([huge, *small])
+    meal_tracker.update_food(0, small[0])
+    _assert_totals(meal_tracker, [small[0], *small])
+
+
+def test_many_small_items_match_fsum():
+    meal_tracker = _tracker([FoodItem("tea", 0.1, 0.1, 0.1, 0.1)] * 100_000)
+    assert [meal_tracker.total_calories(), *meal_tracker.total_macros()] == [math.fsum([0.1] * 100_000)] * 4
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from nutrition_service import ROOT, NutritionService
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = NutritionService(chart_workers=1)
+    yield service
+    service.close()
+
+
+def _dispatch(service, method, path, body):
+    status, _, payload = asyncio.run(service.dispatch(method, path, json.dumps(body).encode()))
+    return status, json.loads(payload)
+
+
+@pytest.mark.parametrize("body", [
+    {"weight": 70, "height": 0},
+    {"weight": 0, "height": 170},
+    {"weight": -70, "height": 170},
+    {"weight": "heavy", "height": 170},
+])
+def test_bmi_rejects_invalid_measurements(service, body):
+    status, result = _dispatch(service, "POST", "/bmi", body)
+    assert status == 400
+    assert "error" in result
+
+
+def test_unexpected_errors_answer_500(service, monkeypatch):
+    def broken(body):
+        raise ZeroDivisionError("boom")
+
+    monkeypatch.setitem(service.routes, ("GET", "/health"), broken)
+    status, result = _dispatch(service, "GET", "/health", {})
+    assert status == 500
+    assert result == {"error": "Internal server error."}
+
+
+def _raw_request(service, request):
+    async def exchange():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return response
+
+    return asyncio.run(exchange())
+
+
+@pytest.mark.parametrize("length", ["-5", "abc", "1.5", "²"])
+def test_invalid_content_length_answers_400(service, length):
+    request = f"POST /bmi HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1")
+    response = _raw_request(service, request)
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+def test_zero_height_over_http_answers_400(service):
+    body = b'{"weight": 70, "height": 0}'
+    request = b"POST /bmi HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+    assert _raw_request(service, request).startswith(b"HTTP/1.1 400 ")
+
+
+def test_oversized_body_answers_413(service):
+    request = b"POST /bmi HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n"
+    assert _raw_request(service, request).startswith(b"HTTP/1.1 413 ")
+
+
+@pytest.mark.parametrize("value, pregnant", [
+    (True, True), (False, False), (None, False), ("yes", True), ("no", False),
+    ("false", False), ("0", False), ("TRUE", True), (1, True), (0, False),
+])
+def test_pregnant_flag(service, value, pregnant):
+    body = {"age": 30, "gender": "female", "pregnant": value}
+    status, result = _dispatch(service, "POST", "/recommendations", body)
+    assert status == 200
+    expected = 8.5 if pregnant else 6
+    assert result["recommendations"]["Grains"] == expected
+
+
+@pytest.mark.parametrize("value", ["maybe", "", 2, 1.0, [True], {"a": 1}])
+def test_invalid_flags_answer_400(service, value):
+    status, result = _dispatch(service, "POST", "/recommendations",
+                               {"age": 30, "gender": "female", "breastfeeding": value})
+    assert status == 400
+    assert result == {"error": "'breastfeeding' must be true or false."}
+
+
+@pytest.mark.parametrize("path, body, message", [
+    ("/recommendations", {"age": 30, "gender": 5}, "'gender' must be a string."),
+    ("/recommendations", {"age": 10, "child_gender": ["boy"]}, "'child_gender' must be a string."),
+    ("/water", {"weight": 70, "activity_level": 3}, "'activity_level' must be a string."),
+    ("/meals/totals", {"daily_goal": 2000, "foods": [5]}, "Each food must be a food name or an object."),
+    ("/meals/totals", {"daily_goal": 2000, "foods": {"name": "oats"}}, "'foods' must be a list."),
+    ("/meals/totals", {"daily_goal": 2000, "foods": [{"name": 1, "calories": 1, "protein": 1, "carbs": 1,
+                                                      "fats": 1}]}, "'name' must be a string."),
+])
+def test_fields_of_the_wrong_type_answer_400(service, path, body, message):
+    assert _dispatch(service, "POST", path, body) == (400, {"error": message})
+
+
+def test_child_gender_is_case_insensitive(service):
+    status, boy = _dispatch(service, "POST", "/recommendations", {"age": 10, "child_gender": "Boy"})
+    assert status == 200
+    assert boy == _dispatch(service, "POST", "/recommendations", {"age": 10, "child_gender": "boy"})[1]
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def _alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="needs /proc")
+def test_sigterm_shuts_down_the_chart_workers():
+    service = subprocess.Popen([sys.executable, os.path.join(ROOT, "nutrition_service", "nutrition_service.py"),
+                                "--port", "0", "--chart-workers", "1"], stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(service.stdout.readline().rsplit(":", 1)[1])
+        body = b'{"args": [23.4]}'
+        with socket.create_connection(("127.0.0.1", port), timeout=30) as connection:
+            connection.sendall(b"POST /charts/bmi HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s"
+                               % (len(body), body))
+            assert connection.makefile("rb").readline().startswith(b"HTTP/1.1 200 ")
+        workers = _children(service.pid)
+        assert workers
+        service.terminate()
+        assert service.wait(timeout=30) == 0
+        deadline = time.monotonic() + 10
+        while any(_alive(pid) for pid in workers) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not any(_alive(pid) for pid in workers)
+    finally:
+        service.kill()
+        service.wait()
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+import Hydration_Tracker
+import nutrition_visualizer
+from exact_rounding import round_like_python
+from population_screening import screen
+
+
+def _neighbours(values):
+    # Each value with the floats just below and above it
+    values = np.asarray(values, dtype=np.float64)
+    return np.concatenate([np.nextafter(values, -np.inf), values, np.nextafter(values, np.inf)])
+
+
+TIES = _neighbours([0.005, 0.015, 0.125, 1.005, 2.675, 24.895, 29.905, 1e15 + 0.125,
+                    -0.005, -2.675, -1.005])
+EDGES = np.array([0.0, -0.0, 0.001, -0.001, 0.004999, 5e-324, -5e-324, 1e-300,
+                  2.0 ** 52 - 0.5, 2.0 ** 52, 2.0 ** 53 + 2, 1e300, 1e307, -1e307,
+                  1.7976931348623157e308, -1.7976931348623157e308, math.inf, -math.inf])
+
+
+def _same(a, b):
+    return a == b and math.copysign(1, a) == math.copysign(1, b) or (math.isnan(a) and math.isnan(b))
+
+
+@pytest.mark.parametrize("ndigits", [0, 1, 2, 3])
+def test_round_like_python_matches_round(ndigits):
+    values = np.concatenate([TIES, EDGES, [math.nan], np.random.default_rng(0).uniform(-1e4, 1e4, 10_000)])
+    with np.errstate(all="raise"):
+        rounded = round_like_python(values, ndigits)
+    mismatches = [(value, got) for value, got in zip(values.tolist(), rounded.tolist())
+                  if not _same(got, round(value, ndigits))]
+    assert mismatches == []
+
+
+def test_bmi_matches_the_scalar_method_at_category_boundaries():
+    heights = np.repeat(np.arange(140.0, 211.0, 0.5), 2)
+    weights = []
+    for threshold in nutrition_visualizer.BMIChartStrategy.THRESHOLDS:
+        # Weights giving a BMI at, and within a rounding step of, each boundary
+        for offset in (-0.005, 0.0, 0.005):
+            weights.append(_neighbours((threshold + offset) * (heights / 100) ** 2))
+    weights = np.concatenate(weights)
+    heights = np.tile(heights, len(weights) // len(heights))
+    weights = np.concatenate([weights, [0.0, 1e6, 1e300]])
+    heights = np.concatenate([heights, [170.0, 1.0, 1e-5]])
+
+    with np.errstate(over="ignore"):
+        bmi = nutrition_visualizer.User.calculate_bmi_array(weights, heights)
+    categories = nutrition_visualizer.bmi_category_array(bmi)
+    for weight, height, value, category in zip(weights.tolist(), heights.tolist(), bmi.tolist(), categories):
+        user = nutrition_visualizer.User(30, "female", weight, height)
+        assert _same(value, user.calculate_bmi())
+        assert category == user.bmi_category()
+
+
+def test_water_intake_matches_the_scalar_method():
+    weights = np.concatenate([_neighbours(np.arange(0, 20001) / 3.5), [0.0, 1e15, 1e300]])
+    levels = np.array(["low", "Medium", "high", "HIGH", "none"])[np.arange(len(weights)) % 5]
+    liters = Hydration_Tracker.User.recommended_water_intake_array(weights, levels)
+    for weight, level, value in zip(weights.tolist(), levels.tolist(), liters.tolist()):
+        assert _same(value, Hydration_Tracker.User("ann", weight, level).recommended_water_intake())
+
+
+def test_screen_matches_the_scalar_methods():
+    weights = [0.0, 45.0, 70.125, 1e6]
+    heights = [160.0, 173.2, 180.0, 1.0]
+    levels = ["low", "medium", "high", "low"]
+    results = screen(weights, heights, levels)
+    for i, (weight, height, level) in enumerate(zip(weights, heights, levels)):
+        user = nutrition_visualizer.User(30, "male", weight, height)
+        assert results["bmi"][i] == user.calculate_bmi()
+        assert results["bmi_category"][i] == user.bmi_category()
+        assert results["recommended_liters"][i] == Hydration_Tracker.User("ann", weight, level).recommended_water_intake()
@@ -0,0 +1,107 @@
+import math
+import pickle
+
+import numpy as np
+import pytest
+
+from calorie_budget_planner import FoodItem, MealTracker, User
+from population_stats import PopulationStats, RunningMoments, TDigest
+
+
+def _streams():
+    rng = np.random.default_rng(0)
+    return {
+        "gamma": rng.gamma(9, 230, 200_000),
+        "lognormal": rng.lognormal(5.3, 0.4, 200_000),
+        "normal": rng.normal(2000, 300, 200_000),
+        "exponential": rng.exponential(500, 50_000),
+    }
+
+
+def _split(values, parts):
+    # Uneven chunks, including an empty one
+    cuts = np.sort(np.random.default_rng(1).integers(0, len(values), parts - 1))
+    return np.split(values, np.r_[cuts, cuts[-1]])
+
+
+def test_merged_moments_match_numpy_on_split_streams():
+    rng = np.random.default_rng(2)
+    values = np.column_stack([rng.gamma(9, 230, 100_000), rng.normal(1e6, 1.0, 100_000)])
+    partials = []
+    for chunk in _split(values, 9):
+        moments = RunningMoments(2)
+        for piece in np.array_split(chunk, 3):
+            moments.update(piece)
+        partials.append(pickle.loads(pickle.dumps(moments)))
+    merged = RunningMoments(2)
+    for moments in partials:
+        merged.merge(moments)
+
+    assert merged.count == len(values)
+    np.testing.assert_allclose(merged.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(merged.variance(), values.var(axis=0), rtol=1e-9)
+    np.testing.assert_allclose(merged.variance(ddof=1), values.var(axis=0, ddof=1), rtol=1e-9)
+
+
+def test_variance_needs_more_values_than_ddof():
+    moments = RunningMoments(1)
+    moments.update([[5.0]])
+    assert moments.variance().tolist() == [0.0]
+    assert math.isnan(moments.variance(ddof=1)[0])
+
+
+@pytest.mark.parametrize("name, values", list(_streams().items()))
+def test_merged_quantiles_stay_within_the_rank_bound(name, values):
+    digests = []
+    for chunk in _split(values, 7):
+        digest = TDigest(buffer_size=5_000)
+        for piece in np.array_split(chunk, 4):
+            digest.update(piece)
+        digests.append(digest)
+    merged = TDigest()
+    for digest in digests:
+        merged.merge(digest)
+
+    ordered = np.sort(values)
+    quantiles = np.array([0.01, 0.1, 0.5, 0.9, 0.99, 0.999])
+    ranks = np.searchsorted(ordered, merged.quantile(quantiles)) / len(values)
+    bound = 2 * np.pi * np.sqrt(quantiles * (1 - quantiles)) / merged.compression
+    assert merged.count == len(values)
+    assert (np.abs(ranks - quantiles) <= bound).all()
+    assert merged.quantile(0) == ordered[0] and merged.quantile(1) == ordered[-1]
+
+
+def test_population_stats_merge_matches_one_pass():
+    rng = np.random.default_rng(3)
+    totals = np.column_stack([rng.gamma(9, 230, 60_000), rng.gamma(5, 18, 60_000),
+                              rng.lognormal(5.3, 0.4, 60_000), rng.gamma(4, 17, 60_000)])
+    goals = rng.choice([1800.0, 2000.0, 2500.0], 60_000)
+    merged = PopulationStats()
+    for chunk in np.array_split(np.arange(60_000), 5):
+        partial = PopulationStats()
+        partial.add_days(totals[chunk], goals[chunk])
+        merged.merge(partial)
+    summary = merged.summary()
+
+    assert summary["days"] == 60_000
+    assert summary["over_goal_fraction"] == np.mean(totals[:, 0] > goals)
+    for column, metric in enumerate(PopulationStats.METRICS):
+        assert summary[metric]["mean"] == pytest.approx(totals[:, column].mean(), rel=1e-12)
+        assert summary[metric]["variance"] == pytest.approx(totals[:, column].var(), rel=1e-9)
+        ranks = np.searchsorted(np.sort(totals[:, column]), [summary[metric]["p50"], summary[metric]["p99"]])
+        assert abs(ranks[0] / 60_000 - 0.5) <= np.pi / 200
+        assert abs(ranks[1] / 60_000 - 0.99) <= 2 * np.pi * np.sqrt(0.99 * 0.01) / 200
+
+
+def test_add_day_reads_a_meal_tracker():
+    meal_tracker = MealTracker()
+    meal_tracker.add_food(FoodItem("oats", 1500, 40, 200, 30))
+    meal_tracker.add_food(FoodItem("egg", 600, 30, 5, 40))
+    stats = PopulationStats()
+    stats.add_day(User("ann", 2000), meal_tracker)
+    summary = stats.summary()
+    assert summary["days"] == 1
+    assert summary["over_goal_fraction"] == 1.0
+    assert summary["calories"]["mean"] == 2100
+    assert summary["fats"]["p99"] == 70
+    assert math.isnan(PopulationStats().summary()["over_goal_fraction"])